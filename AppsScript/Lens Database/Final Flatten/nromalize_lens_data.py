@@ -1,7 +1,19 @@
+import sys
+from pathlib import Path
+
 import pandas as pd
-import re
 import numpy as np
 
+# Shared regex registry lives one directory up
+_LENS_DB_DIR = str(Path(__file__).resolve().parent.parent)
+if _LENS_DB_DIR not in sys.path:
+    sys.path.insert(0, _LENS_DB_DIR)
+
+from lens_regex import (  # noqa: E402
+    MM_BEFORE_SPACE_RE, MM_SUFFIX_RE, PAREN_DESCRIPTION_RE, QUOTES_RE,
+    T_PREFIX_RE, WEIGHT_SUFFIX_RE, compile_pattern,
+)
+
 def normalize_text(value):
     """Convert all text to lowercase and handle NaN values"""
     if pd.isna(value) or value == '':
@@ -17,7 +29,7 @@ def normalize_focal_length(value):
     focal = str(value).lower().strip()
     
     # Remove 'mm' suffix if present
-    focal = re.sub(r'mm$', '', focal)
+    focal = MM_SUFFIX_RE.sub('', focal)
     
     return focal.strip()
 
@@ -30,7 +42,7 @@ def normalize_t_stop(value):
     t_stop = str(value).lower().strip()
     
     # Remove 'T' or 't' prefix if present
-    t_stop = re.sub(r'^t', '', t_stop)
+    t_stop = T_PREFIX_RE.sub('', t_stop)
     
     return t_stop.strip()
 
@@ -43,8 +55,7 @@ def normalize_measurement_with_unit(value, unit_suffix):
     measurement = str(value).lower().strip()
     
     # Remove the unit suffix if present
-    pattern = rf'{unit_suffix}$'
-    measurement = re.sub(pattern, '', measurement)
+    measurement = compile_pattern(rf'{unit_suffix}$').sub('', measurement)
     
     return measurement.strip()
 
@@ -59,7 +70,7 @@ def normalize_weight(value):
         return ''
     
     weight = str(value).lower().strip()
-    weight = re.sub(r'\s*lbs?$', '', weight)  # Remove 'lb' or 'lbs'
+    weight = WEIGHT_SUFFIX_RE.sub('', weight)  # Remove 'lb' or 'lbs'
     
     return weight.strip()
 
@@ -72,7 +83,7 @@ def normalize_close_focus(value):
     focus = str(value).lower().strip()
     
     # Remove quotes from measurements like 8", 2' 3", etc.
-    focus = re.sub(r'["\']', '', focus)
+    focus = QUOTES_RE.sub('', focus)
     
     return focus.strip()
 
@@ -90,7 +101,7 @@ def normalize_image_circle(value):
     
     # Handle complex descriptions like "31mm clear / 38mm with falloff"
     # Remove 'mm' suffix but keep the descriptive text
-    circle = re.sub(r'mm(?=\s|$)', '', circle)
+    circle = MM_BEFORE_SPACE_RE.sub('', circle)
     
     return circle.strip()
 
@@ -102,8 +113,10 @@ def normalize_iris_blade_count(value):
     # Convert to string and lowercase
     iris = str(value).lower().strip()
     
-    # Extract just the number, remove descriptions like "(triangle)"
-    iris = re.sub(r'\s*\([^)]*\)', '', iris)
+    # Extract just the number, remove descriptions like "(triangle)".
+    # Nothing after the last ")" can match, so leave it out of the scan
+    head, close, tail = iris.rpartition(')')
+    iris = PAREN_DESCRIPTION_RE.sub('', head + close) + tail
     
     return iris.strip()
 
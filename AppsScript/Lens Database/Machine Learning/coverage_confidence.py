@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Coverage Confidence
+===================
+
+Confidence score shared by ``SimpleLensParser`` and
+``update_confidence_manual_edits.py``: the fraction of the original lens name
+covered by the core parsed fields.
+
+Names and values are compared lowercased with spaces, dashes, slashes and
+parentheses removed.  A field's span is where its cleaned value first
+occurs in the cleaned name (a focal length with its "mm" unit when the name
+has one), so the spans depend only on the name and the field values: the
+parser and a re-score of an edited CSV give the same number for the same
+row.  The spans are unioned over a bitmap of the name, so values that
+overlap (a series repeating the manufacturer, notes containing the focal
+length …) are only counted once.
+
+``coverage_score`` scores one name; ``coverage_scores`` scores a whole batch
+with numpy string searches and one bitmap over all the names, and gives the
+same numbers.
+"""
+
+import re
+from typing import List, Mapping, Sequence, Tuple
+
+# Core fields considered, in scoring order
+CONFIDENCE_FIELDS = ('manufacturer', 'series', 'focal_length', 't_stop', 'lens_type', 'notes')
+
+# Characters ignored when comparing the name with the parsed values: every
+# character str.isspace() (and so regex \s) accepts, dashes, slashes, parens
+CLEAN_CHARS = ("\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004"
+               "\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000-/()")
+CLEAN_REGEX = re.compile(f"[{re.escape(CLEAN_CHARS)}]")
+_CLEAN_TABLE = str.maketrans("", "", CLEAN_CHARS)
+# The ASCII ones, for bytes.translate (several times faster on ASCII text)
+_ASCII_CLEAN_CHARS = CLEAN_CHARS.encode('ascii', 'ignore')
+
+
+def _remove_clean_chars(text: str) -> str:
+    if text.isascii():
+        return text.encode('ascii').translate(None, _ASCII_CLEAN_CHARS).decode('ascii')
+    return text.translate(_CLEAN_TABLE)
+
+
+def clean(text: str) -> str:
+    """Lowercase and strip spaces / dashes / slashes / parens for fair compare."""
+    return _remove_clean_chars(str(text).lower())
+
+
+def coverage_spans(original_clean: str, values: Mapping[str, str]) -> List[Tuple[int, int]]:
+    """Spans of ``original_clean`` matched by the field values (may overlap)."""
+    spans = []
+    for field in CONFIDENCE_FIELDS:
+        value = values.get(field)
+        if not value or str(value).lower() == "nan":
+            continue
+        segment = clean(value)
+        if not segment:
+            continue
+        # Focal length values may have lost their "mm" suffix
+        if field == 'focal_length':
+            start = original_clean.find(segment + "mm")
+            if start != -1:
+                spans.append((start, start + len(segment) + 2))
+                continue
+        start = original_clean.find(segment)
+        if start != -1:
+            spans.append((start, start + len(segment)))
+    return spans
+
+
+def coverage_score(original: str, values: Mapping[str, str]) -> float:
+    """Fraction of the cleaned ``original`` covered by the union of the value spans."""
+    if not original:
+        return 0.0
+    original_clean = clean(original)
+    if not original_clean:
+        return 0.0
+    bitmap = bytearray(len(original_clean))
+    for start, end in coverage_spans(original_clean, values):
+        bitmap[start:end] = b'\x01' * (end - start)
+    return bitmap.count(1) / len(original_clean)
+
+
+def _clean_column(values: Sequence[object], skip_nan: bool = True):
+    """``clean`` over a column as a numpy string array.
+
+    Empty values become '', and so do "nan" values with ``skip_nan``
+    (field values, as in coverage_spans).
+    """
+    import numpy as np
+
+    if hasattr(values, 'tolist'):
+        # pandas / numpy columns iterate far faster as a list
+        values = values.tolist()
+    # Field columns repeat a few values (manufacturers, lens types …):
+    # clean each distinct value once
+    distinct = dict.fromkeys(values)
+    for value in distinct:
+        text = str(value).lower() if value else ""
+        if skip_nan and text == "nan":
+            text = ""
+        distinct[value] = _remove_clean_chars(text)
+    return np.array([distinct[value] for value in values], dtype=np.dtypes.StringDType())
+
+
+def coverage_scores(originals: Sequence[str], columns: Mapping[str, Sequence[str]]):
+    """Vectorised ``coverage_score`` over a batch; returns a numpy float array.
+
+    ``columns`` maps field names from ``CONFIDENCE_FIELDS`` to sequences
+    aligned with ``originals``.  Every field is located in every name with
+    one numpy string search, and the spans of all the names are unioned in
+    one bitmap laid end to end (one entry per character of the cleaned
+    names), so memory doesn't depend on the longest name.
+    """
+    import numpy as np
+
+    n = len(originals)
+    cleaned = _clean_column(originals, skip_nan=False)
+    lengths = np.strings.str_len(cleaned).astype(np.int64)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+    none = np.zeros(0, dtype=np.int64)
+    rows, starts, ends = [none], [none], [none]
+    for field in CONFIDENCE_FIELDS:
+        if field not in columns:
+            continue
+        segments = _clean_column(columns[field])
+        widths = np.strings.str_len(segments).astype(np.int64)
+        start = np.full(n, -1, dtype=np.int64)
+        present = widths > 0
+        # Focal length values may have lost their "mm" suffix
+        if field == 'focal_length':
+            start[present] = np.strings.find(cleaned[present], np.strings.add(segments[present], "mm"))
+            with_unit = start >= 0
+            widths = np.where(with_unit, widths + 2, widths)
+            present &= ~with_unit
+        start[present] = np.strings.find(cleaned[present], segments[present])
+        found = np.flatnonzero(start >= 0)
+        rows.append(found)
+        starts.append(start[found])
+        ends.append(start[found] + widths[found])
+
+    rows = np.concatenate(rows)
+    starts = offsets[rows] + np.concatenate(starts)
+    ends = offsets[rows] + np.concatenate(ends)
+    # Interval union: +1 at each start, -1 at each end, covered where the
+    # running count is positive
+    size = int(offsets[-1]) + 1
+    delta = np.bincount(starts, minlength=size) - np.bincount(ends, minlength=size)
+    covered = np.cumsum(delta[:-1]) > 0
+    per_row = np.bincount(np.repeat(np.arange(n), lengths), weights=covered, minlength=n)
+
+    scores = np.zeros(n, dtype=np.float64)
+    nonzero = lengths > 0
+    scores[nonzero] = per_row[nonzero] / lengths[nonzero]
+    return scores
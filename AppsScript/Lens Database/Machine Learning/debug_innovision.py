@@ -11,7 +11,7 @@ from simple_lens_parser import SimpleLensParser
 
 def debug_innovision_parsing():
     """Debug the Innovision parsing issue"""
-    parser = SimpleLensParser()
+    parser = SimpleLensParser.load()
     
     test_lens = "Innovision Probe II Plus T6.3 - LOW ANGLE PRISM"
     
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Evaluate Parser
+===============
+
+Scores SimpleLensParser against the hand-corrected ``Manual Edits.csv``:
+every ``Original Name`` is parsed (``parse_batch``, over ``--jobs`` worker
+processes) and each field is compared with the corrected value, ignoring
+case and repeated whitespace.
+
+  • per field – precision (share of the values the parser gave that are
+    right), recall (share of the corrected values it got) and accuracy
+    (rows where the two agree, blanks included)
+  • throughput – rows/sec of the parse alone, parser load excluded
+  • disagreements by cause – each wrong field is re-parsed with profiling
+    on and charged to the branches and special rules that set it
+    ("series.alias", "rule.k35-canon" …), or to "<field>.extract" when none
+    did; the causes are ranked by disagreements
+
+``--against REV`` (a git revision, or another ``Lens Database`` folder)
+evaluates a second parser version in a separate process on the same gold
+set, prints both side by side and lists the names whose output differs -
+``--fail-on-change`` exits non-zero if any do, e.g. to check that a speed
+optimisation left every result alone.
+
+Any CSV with the Manual Edits columns can serve as the gold set (names in
+``Original Name``, or ``Lens Name`` as written by synthetic_lenses.py).
+
+Usage:
+    python3 evaluate_parser.py [--gold "Manual Edits.csv"] [--jobs N] [--against REV] [--fail-on-change]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+ML_DIR = Path(__file__).resolve().parent
+GOLD_FILE = ML_DIR / 'Manual Edits.csv'
+
+# Gold-set column -> ParsedLens field
+EVALUATED_FIELDS = {
+    'Manufacturer': 'manufacturer',
+    'Series': 'series',
+    'Focal Length': 'focal_length',
+    'T-Stop': 't_stop',
+    'Prime / Zoom / Special': 'lens_type',
+    'Format': 'format',
+    'Mount': 'mount',
+    'Anamorphic / Spherical': 'anamorphic_spherical',
+    'Anamorphic Squeeze Factor': 'anamorphic_squeeze',
+    'Housing': 'housing',
+    'Notes': 'notes',
+}
+NAME_COLUMNS = ('Original Name', 'Lens Name')
+SPACES_RE = re.compile(r'\s+')
+
+
+def normalize(value) -> str:
+    if value is None or value != value:  # NaN
+        return ''
+    return SPACES_RE.sub(' ', str(value)).strip().casefold()
+
+
+def load_gold(gold_file: str):
+    """(names, {field: corrected values}) from a gold-set CSV"""
+    import pandas as pd
+
+    gold = pd.read_csv(gold_file, dtype=str, keep_default_na=False)
+    column = next((c for c in NAME_COLUMNS if c in gold.columns), None)
+    if column is None:
+        raise ValueError(f"{gold_file} has no {' / '.join(NAME_COLUMNS)} column")
+    truth = {field: [normalize(v) for v in gold[header]]
+             for header, field in EVALUATED_FIELDS.items() if header in gold.columns}
+    return gold[column].tolist(), truth
+
+
+def predict(parser, names: List[str], jobs: int) -> Dict[str, List[str]]:
+    """{field: normalized values} for every name"""
+    if hasattr(parser, 'parse_batch'):
+        batch = parser.parse_batch(names, jobs=jobs)
+        return {field: [normalize(v) for v in batch.column(field)] for field in EVALUATED_FIELDS.values()}
+    # Parsers from before batch parsing
+    parsed = [parser.parse_lens_name(name) for name in names]
+    return {field: [normalize(getattr(p, field, '')) for p in parsed] for field in EVALUATED_FIELDS.values()}
+
+
+def score(truth: Dict[str, List[str]], predicted: Dict[str, List[str]]) -> Dict[str, Dict[str, float]]:
+    """Precision / recall / accuracy per field, with the counts behind them"""
+    scores = {}
+    for field, expected in truth.items():
+        tp = fp = fn = agree = 0
+        for want, got in zip(expected, predicted[field]):
+            if want == got:
+                agree += 1
+                tp += bool(got)
+                continue
+            fp += bool(got)
+            fn += bool(want)
+        scores[field] = {
+            'precision': tp / (tp + fp) if tp + fp else 1.0,
+            'recall': tp / (tp + fn) if tp + fn else 1.0,
+            'accuracy': agree / len(expected) if expected else 1.0,
+            'tp': tp, 'fp': fp, 'fn': fn,
+        }
+    return scores
+
+
+def rule_fields(parser) -> Dict[str, set]:
+    """Fields each special rule can set, by profile counter name"""
+    fields = {'rule.' + rule.id: {'series'} for rule in parser.special_rules.series.rules}
+    for rule in parser.special_rules.fields.rules:
+        fields['rule.' + rule.id] = {field for field, _ in rule.actions}
+    return fields
+
+
+def blame(parser, names: List[str], wrong: Dict[int, List[str]]) -> Dict[str, Dict[str, object]]:
+    """Disagreements charged to the branches / rules that set the wrong fields"""
+    if not hasattr(parser, 'enable_profiling'):
+        return {}
+    sets = rule_fields(parser)
+    causes: Dict[str, Counter] = {}
+    profile = parser.enable_profiling()
+    for row, fields in wrong.items():
+        profile.reset()
+        parser.parse_lens_name(names[row])
+        # "series.rule" always comes with the specific rule.<id>
+        fired = [name for name in profile.counters if name != 'series.rule']
+        for field in fields:
+            charged = [name for name in fired
+                       if field in sets.get(name, ()) or name.split('.', 1)[0] == field]
+            for name in charged or [f'{field}.extract']:
+                causes.setdefault(name, Counter())[field] += 1
+    parser.disable_profiling()
+    ranked = sorted(causes.items(), key=lambda item: (-sum(item[1].values()), item[0]))
+    return {name: {'disagreements': sum(fields.values()), 'fields': dict(fields.most_common())}
+            for name, fields in ranked}
+
+
+def evaluate(gold_file: str, jobs: int) -> Dict[str, object]:
+    """Evaluate the SimpleLensParser on ``sys.path`` against ``gold_file``"""
+    import contextlib
+    import io
+    from simple_lens_parser import SimpleLensParser
+
+    names, truth = load_gold(gold_file)
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser = SimpleLensParser.load(cache_size=0) if hasattr(SimpleLensParser, 'load') else SimpleLensParser()
+        start = time.perf_counter()
+        predicted = predict(parser, names, jobs)
+        seconds = time.perf_counter() - start
+        wrong: Dict[int, List[str]] = {}
+        for field, expected in truth.items():
+            for row, (want, got) in enumerate(zip(expected, predicted[field])):
+                if want != got:
+                    wrong.setdefault(row, []).append(field)
+        causes = blame(parser, names, dict(sorted(wrong.items())))
+    return {
+        'parser': str(Path(sys.modules['simple_lens_parser'].__file__).resolve().parent.parent),
+        'rows': len(names),
+        'seconds': seconds,
+        'rows_per_sec': len(names) / seconds if seconds else 0.0,
+        'jobs': jobs,
+        'fields': score(truth, predicted),
+        'causes': causes,
+        'names': names,
+        'predicted': predicted,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Second parser version (--against)
+# ---------------------------------------------------------------------------
+
+def export_revision(rev: str, workdir: Path) -> Path:
+    """``Lens Database`` folder of git revision ``rev``, extracted into ``workdir``"""
+    import io
+    import tarfile
+
+    # Run from this folder, git archives it with paths relative to it
+    archive = subprocess.run(['git', 'archive', rev, '--', '.'], cwd=ML_DIR.parent, capture_output=True)
+    if archive.returncode:
+        raise SystemExit(f"git archive {rev} failed: {archive.stderr.decode(errors='replace').strip()}")
+    with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+        tar.extractall(workdir, filter='data')
+    return workdir
+
+
+def evaluate_other(version: str, gold_file: str, jobs: int) -> Dict[str, object]:
+    """``evaluate`` for another parser version, run in a child process"""
+    with tempfile.TemporaryDirectory() as tmp:
+        lens_db = Path(version) if Path(version).is_dir() else export_revision(version, Path(tmp) / 'tree')
+        if not (lens_db / 'Machine Learning' / 'simple_lens_parser.py').exists():
+            raise FileNotFoundError(f"no Machine Learning/simple_lens_parser.py in {lens_db}")
+        report_file = Path(tmp) / 'report.json'
+        subprocess.run([sys.executable, __file__, '--gold', str(Path(gold_file).resolve()),
+                        '--jobs', str(jobs), '--tree', str(lens_db), '--json', str(report_file)],
+                       check=True)
+        report = json.loads(report_file.read_text(encoding='utf-8'))
+    report['parser'] = version
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+def print_report(report: Dict[str, object], top: int) -> None:
+    print(f"Parser: {report['parser']}")
+    print(f"Throughput: {report['rows']:,} rows in {report['seconds']:.2f}s = "
+          f"{report['rows_per_sec']:,.0f} rows/sec (jobs {report['jobs']})")
+    print(f"\n{'field':<22} {'precision':>9} {'recall':>7} {'accuracy':>9} {'tp':>6} {'fp':>6} {'fn':>6}")
+    print("-" * 70)
+    for field, s in report['fields'].items():
+        print(f"{field:<22} {s['precision']:>9.3f} {s['recall']:>7.3f} {s['accuracy']:>9.3f} "
+              f"{s['tp']:>6} {s['fp']:>6} {s['fn']:>6}")
+    if report['causes']:
+        print(f"\n{'disagreements':>13}  {'cause':<36} fields")
+        print("-" * 70)
+        for name, cause in list(report['causes'].items())[:top]:
+            fields = ', '.join(f"{field} {n}" for field, n in cause['fields'].items())
+            print(f"{cause['disagreements']:>13}  {name:<36} {fields}")
+
+
+def print_comparison(base: Dict[str, object], other: Dict[str, object], show: int) -> int:
+    """Side-by-side scores; returns how many names parse differently"""
+    print(f"\n{'':<22} {'precision':^23} {'recall':^23}")
+    print(f"{'field':<22} {'base':>7} {'other':>7} {'delta':>7} {'base':>7} {'other':>7} {'delta':>7}")
+    print("-" * 70)
+    for field, a in base['fields'].items():
+        b = other['fields'][field]
+        print(f"{field:<22} {a['precision']:>7.3f} {b['precision']:>7.3f} {b['precision'] - a['precision']:>+7.3f} "
+              f"{a['recall']:>7.3f} {b['recall']:>7.3f} {b['recall'] - a['recall']:>+7.3f}")
+    ratio = base['rows_per_sec'] / other['rows_per_sec'] if other['rows_per_sec'] else 0.0
+    print(f"{'rows/sec':<22} {base['rows_per_sec']:>7,.0f} {other['rows_per_sec']:>7,.0f}  "
+          f"(base {ratio:.2f}x other)")
+
+    changed = []
+    for row, name in enumerate(base['names']):
+        diffs = [(field, other['predicted'][field][row], values[row])
+                 for field, values in base['predicted'].items() if values[row] != other['predicted'][field][row]]
+        if diffs:
+            changed.append((name, diffs))
+    print(f"\nNames parsed differently: {len(changed):,} of {base['rows']:,}")
+    for name, diffs in changed[:show]:
+        print(f"  {name}")
+        for field, was, now in diffs:
+            print(f"      {field}: {was!r} (other) -> {now!r} (base)")
+    return len(changed)
+
+
+def main() -> int:
+    args = argparse.ArgumentParser(description="Score SimpleLensParser against hand-corrected lens names")
+    args.add_argument('--gold', default=str(GOLD_FILE), help="gold-set CSV (default Manual Edits.csv)")
+    args.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="worker processes (default: CPUs)")
+    args.add_argument('--against', metavar='REV', help="git revision or Lens Database folder to compare with")
+    args.add_argument('--fail-on-change', action='store_true', help="exit 1 if --against parses any name differently")
+    args.add_argument('--top', type=int, default=15, help="causes to list (default 15)")
+    args.add_argument('--show', type=int, default=20, help="differing names to list (default 20)")
+    args.add_argument('--tree', help=argparse.SUPPRESS)
+    args.add_argument('--json', help="also write the report (with every prediction) as JSON")
+    args = args.parse_args()
+
+    if args.tree:
+        # Child of --against: import the other version's parser
+        sys.path.insert(0, str(Path(args.tree).resolve() / 'Machine Learning'))
+    else:
+        sys.path.insert(0, str(ML_DIR))
+    report = evaluate(args.gold, args.jobs)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report), encoding='utf-8')
+    if args.tree:
+        return 0
+
+    print(f"Gold set: {args.gold}")
+    print_report(report, args.top)
+    if not args.against:
+        return 0
+    other = evaluate_other(args.against, args.gold, args.jobs)
+    print()
+    print_report(other, args.top)
+    changed = print_comparison(report, other, args.show)
+    return 1 if changed and args.fail_on_change else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
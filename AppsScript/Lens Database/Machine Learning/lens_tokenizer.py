@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Lens Tokenizer
+==============
+
+Splits a preprocessed lens name into a typed token stream in one regex pass,
+so the SimpleLensParser extractors read tokens instead of each re-scanning
+the string.
+
+Token kinds (every non-space character belongs to exactly one token):
+  • number  – a number, range or slash chain: 50, 24-70, 24-290/26-320
+  • stop    – T/F-stop: t2.8, f4.5-5.6, f/2.8 (value holds the number part)
+  • squeeze – "Nx" squeeze factor: 1.8x (value holds N)
+  • xsqueeze – "xN" squeeze factor: x1.5 (value holds N)
+  • mm      – the millimetre unit
+  • word    – a run of letters
+  • open / close – parentheses
+  • punct   – any other single character
+
+Parenthetical groups are reported separately as ``paren`` spans covering
+"(" … ")" so the tokens inside stay visible to the extractors.
+"""
+
+import re
+from typing import List, NamedTuple, Optional
+
+NUMBER = r'\d+(?:\.\d+)?'
+RANGE = NUMBER + r'(?:-' + NUMBER + r')?'
+
+TOKEN_RE = re.compile(
+    r'(?P<stop>(?:t|f/?)(?P<stop_value>' + RANGE + r'))'
+    r'|(?P<squeeze>(?P<squeeze_value>' + NUMBER + r')x)'
+    r'|(?P<number>' + RANGE + r'(?:/' + RANGE + r')*)'
+    r'|(?P<xsqueeze>x(?P<xsqueeze_value>' + NUMBER + r'))'
+    r'|(?P<mm>mm)'
+    r'|(?P<word>[^\W\d_](?:(?!t\d|f/?\d|x\d)[^\W\d_])*)'
+    r'|(?P<open>\()'
+    r'|(?P<close>\))'
+    r'|(?P<punct>\S)',
+    re.IGNORECASE,
+)
+
+# Token kind -> named group holding its numeric value
+VALUE_GROUPS = {name[:-len('_value')]: name for name in TOKEN_RE.groupindex if name.endswith('_value')}
+
+# Focal length chain, matched from an arbitrary digit offset
+FOCAL_CHAIN_RE = re.compile(RANGE + r'(?:/' + RANGE + r')*')
+TRAILING_NUMBER_RE = re.compile(NUMBER + r'$')
+TRAILING_INTEGER_RE = re.compile(r'\d+$')
+LEADING_NUMBER_RE = re.compile(NUMBER)
+
+DIGIT_KINDS = frozenset(('number', 'stop', 'squeeze', 'xsqueeze'))
+
+# Direct readings for batch parsing (SimpleLensParser.extract_regex_columns).
+# Stops and the first digit chain always agree with the token stream; the mm
+# and squeeze readings agree on every name without a tangled numeric run
+# (1.2.50, 5-10-20, 24--70 …), which fall back to the token stream.
+#
+# Patterns opening with a digit run carry a (?<!\d) guard so a long run of
+# digits is scanned from its start only, not again from every digit in it
+# (see lens_regex).  The mm reading is the RANGE right before "mm": the
+# "(?:RANGE/)*" prefix it used to skip over a slash chain only moved the
+# match start, and retried that chain from each of its digits.
+MM_VALUE_RE = re.compile(r'(?<!\d)(' + RANGE + r')\s*mm', re.IGNORECASE)
+FIRST_CHAIN_RE = re.compile(r'(' + FOCAL_CHAIN_RE.pattern + r')')
+STOP_LEAD_RES = (
+    ('T', re.compile(r't(' + RANGE + r')', re.IGNORECASE)),
+    ('F', re.compile(r'f(' + RANGE + r')', re.IGNORECASE)),
+    ('F', re.compile(r'f/(' + RANGE + r')', re.IGNORECASE)),
+)
+NX_RE = re.compile(r'(?<!\d)(' + NUMBER + r')x', re.IGNORECASE)
+XN_RE = re.compile(r'x(' + NUMBER + r')', re.IGNORECASE)
+TANGLED_RUN_RE = re.compile(r'\d[./-]{2,}\d|\d\.\d+\.\d|\d-[\d.]+-\d')
+# A "(" with a ")" after it (``\(.*\)`` on a preprocessed, single-line name),
+# scanned once from the start rather than once per "("
+PAREN_PAIR_RE = re.compile(r'^[^(]*\(.*\)')
+
+
+class Token(NamedTuple):
+    kind: str
+    start: int
+    end: int
+    text: str
+    value: str
+    vstart: int
+
+    @property
+    def has_digits(self) -> bool:
+        return self.kind in DIGIT_KINDS
+
+
+class Span(NamedTuple):
+    start: int
+    end: int
+
+
+class TokenStream:
+    """Token list for one lens name plus lookup helpers used by the extractors."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[Token] = []
+        self.parens: List[Span] = []
+        append = self.tokens.append
+        open_at: Optional[int] = None
+        for match in TOKEN_RE.finditer(text):
+            kind = match.lastgroup
+            start, end = match.span()
+            token_text = match.group()
+            value_group = VALUE_GROUPS.get(kind)
+            if value_group:
+                append(Token(kind, start, end, token_text, match.group(value_group), match.start(value_group)))
+                continue
+            append(Token(kind, start, end, token_text, token_text, start))
+            if kind == 'open' and open_at is None:
+                open_at = start
+            elif kind == 'close' and open_at is not None:
+                self.parens.append(Span(open_at, end))
+                open_at = None
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def adjacent(self, i: int) -> bool:
+        """True when token ``i`` starts right where token ``i - 1`` ends."""
+        return 0 < i < len(self.tokens) and self.tokens[i - 1].end == self.tokens[i].start
+
+    def first(self, kind: str, prefix: Optional[str] = None) -> Optional[Token]:
+        for tok in self.tokens:
+            if tok.kind == kind and (prefix is None or tok.text[:len(prefix)].lower() == prefix):
+                return tok
+        return None
+
+    def first_digits(self) -> Optional[Token]:
+        for tok in self.tokens:
+            if tok.has_digits:
+                return tok
+        return None
+
+    def mm_values(self):
+        """Yield ``(index, number_text, gap)`` for each number directly before an mm unit.
+
+        ``number_text`` is the ``N`` or ``N-M`` reading closest to the unit,
+        ``gap`` is True when whitespace separates it from "mm".
+        """
+        toks = self.tokens
+        for i in range(1, len(toks)):
+            if toks[i].kind != 'mm':
+                continue
+            tok = toks[i - 1]
+            if not tok.has_digits or tok.kind == 'squeeze':
+                continue
+            value = tok.value.rsplit('/', 1)[-1]
+            # "5-10-20mm" / "1.2.50mm": the reading nearest the unit borrows
+            # the tail of the preceding number
+            j = i - 1
+            if tok.kind == 'number' and tok.value == value and j >= 2 \
+                    and self.adjacent(j) and self.adjacent(j - 1) and toks[j - 2].has_digits:
+                sep = toks[j - 1].text
+                if sep == '-' and '-' not in value:
+                    head = TRAILING_NUMBER_RE.search(toks[j - 2].text)
+                    if head:
+                        value = head.group() + '-' + value
+                elif sep == '.' and '.' not in value.split('-', 1)[0]:
+                    head = TRAILING_INTEGER_RE.search(toks[j - 2].text)
+                    if head:
+                        value = head.group() + '.' + value
+            yield i, value, not self.adjacent(i)
+
+    def first_nx(self) -> Optional[str]:
+        """Number of the leftmost "Nx" reading (1.8x, also the 2 of 1.5-2x)."""
+        toks = self.tokens
+        for i, tok in enumerate(toks):
+            if tok.kind == 'squeeze':
+                return tok.value
+            if tok.has_digits and self.adjacent(i + 1) and toks[i + 1].text[:1] in 'xX':
+                match = TRAILING_NUMBER_RE.search(tok.text)
+                if match:
+                    return match.group()
+        return None
+
+    def first_xn(self) -> Optional[str]:
+        """Number of the leftmost "xN" reading (x1.5, also the 16.5 of 25x16.5)."""
+        toks = self.tokens
+        for i, tok in enumerate(toks):
+            if tok.kind == 'xsqueeze':
+                return tok.value
+            if tok.kind in ('number', 'squeeze') and self.adjacent(i) and toks[i - 1].kind == 'squeeze':
+                return LEADING_NUMBER_RE.match(tok.text).group()
+        return None
+
+
+def tokenize(text: str) -> TokenStream:
+    return TokenStream(text)
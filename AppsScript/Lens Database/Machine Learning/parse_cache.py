@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Parse Cache
+===========
+
+Memoizes ``SimpleLensParser.parse_lens_name`` results.
+
+  • an in-process LRU bounded to ``maxsize`` entries
+  • optionally a persistent SQLite file shared between runs
+
+Entries are keyed by the preprocessed lens name.  Every entry also carries
+the parser's pattern fingerprint (a hash of the loaded alias dictionaries,
+the special-case rules and the parser sources), so editing
+``learned_patterns.json`` or ``special_rules.json`` makes old entries
+unreachable; stale rows are dropped from the SQLite file when it is opened.
+sqlite3 and json are only imported when a file is used.
+
+Writes to the file are committed every ``commit_every`` entries, by
+``flush()`` (SimpleLensParser flushes at the end of every batch) and by
+``close()``, which also runs at interpreter exit for a cache left open.
+
+A few fields are taken from the raw name rather than the preprocessed one
+(parenthesised notes keep their case, rule captures …).  Results flagged as
+raw-sensitive are only reused for the exact raw name they were parsed from.
+"""
+
+import atexit
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# (raw name, parsed fields, raw-sensitive)
+Entry = Tuple[str, Dict, bool]
+
+
+class ParseCache:
+    """LRU (plus optional SQLite) cache of parsed lens fields."""
+
+    def __init__(self, fingerprint: str, maxsize: int = 4096,
+                 path: Optional[Union[str, Path]] = None, commit_every: int = 256):
+        self.fingerprint = fingerprint
+        self.maxsize = maxsize
+        self.commit_every = commit_every
+        self._entries: 'OrderedDict[str, Entry]' = OrderedDict()
+        self._pending = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'disk_hits': 0, 'disk_writes': 0}
+        self.db: Optional['sqlite3.Connection'] = None
+        if path is not None:
+            import sqlite3
+            self.db = sqlite3.connect(str(path))
+            self.db.execute(
+                'CREATE TABLE IF NOT EXISTS parse_cache ('
+                ' fingerprint TEXT NOT NULL, name TEXT NOT NULL, raw TEXT NOT NULL,'
+                ' fields TEXT NOT NULL, raw_sensitive INTEGER NOT NULL,'
+                ' PRIMARY KEY (fingerprint, name))'
+            )
+            self.db.execute('DELETE FROM parse_cache WHERE fingerprint != ?', (fingerprint,))
+            self.db.commit()
+            # Don't lose the uncommitted tail if nobody closes the cache
+            atexit.register(self.close)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: str, raw: str) -> Optional[Dict]:
+        """Cached fields for ``name`` (preprocessed) parsed from ``raw``, or None."""
+        entry = self._entries.get(name)
+        if entry is not None:
+            self._entries.move_to_end(name)
+        elif self.db is not None:
+            import json
+            row = self.db.execute(
+                'SELECT raw, fields, raw_sensitive FROM parse_cache WHERE fingerprint = ? AND name = ?',
+                (self.fingerprint, name),
+            ).fetchone()
+            if row is not None:
+                entry = (row[0], json.loads(row[1]), bool(row[2]))
+                self._remember(name, entry)
+                self.stats['disk_hits'] += 1
+        if entry is None or (entry[2] and entry[0] != raw):
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return entry[1]
+
+    def put(self, name: str, raw: str, fields: Dict, raw_sensitive: bool) -> None:
+        entry = (raw, fields, raw_sensitive)
+        self._remember(name, entry)
+        if self.db is not None:
+            import json
+            self.db.execute(
+                'INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?, ?, ?)',
+                (self.fingerprint, name, raw, json.dumps(fields), int(raw_sensitive)),
+            )
+            self.stats['disk_writes'] += 1
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self.flush()
+
+    def _remember(self, name: str, entry: Entry) -> None:
+        self._entries[name] = entry
+        self._entries.move_to_end(name)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def clear(self) -> None:
+        """Drop the in-process entries (the SQLite file is keyed by fingerprint)."""
+        self._entries.clear()
+
+    def flush(self) -> None:
+        """Commit the entries written to the SQLite file since the last commit"""
+        if self.db is not None and self._pending:
+            self.db.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        """Flush and close the SQLite file (the in-process entries stay usable)"""
+        if self.db is not None:
+            self.flush()
+            self.db.close()
+            self.db = None
+            atexit.unregister(self.close)
+
+    def __enter__(self) -> 'ParseCache':
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+    def info(self) -> Dict[str, Union[int, float]]:
+        """Hit/miss/eviction counters plus the current size and hit rate."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return dict(self.stats, size=len(self._entries), maxsize=self.maxsize,
+                    hit_rate=self.stats['hits'] / lookups if lookups else 0.0)
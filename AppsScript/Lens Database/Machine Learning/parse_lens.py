@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Parse Lens
+==========
+
+Command-line lens name parser for single names or streams of names:
+
+    python3 -m parse_lens "Cooke S4/i 18mm T2.0" "Zeiss Master Prime 50mm T1.3"
+    python3 -m parse_lens < names.txt        # one name per line ("-" also reads stdin)
+
+Prints one JSON object with the ParsedLens fields per name, in input order.
+The parser is restored from its compiled snapshot (SimpleLensParser.load)
+and pandas is never imported, so start-up stays in the tens of milliseconds
+(guarded by benchmarks/bench_import_time.py).  Run it from this directory or
+with it on PYTHONPATH.
+"""
+
+import json
+import sys
+from typing import Iterable, List, Optional
+
+from simple_lens_parser import SimpleLensParser
+
+
+def parse_names(names: Iterable[str], out=sys.stdout) -> int:
+    """Write one JSON line per name; returns the number of names parsed"""
+    parser = SimpleLensParser.load()
+    count = 0
+    for name in names:
+        out.write(json.dumps(parser.parse_lens_name(name).as_dict()) + "\n")
+        count += 1
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    names = sys.argv[1:] if argv is None else argv
+    if not names or names == ['-']:
+        names = (line.rstrip('\r\n') for line in sys.stdin)
+    parse_names(names)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Parse Profile
+=============
+
+Opt-in instrumentation for ``SimpleLensParser`` (``enable_profiling``).
+
+  • stage timings – wall time and call count of each parser stage
+    (preprocess, manufacturer, series, focal length, t-stop, format, mount,
+    special-case rules, confidence …) and how many calls found a value
+  • counters – which branches were taken ("manufacturer.fuzzy",
+    "focal_length.mm" …) and which special-case rules fired ("rule.<id>")
+
+Stage times are inclusive: a stage that triggers the shared alias scan or
+tokenizer pays for it, and "alias scan" / "tokenize" also show it on their
+own rows.  Profiling works by wrapping the parser's stage methods on the
+instance, so a parser that is not profiled runs its normal methods with no
+timing code at all; branch counters cost one ``is None`` check each.
+Worker processes (``jobs > 1``) are not profiled.
+
+Reports export as JSON (``to_json``) or as a text table sorted by total
+time (``table``).
+"""
+
+import functools
+import time
+from collections import Counter
+from typing import Callable, Dict, List
+
+
+class StageStats:
+    """Calls, calls that found a value, and total seconds of one stage."""
+
+    __slots__ = ('calls', 'found', 'seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.found = 0
+        self.seconds = 0.0
+
+
+def _found(result) -> bool:
+    """Whether a stage result carries a value: ``(value, score)`` tuples, strings, lists …"""
+    if isinstance(result, tuple):
+        result = result[0] if result else None
+    try:
+        return bool(result)
+    except ValueError:
+        # Batch stages return frames / arrays, which have no truth value
+        return len(result) > 0
+
+
+class ParseProfile:
+    """Stage timings and branch / rule counters collected while parsing."""
+
+    def __init__(self):
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Counter = Counter()
+
+    def timed(self, stage: str, func: Callable) -> Callable:
+        """``func`` wrapped to add its calls and wall time to ``stage``"""
+        stats = self.stages.setdefault(stage, StageStats())
+        clock = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            result = func(*args, **kwargs)
+            stats.seconds += clock() - start
+            stats.calls += 1
+            stats.found += _found(result)
+            return result
+        return wrapper
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def count_rules(self, rule_ids) -> None:
+        for rule_id in rule_ids:
+            self.counters['rule.' + rule_id] += 1
+
+    def reset(self) -> None:
+        for stats in self.stages.values():
+            stats.calls = stats.found = 0
+            stats.seconds = 0.0
+        self.counters.clear()
+
+    def as_dict(self) -> Dict[str, object]:
+        """Stages (by total time) and counters (by count) as plain data"""
+        stages = sorted(self.stages.items(), key=lambda item: -item[1].seconds)
+        return {
+            'stages': {
+                stage: {
+                    'calls': stats.calls,
+                    'found': stats.found,
+                    'seconds': stats.seconds,
+                    'mean_us': stats.seconds * 1e6 / stats.calls if stats.calls else 0.0,
+                }
+                for stage, stats in stages if stats.calls
+            },
+            'counters': dict(self.counters.most_common()),
+        }
+
+    def to_json(self, indent: int = 2) -> str:
+        import json
+
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def table(self) -> str:
+        """Text report: stages sorted by total time, then counters sorted by count"""
+        report = self.as_dict()
+        lines: List[str] = [
+            f"{'stage':<22} {'calls':>9} {'found':>9} {'total ms':>10} {'mean us':>9}",
+            "-" * 63,
+        ]
+        for stage, stats in report['stages'].items():
+            lines.append(f"{stage:<22} {stats['calls']:>9} {stats['found']:>9} "
+                         f"{stats['seconds'] * 1000:>10.1f} {stats['mean_us']:>9.1f}")
+        if report['counters']:
+            lines += ["", f"{'counter':<52} {'count':>10}", "-" * 63]
+            for name, count in report['counters'].items():
+                lines.append(f"{name:<52} {count:>10}")
+        return "\n".join(lines)
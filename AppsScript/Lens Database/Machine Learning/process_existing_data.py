@@ -5,19 +5,105 @@ Process Existing Lens Data
 
 This script processes the corrected parsed_lenses_output.csv file using the simple lens parser
 to improve the parsing while preserving manual corrections.
+
+Runs are incremental: a sidecar manifest records a hash of every output
+row's Original Name along with the parser's alias dictionaries and a hash of
+its code, and a rerun only parses the rows that are new or renamed or that
+the changed aliases could reach (SimpleLensParser.affected_names) - after
+learn_from_manual_edits.py, the rows holding a new learned alias.  The other
+rows reuse the parser fields from the previous output.  Editing the parser
+modules (their built-in dictionaries included) or special_rules.json changes
+the code hash and re-parses every row, as does ``--full``.
 """
 
+import argparse
+import hashlib
+import io
+import json
 import pandas as pd
-from simple_lens_parser import SimpleLensParser
+from simple_lens_parser import ParsedLens, SimpleLensParser
 import logging
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def main():
-    """Main function to process existing data"""
+MANIFEST_VERSION = 2
+
+# Output columns that come from the parser, by ParsedLens field
+PARSER_COLUMNS = {
+    'Manufacturer': 'manufacturer',
+    'Series': 'series',
+    'Focal Length': 'focal_length',
+    'T-Stop': 't_stop',
+    'Prime / Zoom / Special': 'lens_type',
+    'Format': 'format',
+    'Mount': 'mount',
+    'Anamorphic / Spherical': 'anamorphic_spherical',
+    'Anamorphic Squeeze Factor': 'anamorphic_squeeze',
+    'Housing': 'housing',
+    'Notes': 'notes',
+    'Use Case': 'use_case',
+    'Look': 'look',
+    'Flare': 'flare',
+    'Needs Review': 'needs_review',
+    'Confidence Score': 'confidence_score',
+}
+
+def manifest_path(output_file: str) -> Path:
+    """Sidecar manifest written next to ``output_file``"""
+    return Path(output_file).with_suffix('.manifest.json')
+
+def row_hash(original_name: str) -> str:
+    """Manifest entry of a row: a hash of its Original Name"""
+    return hashlib.sha256(original_name.encode('utf-8')).hexdigest()
+
+def load_previous_results(output_file: str, code_version: str) -> Tuple[Dict[str, ParsedLens], Dict]:
+    """Parser fields of the last run's output rows, keyed by row hash, and
+    the alias dictionaries they were parsed with.
+
+    Empty when there is no manifest, the output was changed since it was
+    written, or the parser code differs (SimpleLensParser.code_fingerprint).
+    """
+    try:
+        manifest = json.loads(manifest_path(output_file).read_text(encoding='utf-8'))
+        data = Path(output_file).read_bytes()
+    except (FileNotFoundError, ValueError):
+        return {}, {}
+    if (manifest.get('version') != MANIFEST_VERSION or manifest.get('code') != code_version
+            or manifest.get('output_sha256') != hashlib.sha256(data).hexdigest()):
+        return {}, {}
+    previous = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False)
+    if len(previous) != len(manifest['rows']) or not set(PARSER_COLUMNS) <= set(previous.columns):
+        return {}, {}
+    results = {}
+    for key, record in zip(manifest['rows'], previous.to_dict('records')):
+        fields = {field: record[column] for column, field in PARSER_COLUMNS.items()}
+        fields['needs_review'] = fields['needs_review'] == 'True'
+        fields['confidence_score'] = float(fields['confidence_score'])
+        results[key] = ParsedLens(original_name=record['Original Name'], **fields)
+    return results, manifest['tables']
+
+def write_manifest(output_file: str, parser: SimpleLensParser, rows: List[str]) -> None:
+    """Record the row hashes of ``output_file`` (just written) and the
+    ``parser`` version they come from for the next run"""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'code': parser.code_fingerprint(),
+        'tables': parser.pattern_tables(),
+        'output_sha256': hashlib.sha256(Path(output_file).read_bytes()).hexdigest(),
+        'rows': rows,
+    }
+    manifest_path(output_file).write_text(json.dumps(manifest), encoding='utf-8')
+
+def main(jobs: int = 1, full: bool = False):
+    """Main function to process existing data (``jobs`` parser processes)
+
+    Only rows missing from the previous run's manifest or affected by the
+    alias dictionary changes since are parsed, unless ``full`` is set.
+    """
     print("Processing Corrected Lens Data")
     print("=" * 50)
     
@@ -49,23 +135,40 @@ def main():
         manual_original_names = set()
     
     # Initialize parser
-    parser = SimpleLensParser()
+    parser = SimpleLensParser.load()
     improved_lenses = []
     
     print("Improving parsing for each lens...")
     
-    for idx, row in df.iterrows():
+    # Skip rows that were deleted from Manual Edits
+    original_names = df['Original Name'].map(str)
+    kept = pd.Series(True, index=df.index)
+    if manual_original_names:
+        kept = original_names.isin(manual_original_names)
+    for original_name in original_names[~kept]:
+        print(f"Skipping deleted row: {original_name}")
+    
+    # Reuse rows in the last run's manifest that the changed aliases can't reach
+    previous, tables = ({}, {}) if full else load_previous_results(output_file, parser.code_fingerprint())
+    kept_names = original_names[kept].tolist()
+    row_hashes = [row_hash(name) for name in kept_names]
+    known = [key in previous for key in row_hashes]
+    affected = parser.affected_names(tables, kept_names) if previous else known
+    reuse = [was_known and not was_affected for was_known, was_affected in zip(known, affected)]
+    stale = [name for name, reused in zip(kept_names, reuse) if not reused]
+    print(f"Re-parsing {len(stale)} rows ({len(kept_names) - sum(known)} new or changed, "
+          f"{sum(known) - sum(reuse)} affected by pattern changes), "
+          f"skipping {sum(reuse)} unchanged rows")
+    
+    # Parse the rest in one batch (split over ``jobs`` processes)
+    parsed_rows = iter(parser.parse_batch(stale, jobs=jobs))
+    
+    for (idx, row), key, reused in zip(df[kept].iterrows(), row_hashes, reuse):
         if (idx + 1) % 100 == 0:
             print(f"Processed {idx + 1}/{len(df)} lenses...")
         
         original_name = str(row['Original Name'])
-        
-        # Skip rows that were deleted from Manual Edits
-        if manual_original_names and original_name not in manual_original_names:
-            print(f"Skipping deleted row: {original_name}")
-            continue
-        
-        parsed = parser.parse_lens_name(original_name)
+        parsed = previous[key] if reused else next(parsed_rows)
         
         improved_row = {
             # Use parser output for all fields, allowing it to override manual corrections
@@ -115,9 +218,11 @@ def main():
     # Create DataFrame and save
     improved_df = pd.DataFrame(improved_lenses)
     improved_df.to_csv(output_file, index=False)
+    write_manifest(output_file, parser, row_hashes)
     
     print(f"\nImproved parsing complete!")
     print(f"Results saved to: {output_file}")
+    print(f"Re-parsed {len(stale)} rows, skipped {sum(reuse)} unchanged rows")
     
     # Generate summary
     generate_summary(improved_df, df)
@@ -214,4 +319,11 @@ def generate_summary(improved_df, original_df):
     print(f"\nYou can now replace the original parsed_lenses_output.csv with parsed_lenses_output_improved.csv")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    args = argparse.ArgumentParser(
+        description="Re-parse parsed_lenses_output.csv with the simple lens parser.  Only new rows and the "
+                    "rows changed alias dictionaries (learned_patterns.json) could reach are parsed again; "
+                    "editing the parser modules or special_rules.json re-parses every row.")
+    args.add_argument('--jobs', type=int, default=1, help="parser worker processes (default 1)")
+    args.add_argument('--full', action='store_true', help="re-parse every row, ignoring the manifest")
+    args = args.parse_args()
+    main(jobs=args.jobs, full=args.full) 
\ No newline at end of file
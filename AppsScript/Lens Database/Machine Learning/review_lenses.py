@@ -120,7 +120,7 @@ def create_improved_parser():
     print(f"\n=== CREATING IMPROVED PARSER ===")
     
     # Load current parser
-    parser = SimpleLensParser()
+    parser = SimpleLensParser.load()
     
     # Add some common missing patterns
     custom_improvements = {
@@ -169,6 +169,9 @@ def create_improved_parser():
         if series not in parser.series_patterns:
             parser.series_patterns[series] = patterns
     
+    # Alias tables were edited in place - refresh the matcher
+    parser.build_alias_automaton()
+    
     print("Added custom patterns for:")
     print("  - 15 additional manufacturers")
     print("  - 15 additional series types")
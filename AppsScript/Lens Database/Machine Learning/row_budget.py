@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Row Budget
+==========
+
+Wall-clock limit for parsing one name of a batch, so a single pathological
+spreadsheet cell can't stall a run: ``SimpleLensParser.parse_batch`` marks a
+row that goes over its budget as needing review and moves on.
+
+The limit is a one-shot ``ITIMER_REAL`` timer whose SIGALRM handler raises
+``RowTimeout`` in the row being parsed (the regex engine checks for signals
+while it runs, so a slow match is interrupted too).  Signals only reach the
+main thread and ``setitimer`` is POSIX-only; elsewhere - a worker thread,
+Windows - the budget is simply not enforced.  The SIGALRM handler and the
+real-time interval timer are borrowed for the duration of the ``with``
+block and restored afterwards.
+"""
+
+import signal
+import threading
+from typing import Callable, Optional
+
+
+class RowTimeout(Exception):
+    """Raised in the row that went over its time budget."""
+
+
+class RowBudget:
+    """Per-call time limit: ``with budget: budget.call(func, *args)``"""
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self.enabled = (bool(seconds) and hasattr(signal, 'setitimer')
+                        and threading.current_thread() is threading.main_thread())
+        self._previous = None
+
+    @staticmethod
+    def _expire(signum, frame):
+        raise RowTimeout()
+
+    def __enter__(self) -> 'RowBudget':
+        if self.enabled:
+            self._previous = signal.signal(signal.SIGALRM, self._expire)
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        if self.enabled:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            # None: the previous handler wasn't installed from Python
+            signal.signal(signal.SIGALRM, self._previous if self._previous is not None else signal.SIG_DFL)
+        return False
+
+    def call(self, func: Callable, *args):
+        """``func(*args)``, raising RowTimeout once it runs over the budget"""
+        if not self.enabled:
+            return func(*args)
+        signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        try:
+            return func(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
@@ -5,19 +5,126 @@ Simple Lens Parser
 
 A lightweight lens name parser that extracts structured data from raw lens names
 using regex patterns and string matching.
+
+pandas, numpy and json are imported by the code paths that use them (batch
+parsing, CSV files, building the parser from its sources), so parsing single
+names with a loaded parser never pays for them.
 """
 
 import csv
-import re
-import pandas as pd
+import hashlib
+import os
+import pickle
+import sys
+from itertools import islice
 from pathlib import Path
-from typing import Tuple, Dict, List, Optional
-from dataclasses import dataclass
-import json  # Added for dynamic loading of learned patterns
+from typing import TYPE_CHECKING, Tuple, Dict, Iterable, List, Optional
+from dataclasses import dataclass, fields
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    
+    import numpy as np
+    import pandas as pd
+    
+    from row_budget import RowBudget
+
+# Shared Lens Database helpers live one directory up
+_LENS_DB_DIR = str(Path(__file__).resolve().parent.parent)
+if _LENS_DB_DIR not in sys.path:
+    sys.path.insert(0, _LENS_DB_DIR)
+
+from alias_automaton import AliasAutomaton, AliasHit, first_hit, longest_hit
+from fuzzy_index import FuzzyIndex, name_words
+from special_case_rules import RULES_FILE, SpecialCaseRules
+from lens_tokenizer import (FIRST_CHAIN_RE, FOCAL_CHAIN_RE, MM_VALUE_RE, NX_RE, PAREN_PAIR_RE,
+                            STOP_LEAD_RES, TANGLED_RUN_RE, XN_RE, TokenStream)
+from lens_regex import PAREN_NOTE_RE, RANGE_TO_16_RE, WHITESPACE_RE
+from manufacturer_index import MANUFACTURER_ALIAS_INDEX, REHOUSERS
+from coverage_confidence import coverage_score, coverage_scores
+from parse_cache import ParseCache
+from parse_profile import ParseProfile
+import alias_automaton
+import coverage_confidence
+import fuzzy_index
+import lens_regex
+import lens_tokenizer
+import manufacturer_index
+import special_case_rules
+
+# Modules whose source is part of the parse cache fingerprint
+_PARSER_MODULES = (alias_automaton, coverage_confidence, fuzzy_index, lens_regex, lens_tokenizer,
+                   manufacturer_index, special_case_rules, sys.modules[__name__])
+
+LEARNED_PATTERNS_FILE = Path(__file__).with_name('learned_patterns.json')
+
+# Compiled parser state written by compile_snapshot and read by load.  It is
+# a build artefact, so it lives in the user's cache directory (override with
+# LENS_PARSER_CACHE_DIR), never beside the sources: installs can be read-only
+# and a checkout shouldn't be dirtied by parsing.  The file name carries a
+# hash of this directory so two checkouts keep separate snapshots.
+SNAPSHOT_DIR = Path(os.environ.get('LENS_PARSER_CACHE_DIR')
+                    or Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'lens-database')
+SNAPSHOT_FILE = SNAPSHOT_DIR / ('simple_lens_parser-'
+                                + hashlib.sha256(str(Path(__file__).resolve().parent).encode()).hexdigest()[:12]
+                                + '.snapshot')
+SNAPSHOT_VERSION = 2
+
+# Names longer than this aren't parsed in batch parsing: they come back empty
+# and flagged for review (real names are well under 200 characters; longer
+# cells are pasted exports or notes).  parse_lens_name parses any length.
+MAX_NAME_LENGTH = 500
+
+# Default wall-clock budget per name in batch parsing, seconds (see row_budget:
+# only enforced on POSIX systems, in a process's main thread)
+ROW_BUDGET_SECONDS = 0.5
+
+# Names per extract_regex_columns call in batch parsing.  Each call runs within
+# one name's budget (a thousand names take a few milliseconds), so a name
+# that stalls the regexes is caught and the chunk is redone name by name.
+REGEX_CHUNK_ROWS = 1024
+
+# Columns of extract_regex_columns
+REGEX_COLUMNS = ['focal_length', 't_stop', 'anamorphic_squeeze', 'notes']
+
+def snapshot_sources() -> List[Path]:
+    """Files a snapshot is built from; editing any of them makes it stale"""
+    return [LEARNED_PATTERNS_FILE, RULES_FILE] + [Path(module.__file__) for module in _PARSER_MODULES]
 
-@dataclass
+def _file_stamp(path: Path) -> Optional[Tuple[int, int, str]]:
+    """(mtime, size, sha256) of ``path``, None when it does not exist"""
+    try:
+        stat = path.stat()
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, digest
+
+def _stamps_current(stamps: Dict[str, Optional[Tuple[int, int, str]]]) -> bool:
+    """True when every source still matches its stamp.
+
+    An unchanged mtime and size is trusted; otherwise the content hash
+    decides, so touching a file without editing it keeps the snapshot.
+    """
+    if set(stamps) != {str(path) for path in snapshot_sources()}:
+        return False
+    for name, stamp in stamps.items():
+        path = Path(name)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            if stamp is None:
+                continue
+            return False
+        if stamp is None or stat.st_size != stamp[1]:
+            return False
+        if stat.st_mtime_ns != stamp[0] and hashlib.sha256(path.read_bytes()).hexdigest() != stamp[2]:
+            return False
+    return True
+
+@dataclass(slots=True)
 class ParsedLens:
-    """Data class for parsed lens information"""
+    """Data class for parsed lens information (slotted: no per-record ``__dict__``)"""
     manufacturer: str = ""
     series: str = ""
     focal_length: str = ""
@@ -57,66 +164,158 @@ class ParsedLens:
     needs_review: bool = False
     confidence_score: float = 0.0
 
+    def as_dict(self) -> Dict[str, object]:
+        """Field name -> value, in field order"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+# Column order of parse_many / parse_csv output
+PARSED_LENS_COLUMNS = [field.name for field in fields(ParsedLens)]
+
+# Low-cardinality fields that ParsedLensBatch stores as codes into a category list
+ENCODED_COLUMNS = ('manufacturer', 'series', 'mount', 'format', 'lens_type', 'anamorphic_spherical')
+
+class ParsedLensBatch:
+    """Columnar parse results: one array per ParsedLens field, one entry per row.
+
+    ENCODED_COLUMNS are dictionary-encoded: ``codes[field]`` is an int32 array
+    indexing ``categories[field]``, so each manufacturer, series … string is
+    held once however many rows share it.  The other fields are numpy arrays
+    (object arrays of ``str`` for the text fields).  ``batch[i]`` and
+    iteration give ParsedLens records, ``rows()`` plain tuples, and
+    ``to_frame()`` a DataFrame that wraps the arrays without copying strings
+    (encoded fields become Categoricals).
+    """
+    
+    __slots__ = ('columns', 'codes', 'categories')
+    
+    def __init__(self, columns: Dict[str, 'np.ndarray'], codes: Dict[str, 'np.ndarray'],
+                 categories: Dict[str, List[str]]):
+        self.columns = columns
+        self.codes = codes
+        self.categories = categories
+    
+    @classmethod
+    def from_frame(cls, frame: 'pd.DataFrame') -> 'ParsedLensBatch':
+        """Batch holding the rows of a frame with the ParsedLens columns"""
+        import numpy as np
+        import pandas as pd
+        
+        columns, codes, categories = {}, {}, {}
+        for name in PARSED_LENS_COLUMNS:
+            if name in ENCODED_COLUMNS:
+                field_codes, uniques = pd.factorize(frame[name])
+                codes[name] = field_codes.astype(np.int32)
+                categories[name] = uniques.tolist()
+            else:
+                columns[name] = frame[name].to_numpy()
+        return cls(columns, codes, categories)
+    
+    @classmethod
+    def from_records(cls, records: Iterable[ParsedLens]) -> 'ParsedLensBatch':
+        import pandas as pd
+        
+        rows = [tuple(getattr(record, name) for name in PARSED_LENS_COLUMNS) for record in records]
+        return cls.from_frame(pd.DataFrame(rows, columns=PARSED_LENS_COLUMNS))
+    
+    def __len__(self) -> int:
+        return len(self.columns['original_name'])
+    
+    def __getitem__(self, i: int) -> ParsedLens:
+        return next(iter(self.take([i])))
+    
+    def __iter__(self):
+        return (ParsedLens(*row) for row in self.rows())
+    
+    def column(self, name: str) -> List[object]:
+        """Decoded values of one field as a list"""
+        if name in self.codes:
+            categories = self.categories[name]
+            return [categories[code] for code in self.codes[name].tolist()]
+        return self.columns[name].tolist()
+    
+    def rows(self) -> Iterable[tuple]:
+        """Rows as tuples of plain Python values, in PARSED_LENS_COLUMNS order"""
+        return zip(*(self.column(name) for name in PARSED_LENS_COLUMNS))
+    
+    def take(self, positions: Iterable[int]) -> 'ParsedLensBatch':
+        """Batch of the rows at ``positions`` (repeats allowed), sharing the categories"""
+        return ParsedLensBatch({name: column[positions] for name, column in self.columns.items()},
+                               {name: codes[positions] for name, codes in self.codes.items()},
+                               self.categories)
+    
+    def to_frame(self, index=None) -> 'pd.DataFrame':
+        """DataFrame with the ParsedLens columns; encoded fields become Categoricals"""
+        import pandas as pd
+        
+        data = {}
+        for name in PARSED_LENS_COLUMNS:
+            if name in self.codes:
+                data[name] = pd.Categorical.from_codes(self.codes[name], categories=self.categories[name])
+            else:
+                data[name] = self.columns[name]
+        return pd.DataFrame(data, index=index, copy=False)
+
+def frame_rows(frame: 'pd.DataFrame') -> Iterable[tuple]:
+    """Rows of a frame with the ParsedLens columns as tuples of plain Python values"""
+    return zip(*(frame[column].tolist() for column in PARSED_LENS_COLUMNS))
+
+def _alias_entries(table: Dict[str, Iterable[str]]) -> List[Tuple[str, str]]:
+    """``(canonical, alias)`` pairs of an alias table in order, the canonical name counting as an alias"""
+    return [(key, alias) for key, aliases in table.items() for alias in [key, *aliases]]
+
+def preprocess_column(names: 'pd.Series') -> 'pd.Series':
+    """SimpleLensParser.preprocess_text over a column of non-blank names"""
+    return names.str.lower().str.strip().str.replace(WHITESPACE_RE, ' ', regex=True)
+
 class SimpleLensParser:
     """Simple lens parser using regex and string matching"""
+
+    # Alias dictionaries that parse results depend on (see pattern_fingerprint)
+    PATTERN_TABLES = (
+        'manufacturers', 'series_patterns', 'format_patterns', 'mount_patterns',
+        'anamorphic_patterns', 'squeeze_patterns', 'format_detect_patterns',
+        'mount_detect_patterns', 'lens_type_patterns', 'keyword_patterns',
+        'housing_patterns',
+    )
     
-    def __init__(self):
-        # Manufacturer patterns
-        self.manufacturers = {
-            'angenieux': ['angenieux'],
-            'canon': ['canon'],
-            'cooke': ['cooke'],
-            'zeiss': ['zeiss', 'arri/zeiss', 'arri / zeiss'],
-            'leica': ['leica'],
-            'leitz': ['leitz'],
-            'sigma': ['sigma'],
-            'laowa': ['laowa'],
-            'atlas': ['atlas'],
-            'caldwell': ['caldwell'],
-            'master': ['master'],
-            'ancient optics': ['ancient optics'],
-            'zero optik': ['zero optik'],
-            'tls': ['tls'],
-            'optex': ['optex'],
-            'infinity': ['infinity'],
-            'lindsey': ['lindsey'],
-            'century': ['century'],
-            'sony': ['sony'],
-            'dzofilm': ['dzofilm', 'dzofilms'],
-            'gecko-cam': ['gecko-cam'],
-            'kowa': ['kowa'],
-            'scorpio': ['scorpio'],
-            'masterbuilt': ['masterbuilt'],
-            'tribe7': ['tribe7'],
-            'hawk': ['hawk'],
-            'petzval': ['petzval'],
-            'fujinon': ['fujinon'],
-            'lensbaby': ['lensbaby'],
-            'cci': ['cci'],
-            'lomo': ['lomo'],
-            'arri': ['arri'],
-            'optika': ['optika'],
-            'konica': ['konica'],
-            'fuji': ['fuji'],
-            'duclos': ['duclos'],
-            'nikon': ['nikon'],
-            'swift 960': ['swift 960'],
-            'schneider kreuznach': ['schneider kreuznach'],
-            'p+s technik': ['p+s technik'],
-            'astroscope': ['astroscope'],
-            'nanmorph': ['nanmorph'],
-            'infiniprobe': ['infiniprobe'],
-            'rodenstock': ['rodenstock'],
-            'kish': ['kish'],
-            'keslow': ['keslow', 'kes-low'],
-            'hawk': ['hawk'],
-            'second reef': ['second reef'],
-            'ironglass': ['ironglass'],
-            'lensworks': ['lensworks'],
-            'xelmus': ['xelmus'],
-            'voigtlander': ['voigtlander'],
-            'praxis': ['praxis']
-        }
+    # Stage name -> method timed by enable_profiling
+    PROFILED_STAGES = {
+        'parse': 'parse_lens_name',
+        'preprocess': 'preprocess_text',
+        'alias scan': '_scan',
+        'tokenize': 'tokenize',
+        'manufacturer': 'identify_manufacturer',
+        'series': 'identify_series',
+        'focal length': 'extract_focal_length',
+        't-stop': 'extract_t_stop',
+        'lens type': 'determine_lens_type',
+        'format': 'identify_format',
+        'mount': 'identify_mount',
+        'anamorphic': 'identify_anamorphic_spherical',
+        'squeeze': 'extract_squeeze_factor',
+        'anamorphic location': 'extract_anamorphic_location',
+        'housing': 'extract_housing',
+        'use case': 'extract_use_case',
+        'look': 'extract_look',
+        'notes': 'extract_notes',
+        'special rules': 'apply_special_rules',
+        'confidence': 'confidence_score',
+        'batch regex columns': 'extract_regex_columns',
+        'batch confidence': 'confidence_scores',
+    }
+    
+    # Collector while profiling is enabled (see enable_profiling)
+    profile: Optional[ParseProfile] = None
+    
+    def __init__(self, cache_size: int = 4096, cache_path: Optional[str] = None,
+                 row_budget: Optional[float] = ROW_BUDGET_SECONDS):
+        """``cache_size`` bounds the in-process parse cache (0 disables it);
+        ``cache_path`` adds a persistent SQLite cache file.  ``row_budget`` is
+        the time allowed per name in batch parsing (None: unlimited; only
+        enforced on POSIX systems in a process's main thread, see row_budget)."""
+        self.row_budget = row_budget
+        # Manufacturer patterns (the shared table in manufacturer_index)
+        self.manufacturers = MANUFACTURER_ALIAS_INDEX.alias_table()
         
         # Series patterns
         self.series_patterns = {
@@ -129,6 +328,10 @@ class SimpleLensParser:
             's5/i': ['s5/i', 's5i'],
             's7/i': ['s7/i', 's7i'],
             'panchro/i': ['panchro/i', 'panchroi'],
+            'speed panchro': ['speed panchro'],
+            'panchro': ['panchro'],
+            'telepanchro': ['telepanchro'],
+            'varo-panchro': ['varo-panchro', 'varo panchro', 'varopanchro'],
             'anamorphic/i': ['anamorphic/i', 'anamorphici'],
             'anamorphic ff plus': ['anamorphic ff plus'],
             'anamorphic sf ff plus': ['anamorphic sf ff plus'],
@@ -303,9 +506,58 @@ class SimpleLensParser:
             '2.4x': ['2.4x', '2.4']
         }
 
+        # Format detection table used by identify_format (stricter than format_patterns)
+        self.format_detect_patterns = {
+            's35': ['s35', 'super 35', 'super35'],
+            'full frame': ['full frame'],
+            's16': ['s16', 'super 16', 'super16'],
+            'aps-c': ['aps-c', 'apsc'],
+            'm43': ['m43', 'micro four thirds', 'micro 4/3'],
+            'vv': ['vv', 'ff/vv']
+        }
+
+        # Mount detection table used by identify_mount - PL must be standalone
+        self.mount_detect_patterns = {
+            'lpl': ['lpl', 'lpl mount', '(lpl)'],
+            'pl': [' pl ', '(pl)', ' pl,', ' pl.', ' pl)'],  # PL must be surrounded by spaces, parentheses, or punctuation
+            'ef': ['ef', 'ef mount'],
+            'rf': ['rf', 'rf mount'],
+            'e-mount': ['e-mount', 'e mount', 'sony e'],
+            'z-mount': ['z-mount', 'z mount', 'nikon z'],
+            'f-mount': ['f-mount', 'f mount', 'nikon f'],
+            'bayonet': ['bayonet'],
+            'm42': ['m42', 'm42 mount'],
+            'm39': ['m39', 'm39 mount'],
+            'eos': ['eos']
+        }
+
+        # Lens type indicators used by determine_lens_type
+        self.lens_type_patterns = {
+            'zoom': ['zoom', 'varotal', 'cabrio', 'servo', 'cine-servo'],
+            'special': ['tilt-shift', 'shift', 'swing', 'lensbaby', 'composer']
+        }
+
+        # Single keywords checked by the format, squeeze, use case and look extractors
+        self.keyword_patterns = {
+            'ff': ['ff'],
+            "doesn't cover": ["doesn't cover"],
+            'anamorphic': ['anamorphic'],
+            'macro': ['macro'],
+            'vintage': ['vintage']
+        }
+
+        # Housing indicators used by extract_housing
+        self.housing_patterns = {
+            indicator: [indicator] for indicator in [
+                'original housing', 'rehoused', 'ancient optics', 'zero optik',
+                'tls', 'works cameras', 'whitepoint optics', 'gl optics'
+            ]
+        }
+
         # --- Auto-merge patterns learned from Manual Edits ---
-        patterns_file = Path(__file__).with_name('learned_patterns.json')
+        patterns_file = LEARNED_PATTERNS_FILE
         if patterns_file.exists():
+            import json
             try:
                 with patterns_file.open() as fp:
                     learned_data = json.load(fp).get('manual_patterns', {})
@@ -328,6 +580,264 @@ class SimpleLensParser:
             except Exception as exc:
                 print(f"[SimpleLensParser] Warning: could not merge learned patterns: {exc}")
 
+        # Special-case rule tables (series overrides + field fix-ups)
+        self.special_rules = SpecialCaseRules()
+
+        self.cache: Optional[ParseCache] = None
+        self.build_alias_automaton()
+        if cache_size or cache_path is not None:
+            self.cache = ParseCache(self.pattern_fingerprint(), maxsize=cache_size, path=cache_path)
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, cache_size: int = 4096,
+             cache_path: Optional[str] = None,
+             row_budget: Optional[float] = ROW_BUDGET_SECONDS) -> 'SimpleLensParser':
+        """Parser restored from the compiled snapshot (see compile_snapshot).
+
+        A missing, unreadable or stale snapshot - learned_patterns.json,
+        special_rules.json or a parser module changed since it was written -
+        is rebuilt from scratch and saved again (to SNAPSHOT_FILE, in the
+        cache directory; if that can't be written the parser is still
+        returned, just without the saving next time).  Gives the same parser as
+        ``SimpleLensParser(cache_size, cache_path, row_budget)``.
+        """
+        path = Path(path) if path else SNAPSHOT_FILE
+        snapshot = None
+        try:
+            with path.open('rb') as fp:
+                snapshot = pickle.load(fp)
+            if snapshot.get('version') != SNAPSHOT_VERSION or not _stamps_current(snapshot['sources']):
+                snapshot = None
+        except Exception:
+            snapshot = None
+        
+        if snapshot is None:
+            parser = cls(cache_size=cache_size, cache_path=cache_path, row_budget=row_budget)
+            try:
+                parser.compile_snapshot(path)
+            except OSError as exc:
+                print(f"[SimpleLensParser] Warning: could not write snapshot {path}: {exc}")
+            return parser
+        
+        parser = cls.__new__(cls)
+        parser.__dict__.update(snapshot['state'])
+        parser.row_budget = row_budget
+        parser._last_scan = (None, [], set())
+        parser._last_tokens = None
+        parser.cache = None
+        if cache_size or cache_path is not None:
+            parser.cache = ParseCache(snapshot['fingerprint'], maxsize=cache_size, path=cache_path)
+        return parser
+
+    def compile_snapshot(self, path: Optional[str] = None) -> Path:
+        """Write the merged alias dictionaries, rule tables and alias automaton to one file.
+
+        ``SimpleLensParser.load()`` maps it back in without re-merging
+        learned_patterns.json or rebuilding the automaton.
+        """
+        path = Path(path) if path else SNAPSHOT_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = self.pattern_tables()
+        state['special_rules'] = self.special_rules
+        state['alias_automaton'] = self.alias_automaton
+        state['fuzzy_index'] = self.fuzzy_index
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'sources': {str(source): _file_stamp(source) for source in snapshot_sources()},
+            'fingerprint': self.pattern_fingerprint(),
+            'state': state,
+        }
+        # Write beside the target and rename, so readers never see half a file
+        # (per-process name: pool workers may rebuild a stale snapshot at once)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        with tmp_path.open('wb') as fp:
+            pickle.dump(snapshot, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+    def build_alias_automaton(self) -> None:
+        """(Re)build the single-pass alias matcher.
+
+        Call this again after editing any of the alias dictionaries in place.
+        """
+        self.alias_automaton = AliasAutomaton({
+            'manufacturer': self.manufacturers,
+            'series': self.series_patterns,
+            'anamorphic': self.anamorphic_patterns,
+            'format': self.format_detect_patterns,
+            'mount': self.mount_detect_patterns,
+            'housing': self.housing_patterns,
+            'lens_type': self.lens_type_patterns,
+            'keyword': self.keyword_patterns,
+            'trigger': self.special_rules.trigger_table,
+        })
+        # Misspelling fallback for manufacturer / series; words any table knows are never "misspelt"
+        self.fuzzy_index = FuzzyIndex(
+            {'manufacturer': self.manufacturers, 'series': self.series_patterns},
+            vocabulary=(alias for table in self.alias_automaton.tables.values()
+                        for aliases in table.values() for alias in aliases),
+            no_truncation=('series',),
+        )
+        self._last_scan: Tuple[Optional[str], List[AliasHit], set] = (None, [], set())
+        self._last_tokens: Optional[TokenStream] = None
+        # Edited dictionaries make earlier parse results stale
+        if self.cache is not None:
+            self.cache.fingerprint = self.pattern_fingerprint()
+            self.cache.clear()
+
+    def share_scan(self, tables: Dict[str, Dict[str, Iterable[str]]]) -> None:
+        """Also scan for ``tables`` in the alias automaton's single pass.
+
+        Their hits come back from alias_hits() under their own categories,
+        which must not clash with the parser's; every lookup here filters by
+        category, so parse results are unchanged.  Lets another parser read
+        the same name from one scan (see lens_core).  build_alias_automaton()
+        drops them again.
+        """
+        clash = set(tables) & set(self.alias_automaton.tables)
+        if clash:
+            raise ValueError(f"alias categories already in use: {', '.join(sorted(clash))}")
+        self.alias_automaton = AliasAutomaton({**self.alias_automaton.tables, **tables})
+        self._last_scan = (None, [], set())
+
+    def pattern_tables(self) -> Dict[str, Dict[str, List[str]]]:
+        """The alias dictionaries (PATTERN_TABLES) by attribute name"""
+        return {name: getattr(self, name) for name in self.PATTERN_TABLES}
+
+    def pattern_fingerprint(self) -> str:
+        """Hash of the alias dictionaries, special-case rules and parser sources.
+
+        Parse results depend on nothing else besides the name, so this is the
+        parse cache's invalidation key.
+        """
+        import json
+        
+        digest = hashlib.sha256()
+        digest.update(json.dumps(self.pattern_tables(), sort_keys=True).encode('utf-8'))
+        digest.update(self.code_fingerprint().encode('ascii'))
+        return digest.hexdigest()
+
+    def code_fingerprint(self) -> str:
+        """Hash of the special-case rules and parser sources (pattern_fingerprint
+        without the alias dictionaries; see affected_names)"""
+        digest = hashlib.sha256()
+        digest.update(self.special_rules.path.read_bytes())
+        for module in sorted(_PARSER_MODULES, key=lambda m: m.__name__):
+            digest.update(Path(module.__file__).read_bytes())
+        return digest.hexdigest()
+
+    def affected_names(self, tables: Dict[str, Dict[str, List[str]]], names: Iterable[str]) -> List[bool]:
+        """Which of ``names`` may parse differently with the alias dictionaries ``tables``.
+
+        ``tables`` are another parser's pattern_tables() under the same rules
+        and sources (equal code_fingerprint).  A name is affected when it
+        contains an alias that was added, removed, given another canonical
+        name or moved past another (the scan's hits), when it has a word of
+        one (the fuzzy fallback's vocabulary), or - once the manufacturer or
+        series table changed - when it reaches that table's fuzzy fallback: no
+        alias of it occurs and a word may be a misspelling.  The other names
+        get the same result from both sets of dictionaries.
+        """
+        changed = {}
+        for name in self.PATTERN_TABLES:
+            old = _alias_entries(tables.get(name, {}))
+            new = _alias_entries(getattr(self, name))
+            common = set(old) & set(new)
+            if [entry for entry in old if entry in common] != [entry for entry in new if entry in common]:
+                # Reordered: any two hits may now rank the other way round
+                changed[name] = {alias for _, alias in old + new}
+            else:
+                changed[name] = {alias for _, alias in set(old) ^ set(new)}
+        aliases = set().union(*changed.values())
+        scan = AliasAutomaton({'changed': {alias: [alias] for alias in aliases}})
+        words = aliases.union(*(alias.split() for alias in aliases))
+        fuzzy = [category for category, table in (('manufacturer', 'manufacturers'), ('series', 'series_patterns'))
+                 if changed[table]]
+        
+        affected = []
+        for name in names:
+            text = self.preprocess_text(str(name))
+            text_words = name_words(text)
+            hit = bool(scan.scan(text)) or not words.isdisjoint(text_words)
+            if not hit and fuzzy and any(self.fuzzy_index.is_suspect(word) for word in text_words):
+                categories = {alias_hit.category for alias_hit in self.alias_hits(text)}
+                hit = any(category not in categories for category in fuzzy)
+            affected.append(hit)
+        return affected
+
+    def enable_profiling(self) -> ParseProfile:
+        """Start timing the PROFILED_STAGES and counting branches and fired rules.
+
+        Returns the ParseProfile collecting them (also ``self.profile``);
+        see parse_profile for the reports.
+        """
+        if self.profile is None:
+            self.profile = ParseProfile()
+            for stage, method in self.PROFILED_STAGES.items():
+                setattr(self, method, self.profile.timed(stage, getattr(self, method)))
+        return self.profile
+
+    def disable_profiling(self) -> Optional[ParseProfile]:
+        """Stop profiling; returns the collected ParseProfile (None if it was off)"""
+        profile = self.profile
+        if profile is not None:
+            for method in self.PROFILED_STAGES.values():
+                self.__dict__.pop(method, None)
+            del self.profile
+        return profile
+
+    def fuzzy_info(self) -> Dict[str, float]:
+        """Fuzzy fallback lookups, hit rate and mean latency (see FuzzyIndex.info)"""
+        return self.fuzzy_index.info()
+
+    def cache_info(self) -> Dict[str, float]:
+        """Parse cache statistics (hits, misses, evictions, disk hits/writes …)."""
+        return self.cache.info() if self.cache is not None else {}
+
+    def close(self) -> None:
+        """Commit and close the parse cache file, if any (also ``with parser:``)"""
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self) -> 'SimpleLensParser':
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+    def alias_hits(self, text: str) -> List[AliasHit]:
+        """All alias occurrences in ``text`` from one automaton scan.
+
+        The result for the most recent text is kept, so the identify_* methods
+        called in turn by parse_lens_name share a single scan.
+        """
+        if text != self._last_scan[0]:
+            self._scan(text)
+        return self._last_scan[1]
+
+    def _scan(self, text: str) -> None:
+        hits = self.alias_automaton.scan(text)
+        self._last_scan = (text, hits, {(hit.category, hit.key) for hit in hits})
+
+    def tokenize(self, text: str) -> TokenStream:
+        """Typed token stream for ``text``, built once per name and shared by the extractors"""
+        stream = self._last_tokens
+        if stream is None or stream.text != text:
+            stream = TokenStream(text)
+            self._last_tokens = stream
+        return stream
+
+    def has_keyword(self, text: str, category: str, key: str) -> bool:
+        """True when an alias of ``key`` in ``category`` occurs in ``text``"""
+        if text != self._last_scan[0]:
+            self._scan(text)
+        return (category, key) in self._last_scan[2]
+
+    def rule_triggers(self, text: str) -> set:
+        """Special-rule trigger substrings present in ``text``"""
+        return {hit.key for hit in self.alias_hits(text) if hit.category == 'trigger'}
+
     def preprocess_text(self, text: str) -> str:
         """Preprocess the lens name text"""
         if not text:
@@ -335,7 +845,7 @@ class SimpleLensParser:
         
         # Convert to lowercase and normalize spacing
         text = text.lower().strip()
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_RE.sub(' ', text)
         
         return text
 
@@ -344,16 +854,26 @@ class SimpleLensParser:
         best_match = None
         best_score = 0
         
-        for manufacturer, aliases in self.manufacturers.items():
-            for alias in aliases:
-                if alias in text:
-                    score = len(alias) / len(text) * 100
-                    if score > best_score:
-                        best_score = score
-                        best_match = manufacturer
+        # A rehouser named beside the lens maker ("Nikon ... Zero Optik") is the housing
+        hits = [hit for hit in self.alias_hits(text) if hit.category == 'manufacturer']
+        hit = (longest_hit((hit for hit in hits if hit.key not in REHOUSERS), 'manufacturer')
+               or longest_hit(hits, 'manufacturer'))
+        if hit:
+            best_score = len(hit.alias) / len(text) * 100
+            best_match = hit.key
         
         if best_score >= 3 and best_match:  # Lowered threshold from 10 to 3
+            if self.profile is not None:
+                self.profile.count('manufacturer.alias')
             return best_match.title(), min(best_score / 100, 0.9)
+        
+        # No alias in the name - try a misspelling ("angeneiux", "cook")
+        if not hit:
+            fuzzy = self.fuzzy_index.lookup('manufacturer', text)
+            if fuzzy:
+                if self.profile is not None:
+                    self.profile.count('manufacturer.fuzzy')
+                return fuzzy.key.title(), 0.5
         return "", 0.0
 
     def identify_series(self, text: str) -> Tuple[str, float]:
@@ -362,156 +882,88 @@ class SimpleLensParser:
         best_score = 0
         
         # Check for exact matches first (higher priority)
-        for series, patterns in self.series_patterns.items():
-            for pattern in patterns:
-                if pattern in text:
-                    score = len(pattern) / len(text) * 100
-                    if score > best_score:
-                        best_score = score
-                        best_match = series
-
-        
-        # Special handling for complex series names
-        if 'master anamorphic' in text.lower():
-            return "Master Anamorphic", 0.9
-        elif 'optimo ultra compact' in text.lower():
-            return "Optimo Ultra Compact", 0.9
-        elif 'optimo ultra' in text.lower():
-            return "Optimo Ultra", 0.9
-        elif 'optimo dp' in text.lower():
-            return "Optimo DP", 0.9
-        elif 'optimo prime' in text.lower():
-            return "Optimo Prime", 0.9
-        elif 'optimo style' in text.lower():
-            return "Optimo Style", 0.9
-        elif 'optimo vintage' in text.lower():
-            return "Optimo Vintage", 0.9
-        elif 'optimo hr' in text.lower():
-            return "Optimo HR", 0.9
-        elif 'optimo anamorphic' in text.lower():
-            return "Optimo Anamorphic", 0.9
-        elif 'optimo anamorphic hr' in text.lower():
-            return "Optimo Anamorphic HR", 0.9
-        elif 'chameleon sc/xc' in text.lower():
-            return "Chameleon SC/XC", 0.9
-        elif 'chameleon xc' in text.lower():
-            return "Chameleon XC", 0.9
-        elif 'chameleon uw sc' in text.lower():
-            return "Chameleon UW SC", 0.9
-        elif 'nanomorph' in text.lower():
-            return "Nanomorph", 0.9
-        elif 'genesis g35' in text.lower():
-            return "Genesis G35", 0.9
-        elif 'genesis g65' in text.lower():
-            return "Genesis G65", 0.9
-        elif 'vespid retro' in text.lower():
-            return "Vespid Retro", 0.9
-        elif 'pavo' in text.lower():
-            return "Pavo", 0.9
-        elif 'arles' in text.lower():
-            return "Arles", 0.9
-        elif 'x-tract' in text.lower():
-            return "X-Tract", 0.9
-        elif 'signature zoom' in text.lower():
-            return "Signature Zoom", 0.9
-        elif 'variable zoom' in text.lower():
-            return "Variable Zoom", 0.9
-        elif 'ranger' in text.lower():
-            return "Ranger", 0.9
-        elif 'orion' in text.lower():
-            return "Orion", 0.9
-        elif 'mercury' in text.lower():
-            return "Mercury", 0.9
-        elif 'silver edition' in text.lower():
-            return "Silver Edition", 0.9
-        # Add EZ-2 and EZ-1 detection
-        elif 'ez-2' in text.lower() or 'ez2' in text.lower():
-            return "EZ-2", 0.9
-        elif 'ez-1' in text.lower() or 'ez1' in text.lower():
-            return "EZ-1", 0.9
-        # Removed Leica R special handling as 'R' is no longer treated as a valid series
-        
-        # Special handling for EBC false positive
-        elif 'ebc' in text.lower() and not any(word in text.lower() for word in ['fujinon', 'fuji']):
-            return "EBC", 0.9
-        
-        # Special handling for Shift and Tilt
-        elif 'shift and tilt' in text.lower():
-            return "Shift and Tilt", 0.9
-        
-        # Special handling for CINE FLARE series to preserve case
-        elif 'cine orange flare' in text.lower():
-            return "CINE ORANGE FLARE", 0.9
-        elif 'cine blue flare' in text.lower():
-            return "CINE BLUE FLARE", 0.9
-        elif 'cine gold flare' in text.lower():
-            return "CINE GOLD FLARE", 0.9
+        hit = longest_hit(self.alias_hits(text), 'series')
+        if hit:
+            best_score = len(hit.alias) / len(text) * 100
+            best_match = hit.key
+        
+        # Special handling for complex series names (special_rules.json, first match wins)
+        state = {'series': ''}
+        fired = self.special_rules.series.evaluate(self.rule_triggers(text.lower()), state)
+        if fired:
+            if self.profile is not None:
+                self.profile.count('series.rule')
+                self.profile.count_rules(fired)
+            return state['series'], 0.9
         
         if best_score >= 2 and best_match:  # Lowered threshold from 5 to 2
+            if self.profile is not None:
+                self.profile.count('series.alias')
             return best_match.title(), min(best_score / 100, 0.9)
+        
+        # No alias in the name - try a misspelling ("l-series", "lwz-1")
+        if not hit:
+            fuzzy = self.fuzzy_index.lookup('series', text)
+            if fuzzy:
+                if self.profile is not None:
+                    self.profile.count('series.fuzzy')
+                return fuzzy.key.title(), 0.5
         return "", 0.0
 
     def extract_focal_length(self, text: str) -> Tuple[str, float]:
         """Extract focal length from text - improved to handle ranges and complex patterns"""
-        # Pattern for focal length (e.g., 50mm, 24-70mm, 15.5-45mm, 100mm/150mm, 20mm-105mm, 24-290/26-320/36-435)
-        patterns = [
-            r'(\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?)\s*mm',  # Standard mm format with ranges
-            r'(\d+(?:\.\d+)?(?:/\d+(?:\.\d+)?)?)\s*mm',  # Slash format like 100mm/150mm
-            r'(\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?(?:/\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?)*)',  # Complex format like 24-290/26-320/36-435
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                focal_length = match.group(1)
-                # Clean up the focal length
-                focal_length = re.sub(r'\s+', '', focal_length)
-                return focal_length, 0.9
+        # Focal length (e.g., 50mm, 24-70mm, 15.5-45mm, 100mm/150mm, 20mm-105mm, 24-290/26-320/36-435)
+        stream = self.tokenize(text)
+        
+        # Standard mm format with ranges - the number right before the first mm unit
+        for _, focal_length, _ in stream.mm_values():
+            if self.profile is not None:
+                self.profile.count('focal_length.mm')
+            return focal_length, 0.9
+        
+        # Complex format like 24-290/26-320/36-435 starting at the first number
+        token = stream.first_digits()
+        if token:
+            if self.profile is not None:
+                self.profile.count('focal_length.first_number')
+            if token.kind == 'number':
+                return token.text, 0.9
+            return FOCAL_CHAIN_RE.match(text, token.vstart).group(), 0.9
         
         return "", 0.0
 
     def extract_t_stop(self, text: str) -> Tuple[str, float]:
         """Extract T-stop from text - improved to handle more patterns"""
-        # Pattern for T-stop and F-stop (e.g., T2.8, T1.4, F2.8, F4.5-5.6, f/4.5-5.6, N/A)
-        patterns = [
-            r't(\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?)',  # T2.8, T1.4, T3.5-4.5
-            r'f(\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?)',  # F2.8, F1.4, F4.5-5.6
-            r'f/(\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?)',  # f/2.8, f/4.5-5.6
-            r'n/a',  # N/A values
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                if pattern == r'n/a':
-                    return "N/A", 0.9
-                else:
-                    # Determine if it's T or F based on the pattern
-                    if pattern.startswith('f'):
-                        t_stop = f"F{match.group(1)}"
-                    else:
-                        t_stop = f"T{match.group(1)}"
-                    return t_stop, 0.9
+        # T-stop and F-stop (e.g., T2.8, T1.4, F2.8, F4.5-5.6, f/4.5-5.6), checked in that order
+        stops = [token for token in self.tokenize(text) if token.kind == 'stop']
+        for lead, label in (('t', 'T'), ('f', 'F'), ('f/', 'F')):
+            for token in stops:
+                if token.text[:token.vstart - token.start].lower() == lead:
+                    if self.profile is not None:
+                        self.profile.count('t_stop.' + lead)
+                    return f"{label}{token.value}", 0.9
+        
+        # N/A values
+        if 'n/a' in text.lower():
+            if self.profile is not None:
+                self.profile.count('t_stop.n/a')
+            return "N/A", 0.9
         
         return "", 0.0
 
     def determine_lens_type(self, text: str, focal_length: str) -> Tuple[str, float]:
         """Determine if lens is prime, zoom, or special - improved to detect ranges"""
         # Check for zoom indicators in text
-        zoom_indicators = ['zoom', 'varotal', 'cabrio', 'servo', 'cine-servo']
-        for indicator in zoom_indicators:
-            if indicator in text.lower():
-                return "Zoom", 0.9
+        if self.has_keyword(text.lower(), 'lens_type', 'zoom'):
+            return "Zoom", 0.9
         
         # Check if focal length contains a range (indicating zoom)
         if focal_length and ('-' in focal_length or '/' in focal_length):
             return "Zoom", 0.9
         
         # Check for special lens types
-        special_indicators = ['tilt-shift', 'shift', 'swing', 'lensbaby', 'composer']
-        for indicator in special_indicators:
-            if indicator in text.lower():
-                return "Special", 0.9
+        if self.has_keyword(text.lower(), 'lens_type', 'special'):
+            return "Special", 0.9
         
         # Default to prime if no other indicators found
         return "Prime", 0.7
@@ -522,59 +974,64 @@ class SimpleLensParser:
         text_lower = text.lower()
         
         # Exception: don't set format if "doesn't cover" is mentioned
-        if 'doesn\'t cover' in text_lower:
+        if self.has_keyword(text_lower, 'keyword', "doesn't cover"):
+            if self.profile is not None:
+                self.profile.count("format.doesn't cover")
             return "", 0.0
         
         # Check for FF first (higher priority)
-        if 'ff' in text_lower:
+        if self.has_keyword(text_lower, 'keyword', 'ff'):
+            if self.profile is not None:
+                self.profile.count('format.ff')
             return "FF", 0.9
         
-        # Check for other format patterns with more specific matching
-        format_patterns = {
-            's35': ['s35', 'super 35', 'super35'],
-            'full frame': ['full frame'],
-            's16': ['s16', 'super 16', 'super16'],
-            'aps-c': ['aps-c', 'apsc'],
-            'm43': ['m43', 'micro four thirds', 'micro 4/3'],
-            'vv': ['vv', 'ff/vv']
-        }
-        
         # Check for 16mm format more carefully to avoid focal length false positives
-        if '16mm' in text_lower or '16 mm' in text_lower:
-            # Only consider it a format if it's not part of a focal length range
-            # Look for patterns like "16mm" that are not preceded by numbers or followed by focal length indicators
-            if not re.search(r'\d+\s*-\s*16mm', text_lower) and not re.search(r'16mm\s*-\s*\d+', text_lower):
-                return "16MM", 0.9
+        if self.mentions_16mm_format(text_lower):
+            if self.profile is not None:
+                self.profile.count('format.16mm')
+            return "16MM", 0.9
         
-        for format_name, patterns in format_patterns.items():
-            for pattern in patterns:
-                if pattern in text_lower:
-                    return format_name.upper(), 0.9
+        # Check for other format patterns with more specific matching
+        hit = first_hit(self.alias_hits(text_lower), 'format')
+        if hit:
+            if self.profile is not None:
+                self.profile.count('format.alias')
+            return hit.key.upper(), 0.9
         
         # Don't assume any format if not explicitly mentioned
         return "", 0.0
 
+    def mentions_16mm_format(self, text: str) -> bool:
+        """True for "16mm" / "16 mm" that is not part of a focal length range like 8-16mm or 16mm-35"""
+        if '16' not in text or 'mm' not in text:
+            return False
+        tokens = self.tokenize(text).tokens
+        found = in_range = False
+        for i in range(1, len(tokens)):
+            before = tokens[i - 1]
+            if tokens[i].kind != 'mm' or not before.has_digits or not before.text.endswith('16'):
+                continue
+            found = True
+            if before.end != tokens[i].start:
+                continue  # "16 mm" never counts as a range end
+            # 8-16mm, 8 - 16mm
+            if RANGE_TO_16_RE.search(before.text):
+                in_range = True
+            elif before.kind == 'number' and before.text == '16' and i >= 3 \
+                    and tokens[i - 2].text == '-' and tokens[i - 3].text[-1:].isdigit():
+                in_range = True
+            # 16mm-35mm, 16mm - 35
+            if i + 2 < len(tokens) and tokens[i + 1].text == '-' \
+                    and tokens[i + 2].kind in ('number', 'squeeze'):
+                in_range = True
+        return found and not in_range
+
     def identify_mount(self, text: str) -> Tuple[str, float]:
         """Identify mount from text - improved to avoid false positives"""
         # Check for specific mount patterns first - PL must be standalone
-        mount_patterns = {
-            'lpl': ['lpl', 'lpl mount', '(lpl)'],
-            'pl': [' pl ', '(pl)', ' pl,', ' pl.', ' pl)'],  # PL must be surrounded by spaces, parentheses, or punctuation
-            'ef': ['ef', 'ef mount'],
-            'rf': ['rf', 'rf mount'],
-            'e-mount': ['e-mount', 'e mount', 'sony e'],
-            'z-mount': ['z-mount', 'z mount', 'nikon z'],
-            'f-mount': ['f-mount', 'f mount', 'nikon f'],
-            'bayonet': ['bayonet'],
-            'm42': ['m42', 'm42 mount'],
-            'm39': ['m39', 'm39 mount'],
-            'eos': ['eos']
-        }
-        
-        for mount_name, patterns in mount_patterns.items():
-            for pattern in patterns:
-                if pattern in text.lower():
-                    return mount_name.upper(), 0.9
+        hit = first_hit(self.alias_hits(text.lower()), 'mount')
+        if hit:
+            return hit.key.upper(), 0.9
         
         # Only check for 'e' if it's clearly a mount reference
         if 'e mount' in text.lower() or 'sony e' in text.lower():
@@ -584,10 +1041,9 @@ class SimpleLensParser:
 
     def identify_anamorphic_spherical(self, text: str) -> Tuple[str, float]:
         """Identify if lens is anamorphic or spherical"""
-        for type_name, patterns in self.anamorphic_patterns.items():
-            for pattern in patterns:
-                if pattern in text:
-                    return type_name.title(), 0.9
+        hit = first_hit(self.alias_hits(text), 'anamorphic')
+        if hit:
+            return hit.key.title(), 0.9
         
         # Default to spherical if no indication
         return "Spherical", 0.5
@@ -595,23 +1051,15 @@ class SimpleLensParser:
     def extract_squeeze_factor(self, text: str) -> Tuple[str, float]:
         """Extract anamorphic squeeze factor - only for anamorphic lenses with valid range"""
         # Only extract squeeze factor if the lens is anamorphic
-        if 'anamorphic' not in text.lower():
+        if not self.has_keyword(text.lower(), 'keyword', 'anamorphic'):
             return "", 0.0
         
-        # Squeeze factor patterns - must end with 'x' and be a number between 1-2
-        squeeze_patterns = [
-            r'(\d+(?:\.\d+)?)x',  # 1.8x, 2x, 1.33x
-            r'x(\d+(?:\.\d+)?)',  # x1.8, x2, x1.33
-        ]
-        
-        for pattern in squeeze_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                squeeze_value = float(match.group(1))
-                # Only accept squeeze factors between 1 and 2
-                if 1.0 <= squeeze_value <= 2.0:
-                    squeeze_factor = match.group(1) + 'x'
-                    return squeeze_factor, 0.9
+        # Squeeze factor - first "Nx" (1.8x, 2x, 1.33x), then first "xN" (x1.8, x2, x1.33)
+        stream = self.tokenize(text)
+        for squeeze_value in (stream.first_nx(), stream.first_xn()):
+            # Only accept squeeze factors between 1 and 2
+            if squeeze_value is not None and 1.0 <= float(squeeze_value) <= 2.0:
+                return squeeze_value + 'x', 0.9
         
         return "", 0.0
 
@@ -622,83 +1070,35 @@ class SimpleLensParser:
 
     def extract_housing(self, text: str) -> Tuple[str, float]:
         """Extract housing information"""
-        housing_indicators = [
-            'original housing', 'rehoused', 'ancient optics', 'zero optik', 
-            'tls', 'works cameras', 'whitepoint optics', 'gl optics'
-        ]
-        
-        for indicator in housing_indicators:
-            if indicator in text.lower():
-                return indicator.title(), 0.8
+        hit = first_hit(self.alias_hits(text.lower()), 'housing')
+        if hit:
+            return hit.key.title(), 0.8
         
         return "", 0.0
 
     def extract_use_case(self, text: str) -> Tuple[str, float]:
         """Extract use case information"""
-        if 'macro' in text.lower():
+        if self.has_keyword(text.lower(), 'keyword', 'macro'):
             return "Macro", 0.9
         return "", 0.0
 
     def extract_look(self, text: str) -> Tuple[str, float]:
         """Extract look information"""
-        if 'vintage' in text.lower():
+        if self.has_keyword(text.lower(), 'keyword', 'vintage'):
             return "Vintage", 0.9
         return "", 0.0
 
     def calculate_confidence_score(self, parsed: 'ParsedLens') -> float:
         """Calculate confidence score based on how much of the original name is captured"""
-        if not parsed.original_name:
-            return 0.0
-        
-        # Get the original name and convert to lowercase for comparison
-        original_name = parsed.original_name.lower()
-        
-        # Collect all the parsed values that should be found in the original name
-        parsed_values = []
-        
-        # Core fields
-        if parsed.manufacturer:
-            parsed_values.append(parsed.manufacturer.lower())
-        if parsed.series:
-            parsed_values.append(parsed.series.lower())
-        if parsed.focal_length:
-            parsed_values.append(parsed.focal_length.lower())  # will handle mm length later
-        if parsed.t_stop:
-            parsed_values.append(parsed.t_stop.lower())
-        if parsed.lens_type:
-            parsed_values.append(parsed.lens_type.lower())
-        
-        # Also include notes if available
-        if parsed.notes:
-            parsed_values.append(parsed.notes.lower())
-        
-        if not parsed_values:
-            return 0.0
-        
-        # Count how many characters from the original name are matched by parsed values
-        total_original_chars = len(original_name.replace(' ', ''))  # Remove spaces for fair comparison
-        matched_chars = 0
-        
-        clean_original = original_name.replace(' ', '').replace('-', '').replace('/', '').replace('(', '').replace(')', '')
-
-        for value in parsed_values:
-            clean_value = value.replace(' ', '').replace('-', '').replace('/', '').replace('(', '').replace(')', '')
-
-            # Special handling for focal length where 'mm' may be omitted in parsed value
-            if value == parsed.focal_length.lower():
-                focal_with_mm = f"{clean_value}mm"
-                if focal_with_mm in clean_original:
-                    matched_chars += len(focal_with_mm)
-                    continue  # skip normal add
-            if clean_value in clean_original:
-                matched_chars += len(clean_value)
-        
-        # Calculate percentage of original name that is captured
-        if total_original_chars == 0:
-            return 0.0
-        
-        confidence = min(matched_chars / total_original_chars, 1.0)
-        return confidence
+        return self.confidence_score(parsed.original_name, parsed.as_dict())
+
+    def confidence_score(self, lens_name: str, values: Dict[str, object]) -> float:
+        """Share of ``lens_name`` covered by the parsed ``values`` (coverage_confidence)"""
+        return coverage_score(lens_name, values)
+
+    def confidence_scores(self, names: List[str], columns: 'pd.DataFrame') -> 'np.ndarray':
+        """``confidence_score`` for a batch of names and their parsed columns"""
+        return coverage_scores(names, columns)
 
     def parse_lens_name(self, lens_name: str) -> ParsedLens:
         """Parse a single lens name"""
@@ -706,170 +1106,103 @@ class SimpleLensParser:
             return ParsedLens(original_name=lens_name)
         
         text = self.preprocess_text(lens_name)
-        scores = []
+        if self.cache is None:
+            return self._parse_text(lens_name, text)[0]
+        
+        fields = self.cache.get(text, lens_name)
+        if fields is not None:
+            return ParsedLens(original_name=lens_name, **fields)
+        parsed, raw_sensitive = self._parse_text(lens_name, text)
+        fields = parsed.as_dict()
+        del fields['original_name']
+        self.cache.put(text, lens_name, fields, raw_sensitive)
+        return parsed
+
+    def _parse_text(self, lens_name: str, text: str) -> Tuple[ParsedLens, bool]:
+        """Parse ``lens_name`` (preprocessed as ``text``).
+
+        Also reports whether the result used the raw name beyond its
+        preprocessed form (notes keep their case, rule captures …).
+        """
+        # Extract focal length
+        focal_length, fl_score = self.extract_focal_length(text)
+        
+        # Extract T-stop
+        t_stop, t_score = self.extract_t_stop(text)
         
+        # Extract squeeze factor
+        squeeze_factor, squeeze_score = self.extract_squeeze_factor(text)
+        
+        # Extract notes from parentheses
+        notes = self.extract_notes(lens_name, text)
+        
+        values, fired = self._dictionary_fields(lens_name, text, focal_length)
+        values.update(focal_length=focal_length, t_stop=t_stop,
+                      anamorphic_squeeze=squeeze_factor, notes=notes)
+        raw_sensitive = bool(notes) or not self.special_rules.fields.capture_ids.isdisjoint(fired)
+        
+        # Calculate overall confidence
+        confidence = self.confidence_score(lens_name, values)
+        
+        return ParsedLens(
+            **values,
+            original_name=lens_name,
+            needs_review=confidence < 0.6,
+            confidence_score=confidence
+        ), raw_sensitive
+
+    def extract_notes(self, lens_name: str, text: str) -> str:
+        """Extract notes from the first parenthetical group"""
+        if self.tokenize(text).parens:
+            # Slice from the original name to keep its case
+            notes_match = PAREN_NOTE_RE.search(lens_name)
+            if notes_match:
+                return notes_match.group(1).strip()
+        return ""
+
+    def _dictionary_fields(self, lens_name: str, text: str, focal_length: str) -> Tuple[Dict[str, str], set]:
+        """Fields from the alias dictionaries and special-case rules.
+
+        Returns the fields plus the ids of the special rules that fired.
+        """
         # Extract manufacturer
         manufacturer, mfg_score = self.identify_manufacturer(text)
-        scores.append(mfg_score)
         
         # Extract series
         series, series_score = self.identify_series(text)
-        scores.append(series_score)
-        
-        # Extract focal length
-        focal_length, fl_score = self.extract_focal_length(text)
-        scores.append(fl_score)
-        
-        # Extract T-stop
-        t_stop, t_score = self.extract_t_stop(text)
-        scores.append(t_score)
         
         # Determine lens type
         lens_type, type_score = self.determine_lens_type(text, focal_length)
-        scores.append(type_score)
         
         # Identify format
         format_info, format_score = self.identify_format(text)
-        scores.append(format_score)
         
         # Identify mount
         mount, mount_score = self.identify_mount(text)
-        scores.append(mount_score)
         
         # Identify anamorphic/spherical
         anamorphic_spherical, ana_score = self.identify_anamorphic_spherical(text)
-        scores.append(ana_score)
-        
-        # Extract squeeze factor
-        squeeze_factor, squeeze_score = self.extract_squeeze_factor(text)
-        scores.append(squeeze_score)
         
         # Extract anamorphic location
         anamorphic_location, loc_score = self.extract_anamorphic_location(text)
-        scores.append(loc_score)
         
         # Extract housing
         housing, housing_score = self.extract_housing(text)
-        scores.append(housing_score)
         
         # Extract use case and look
         use_case, use_case_score = self.extract_use_case(text)
         look, look_score = self.extract_look(text)
-        scores.append(use_case_score)
-        scores.append(look_score)
         
-        # Extract notes from parentheses
-        notes = ""
-        notes_match = re.search(r'\((.*?)\)', lens_name)
-        if notes_match:
-            notes = notes_match.group(1).strip()
-        
-        # Special logic for Master Anamorphic series
-        if series == "Master Anamorphic":
-            manufacturer = "Arri"
-            anamorphic_spherical = "Anamorphic"
-            format_info = "S35"
-            mfg_score = 0.9
-            ana_score = 0.9
-            format_score = 0.9
-        
-        # Special logic for Fujinon cases
-        if manufacturer == "Fujinon" and any(pattern in text.lower() for pattern in [
-            'ha25x16.5', 'ha42x9.7', 'ha13x4.5', 'ha18x7.6', 'ha22x7.8', 
-            'za12x4.5', 'za17x7.6', 'za22x7.6'
-        ]):
-            # Extract everything after "Fujinon" as the series, preserving original case
-            series_match = re.search(r'fujinon\s+(.+)', lens_name, re.IGNORECASE)
-            if series_match:
-                series = series_match.group(1).strip()
-                series_score = 0.9
-            lens_type = "Zoom"
-            anamorphic_spherical = "Spherical"
-            type_score = 0.9
-            ana_score = 0.9
-        
-        # Special logic for missing Super Speed/Standard Speed manufacturers
-        if (series == "Super Speed" or series == "Standard Speed") and not manufacturer:
-            manufacturer = "Zeiss"
-            mfg_score = 0.8
-        
-        # Special logic for K-35 series (Canon)
-        if series == "K-35" and not manufacturer:
-            manufacturer = "Canon"
-            mfg_score = 0.9
-        
-        # Special logic for Super Speed/Standard Speed (Zeiss)
-        if (series == "Super Speed" or series == "Standard Speed") and not manufacturer:
-            manufacturer = "Zeiss"
-            mfg_score = 0.9
-        
-        # Special logic for Master Anamorphic (Arri)
-        if series == "Master Anamorphic" and not manufacturer:
-            manufacturer = "Arri"
-            mfg_score = 0.9
-        
-        # Special logic for Leitz (Leica)
-        if 'leitz' in text.lower() and not manufacturer:
-            manufacturer = "Leica"
-            mfg_score = 0.9
-        
-        # Special handling for individual special lenses
-        special_lens_names = [
-            'snorricam', 'peephole lens', 'kish kaleidoscope lens', 'rifle scope',
-            'squishy lens', 'image shaker', 'astroscope night vision module',
-            'keslow flow motion lens system', 'kes-low angle mirror',
-            'p+s technik skater scope', 't-rex lens', 'century super wide low angle prism',
-            'leica telephoto front module', 'leica telephoto rear module',
-            'optex excellence probe', 'infiniprobe', 'distortion lens',
-            'swift 960 series microscope lens', 'sim ethereal', 'ethereal',
-            'rodenstock münchen doppel anastigmat eurynar'
-        ]
-        
-        if any(special_name in lens_name.lower() for special_name in special_lens_names):
-            lens_type = "Special"
-            type_score = 0.9
-        
-        # Special logic for Sony GM series
-        if manufacturer == "Sony" and ('gm' in text.lower() or 'fe gm' in text.lower()):
-            series = "GM"
-            series_score = 0.9
-        
-        # Special logic for SIM Ethereal series
-        if 'sim ethereal' in text.lower() or 'ethereal' in text.lower():
-            manufacturer = "SIM"
-            series = "Ethereal"
-            mfg_score = 0.9
-            series_score = 0.9
-            # Ensure it's not detected as Special
-            if lens_type == "Special":
-                lens_type = "Prime"
-                type_score = 0.7
-        
-        # Special logic for Swift 960 series
-        if 'swift 960' in text.lower():
-            manufacturer = "Swift 960"
-            series = ""
-            mfg_score = 0.9
-        
-        # Special logic for EZ-2 series (Angenieux)
-        if series == "EZ-2":
-            manufacturer = "Angenieux"
-            mfg_score = 0.9
-        
-        # Special logic for EZ-1 series (Angenieux)
-        if series == "EZ-1":
-            manufacturer = "Angenieux"
-            mfg_score = 0.9
-        
-        # Special logic for Cooke SF (Special Flare) series
-        if manufacturer == "Cooke" and series == "SF":
-            series = "Special Flare"
-            series_score = 0.9
-        
-        # Special logic for Cooke Anamorphic SF (Special Flare) series
-        if manufacturer == "Cooke" and 'anamorphic sf' in text.lower():
-            series = "Special Flare"
-            series_score = 0.9
+        # Special-case rules (special_rules.json) - later rules see earlier results
+        state = {
+            'manufacturer': manufacturer,
+            'series': series,
+            'lens_type': lens_type,
+            'format': format_info,
+            'anamorphic_spherical': anamorphic_spherical,
+        }
+        fired = self.apply_special_rules(text, state, lens_name)
+        series = state['series']
         
         # Extract flare color from CINE FLARE series
         flare_color = ""
@@ -881,49 +1214,288 @@ class SimpleLensParser:
             elif 'gold' in series.lower():
                 flare_color = "Gold"
         
-        # Calculate overall confidence
-        confidence = self.calculate_confidence_score(ParsedLens(
-            manufacturer=manufacturer,
-            series=series,
-            focal_length=focal_length,
-            t_stop=t_stop,
-            lens_type=lens_type,
-            format=format_info,
-            mount=mount,
-            anamorphic_spherical=anamorphic_spherical,
-            anamorphic_squeeze=squeeze_factor,
-            anamorphic_location=anamorphic_location,
-            housing=housing,
-            notes=notes,
-            original_name=lens_name,
-            needs_review=False, # This will be set by calculate_confidence_score
-            confidence_score=sum(scores) / len(scores) # This will be set by calculate_confidence_score
-        ))
-        
-        return ParsedLens(
-            manufacturer=manufacturer,
-            series=series,
-            focal_length=focal_length,
-            t_stop=t_stop,
-            lens_type=lens_type,
-            format=format_info,
+        return dict(
+            state,
             mount=mount,
-            anamorphic_spherical=anamorphic_spherical,
-            anamorphic_squeeze=squeeze_factor,
             anamorphic_location=anamorphic_location,
             housing=housing,
             use_case=use_case,
             look=look,
-            notes=notes,
             flare=flare_color,
-            original_name=lens_name,
-            needs_review=confidence < 0.6,
-            confidence_score=confidence
-        )
+        ), fired
+
+    def apply_special_rules(self, text: str, state: Dict[str, str], lens_name: str) -> List[str]:
+        """Apply the special_rules.json field rules to ``state`` in place; returns the fired rule ids"""
+        fired = self.special_rules.fields.evaluate(self.rule_triggers(text), state, lens_name)
+        if self.profile is not None:
+            self.profile.count_rules(fired)
+        return fired
+
+    def extract_regex_columns(self, names: 'pd.Series', texts: 'pd.Series') -> 'pd.DataFrame':
+        """Focal length, T-stop, squeeze factor and notes for a whole column.
+
+        ``texts`` holds the preprocessed ``names``.  Each field is read with
+        the column-wise patterns of lens_tokenizer, searched once per name in
+        order of preference (a later pattern only runs when the earlier ones
+        found nothing), so no token stream is built; names with a tangled
+        numeric run (see lens_tokenizer.TANGLED_RUN_RE) take the token-stream
+        extractors for focal length and squeeze instead.
+        """
+        import pandas as pd
+        
+        anamorphic_aliases = self.keyword_patterns['anamorphic']
+        rows = []
+        for lens_name, text in zip(names.tolist(), texts.tolist()):
+            if TANGLED_RUN_RE.search(text):
+                # Tangled numeric runs: the token stream borrows across them
+                focal_length = self.extract_focal_length(text)[0]
+                squeeze = self.extract_squeeze_factor(text)[0]
+            else:
+                # Focal length - the number before the first mm unit, else the first digit chain
+                match = MM_VALUE_RE.search(text) or FIRST_CHAIN_RE.search(text)
+                focal_length = match.group(1) if match else ""
+                # Squeeze factor - anamorphic lenses only, first "Nx" then first "xN" between 1 and 2
+                squeeze = ""
+                if any(alias in text for alias in anamorphic_aliases):
+                    for pattern in (NX_RE, XN_RE):
+                        match = pattern.search(text)
+                        if match and 1.0 <= float(match.group(1)) <= 2.0:
+                            squeeze = match.group(1) + 'x'
+                            break
+            
+            # T-stop - all T leads first, then F, then F/, then N/A
+            t_stop = ""
+            for label, pattern in STOP_LEAD_RES:
+                match = pattern.search(text)
+                if match:
+                    t_stop = label + match.group(1)
+                    break
+            else:
+                if 'n/a' in text:
+                    t_stop = "N/A"
+            
+            # Notes - first parenthetical group of the original name
+            notes = ""
+            if PAREN_PAIR_RE.search(text):
+                match = PAREN_NOTE_RE.search(lens_name)
+                if match:
+                    notes = match.group(1).strip()
+            rows.append((focal_length, t_stop, squeeze, notes))
+        return pd.DataFrame(rows, index=texts.index, columns=REGEX_COLUMNS)
+
+    def _regex_columns_within(self, budget: 'RowBudget', names: 'pd.Series',
+                              texts: 'pd.Series') -> Tuple['pd.DataFrame', List[int]]:
+        """extract_regex_columns in REGEX_CHUNK_ROWS chunks, each within ``budget``
+
+        A chunk that runs over is redone one name at a time; a name that
+        runs over on its own gets empty regex fields.  Returns the columns
+        and the positions of those names.
+        """
+        import pandas as pd
+        from row_budget import RowTimeout
+        
+        if not budget.enabled or not len(texts):
+            return self.extract_regex_columns(names, texts), []
+        parts = []
+        timed_out = []
+        for start in range(0, len(texts), REGEX_CHUNK_ROWS):
+            stop = min(start + REGEX_CHUNK_ROWS, len(texts))
+            try:
+                parts.append(budget.call(self.extract_regex_columns, names.iloc[start:stop], texts.iloc[start:stop]))
+                continue
+            except RowTimeout:
+                pass
+            for i in range(start, stop):
+                try:
+                    parts.append(budget.call(self.extract_regex_columns, names.iloc[i:i + 1], texts.iloc[i:i + 1]))
+                except RowTimeout:
+                    parts.append(pd.DataFrame("", index=texts.index[i:i + 1], columns=REGEX_COLUMNS))
+                    timed_out.append(i)
+        return pd.concat(parts), timed_out
+
+    def parse_many(self, names: Iterable[str], jobs: int = 1) -> 'pd.DataFrame':
+        """Parse a batch of lens names into a DataFrame with the ParsedLens columns.
+
+        ``parse_batch(names, jobs).to_frame()``: the dictionary-encoded
+        fields (ENCODED_COLUMNS) come back as categorical columns.
+        """
+        return self.parse_batch(names, jobs=jobs).to_frame()
 
-    def parse_csv(self, input_file: str, output_file: str) -> None:
-        """Parse lens names from CSV file"""
+    def parse_batch(self, names: Iterable[str], jobs: int = 1,
+                    pool: Optional['ProcessPoolExecutor'] = None) -> ParsedLensBatch:
+        """Parse a batch of lens names into a ParsedLensBatch, one row per name.
+
+        Gives the same rows as ``parse_lens_name`` on each name, but the
+        regex-only fields are read without a token stream
+        (extract_regex_columns), confidence is scored for the whole batch
+        and each distinct name is parsed once.  Names already in the parse cache
+        are not parsed again, and new results are added to it.
+
+        ``jobs > 1`` parses the distinct names in chunks on a process pool
+        (see parse_chunks) - ``pool``, if given, from worker_pool() - and
+        rows come back in input order either way.
+
+        A name longer than MAX_NAME_LENGTH, or one whose per-name stages take
+        longer than ``row_budget`` seconds, is flagged for review instead of
+        stalling the batch.
+        """
+        import numpy as np
+        import pandas as pd
+        
+        names = pd.Series(list(names), dtype=object)
+        present = names.map(bool, na_action='ignore').fillna(False).astype(bool)
+        unique = pd.Series(names[present].unique(), dtype=object)
+        
+        cached = []
+        todo = unique
+        if self.cache is not None and len(unique):
+            texts = preprocess_column(unique)
+            hits = [self.cache.get(text, lens_name) for text, lens_name in zip(texts, unique)]
+            cached = [dict(fields, original_name=lens_name)
+                      for lens_name, fields in zip(unique, hits) if fields is not None]
+            missing = [fields is None for fields in hits]
+            todo = unique[missing].reset_index(drop=True)
+            texts = texts[missing]
+        
+        if jobs > 1 and len(todo) > 1:
+            parsed, raw_sensitive = self.parse_chunks(todo.tolist(), jobs, pool=pool)
+        else:
+            parsed, raw_sensitive = self._parse_distinct(todo)
+        
+        if self.cache is not None and len(unique):
+            for text, values, sensitive in zip(texts, frame_rows(parsed), raw_sensitive):
+                if sensitive is None:
+                    # Not parsed (too long / over budget): don't keep the placeholder
+                    continue
+                record = dict(zip(PARSED_LENS_COLUMNS, values))
+                lens_name = record.pop('original_name')
+                self.cache.put(text, lens_name, record, sensitive)
+            self.cache.flush()
+        
+        # Blank names parse to an empty ParsedLens
+        parsed = pd.concat([parsed, pd.DataFrame(cached + [ParsedLens().as_dict()], columns=PARSED_LENS_COLUMNS)],
+                           ignore_index=True).infer_objects()
+        order = pd.Index(pd.concat([todo, pd.Series([c['original_name'] for c in cached], dtype=object)]))
+        positions = order.get_indexer(names.where(present))
+        # Encode the distinct rows, then repeat them in input order
+        batch = ParsedLensBatch.from_frame(parsed).take(np.where(positions < 0, len(parsed) - 1, positions))
+        batch.columns['original_name'] = names.to_numpy()
+        return batch
+
+    def _parse_distinct(self, unique: 'pd.Series') -> Tuple['pd.DataFrame', List[Optional[bool]]]:
+        """ParsedLens columns for distinct, non-blank names (one row each)
+
+        Also returns each row's raw-sensitivity, as used by the parse cache
+        (None for a row that must not be cached).  Names over MAX_NAME_LENGTH
+        are not parsed.  Every stage of a name's parse - the regex columns
+        and their tangled-run fallback, then the dictionary / special-case
+        stages - runs within ``row_budget``; a name over it
+        keeps only the fields read before it ran out.  Both are flagged for
+        review.
+        """
+        import pandas as pd
+        from row_budget import RowBudget, RowTimeout
+        
+        oversized = (unique.str.len() > MAX_NAME_LENGTH).to_numpy()
+        if oversized.any():
+            parsed, flags = self._parse_distinct(unique[~oversized])
+            skipped = pd.DataFrame([ParsedLens(original_name=lens_name, needs_review=True).as_dict()
+                                    for lens_name in unique[oversized]],
+                                   index=unique.index[oversized], columns=PARSED_LENS_COLUMNS)
+            print(f"[SimpleLensParser] Warning: {len(skipped)} name(s) over {MAX_NAME_LENGTH} "
+                  f"characters not parsed, flagged for review")
+            flags = iter(flags)
+            return (pd.concat([parsed, skipped]).loc[unique.index],
+                    [None if too_long else next(flags) for too_long in oversized])
+        
+        texts = preprocess_column(unique)
+        
+        rows = []
+        capture_ids = self.special_rules.fields.capture_ids
+        raw_sensitive: List[Optional[bool]] = []
+        with RowBudget(self.row_budget) as budget:
+            columns, timed_out = self._regex_columns_within(budget, unique, texts)
+            regex_timed_out = set(timed_out)
+            for i, (lens_name, text, focal_length, notes) in enumerate(
+                    zip(unique.tolist(), texts.tolist(), columns['focal_length'].tolist(), columns['notes'].tolist())):
+                try:
+                    if i in regex_timed_out:
+                        raise RowTimeout()
+                    fields, fired = budget.call(self._dictionary_fields, lens_name, text, focal_length)
+                except RowTimeout:
+                    rows.append({})
+                    raw_sensitive.append(None)
+                    if i not in regex_timed_out:
+                        timed_out.append(i)
+                    continue
+                rows.append(fields)
+                raw_sensitive.append(bool(notes) or not capture_ids.isdisjoint(fired))
+        parsed = pd.DataFrame(rows, index=unique.index).join(columns)
+        parsed['original_name'] = unique
+        parsed['confidence_score'] = self.confidence_scores(unique.tolist(), parsed)
+        parsed['needs_review'] = parsed['confidence_score'] < 0.6
+        if timed_out:
+            parsed.iloc[sorted(timed_out), parsed.columns.get_loc('needs_review')] = True
+            print(f"[SimpleLensParser] Warning: {len(timed_out)} name(s) over the "
+                  f"{self.row_budget}s per-name budget, flagged for review")
+        return parsed.reindex(columns=PARSED_LENS_COLUMNS, fill_value=""), raw_sensitive
+
+    def worker_pool(self, jobs: int) -> 'ProcessPoolExecutor':
+        """Process pool of ``jobs`` workers for parse_chunks, each with its own parser.
+
+        Starting the workers (and loading their parsers) costs far more than
+        parsing a chunk, so callers parsing several batches create one pool
+        and pass it to every parse_batch / parse_chunks call.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                   initargs=(self.pattern_fingerprint(), self.row_budget))
+
+    def parse_chunks(self, unique: List[str], jobs: int,
+                     chunk_size: Optional[int] = None,
+                     pool: Optional['ProcessPoolExecutor'] = None) -> Tuple['pd.DataFrame', List[Optional[bool]]]:
+        """``_parse_distinct`` over a process pool of ``jobs`` workers.
+
+        Each worker builds its own SimpleLensParser once and reuses it for
+        every chunk it is handed; chunks are merged back in input order, so
+        the result does not depend on ``jobs`` or scheduling.  Workers load
+        the dictionaries from disk, so in-place edits to this parser's
+        dictionaries are refused (the pattern fingerprints must match).
+        ``pool`` (from worker_pool) is used as is and left running;
+        otherwise a pool is started for this call.
+        """
+        import pandas as pd
+        
+        if chunk_size is None:
+            # A few chunks per worker keeps the pool busy without tiny tasks
+            chunk_size = max(1, -(-len(unique) // (jobs * 4)))
+        chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+        if pool is None:
+            with self.worker_pool(jobs) as pool:
+                parts = list(pool.map(_parse_worker_chunk, chunks))
+        else:
+            parts = list(pool.map(_parse_worker_chunk, chunks))
+        return (pd.concat([frame for frame, _ in parts], ignore_index=True),
+                [sensitive for _, flags in parts for sensitive in flags])
+
+    def parse_frame(self, df: 'pd.DataFrame', column: str = 'Lens Name', jobs: int = 1) -> 'pd.DataFrame':
+        """``parse_many`` over ``df[column]`` (as strings), aligned with ``df``'s index"""
+        return self.parse_batch(df[column].map(str), jobs=jobs).to_frame(index=df.index)
+
+    def parse_csv(self, input_file: str, output_file: str, jobs: int = 1, stream: bool = False) -> None:
+        """Parse lens names from CSV file (``jobs`` worker processes)
+
+        ``stream=True`` goes through stream_csv and keeps memory bounded.
+        """
+        import pandas as pd
+        
         try:
+            if stream:
+                count = self.stream_csv(input_file, output_file, jobs=jobs)
+                print(f"Parsed {count} lenses and saved to {output_file}")
+                return
+            
             # Read input CSV
             df = pd.read_csv(input_file)
             
@@ -931,26 +1503,105 @@ class SimpleLensParser:
                 print(f"Error: 'Lens Name' column not found in {input_file}")
                 return
             
-            # Parse each lens name
-            parsed_lenses = []
-            for _, row in df.iterrows():
-                lens_name = str(row['Lens Name'])
-                parsed = self.parse_lens_name(lens_name)
-                parsed_lenses.append(parsed)
-            
-            # Convert to DataFrame
-            result_df = pd.DataFrame([vars(lens) for lens in parsed_lenses])
+            # Parse the whole column at once
+            result_df = self.parse_frame(df, 'Lens Name', jobs=jobs)
             
             # Save to CSV
             result_df.to_csv(output_file, index=False)
-            print(f"Parsed {len(parsed_lenses)} lenses and saved to {output_file}")
+            print(f"Parsed {len(result_df)} lenses and saved to {output_file}")
             
         except Exception as e:
             print(f"Error processing CSV: {e}")
 
+    def stream_csv(self, input_file: str, output_file: str, jobs: int = 1,
+                   chunk_rows: int = 10_000) -> int:
+        """Parse the 'Lens Name' column of ``input_file`` into ``output_file`` in bounded memory.
+
+        Rows are read lazily, parsed ``chunk_rows`` at a time with parse_batch
+        and written straight out, so only one chunk is ever held.  Columns
+        follow the ParsedLens fields, as in parse_csv.  Cells are read
+        verbatim: an empty name stays empty instead of becoming "nan".
+        Returns the number of rows written.  With ``jobs > 1`` one worker
+        pool serves every chunk.
+        """
+        from contextlib import ExitStack
+        
+        count = 0
+        with ExitStack() as stack:
+            src = stack.enter_context(open(input_file, newline='', encoding='utf-8'))
+            dst = stack.enter_context(open(output_file, 'w', newline='', encoding='utf-8'))
+            pool = stack.enter_context(self.worker_pool(jobs)) if jobs > 1 else None
+            reader = csv.DictReader(src)
+            if 'Lens Name' not in (reader.fieldnames or ()):
+                raise ValueError(f"'Lens Name' column not found in {input_file}")
+            writer = csv.writer(dst, lineterminator='\n')
+            writer.writerow(PARSED_LENS_COLUMNS)
+            names = (row['Lens Name'] or "" for row in reader)
+            while True:
+                chunk = list(islice(names, chunk_rows))
+                if not chunk:
+                    break
+                writer.writerows(self.parse_batch(chunk, jobs=jobs, pool=pool).rows())
+                count += len(chunk)
+        return count
+
+# Worker-process state for SimpleLensParser.parse_chunks
+_worker_parser: Optional[SimpleLensParser] = None
+_worker_matches_caller = False
+
+def _init_worker(fingerprint: str, row_budget: Optional[float]) -> None:
+    """Build the worker's parser once; every chunk it parses reuses it"""
+    global _worker_parser, _worker_matches_caller
+    _worker_parser = SimpleLensParser.load(cache_size=0, row_budget=row_budget)
+    _worker_matches_caller = _worker_parser.pattern_fingerprint() == fingerprint
+
+def _parse_worker_chunk(names: List[str]) -> Tuple['pd.DataFrame', List[Optional[bool]]]:
+    import pandas as pd
+    
+    if not _worker_matches_caller:
+        raise RuntimeError("worker parser patterns differ from the caller's "
+                           "(dictionaries edited in place?); use jobs=1")
+    return _worker_parser._parse_distinct(pd.Series(names, dtype=object))
+
 def main():
-    """Main function for testing"""
-    parser = SimpleLensParser()
+    """Main function for testing
+
+    With an input CSV (``Lens Name`` column) parses it to the output CSV
+    instead: ``simple_lens_parser.py input.csv [output.csv] [--jobs N] [--stream]``.
+    ``--compile`` writes the parser snapshot used by SimpleLensParser.load().
+    ``--row-budget SECONDS`` sets the time allowed per name (0: unlimited).
+    ``--profile [report.json]`` prints per-stage timings and branch / rule
+    counters afterwards (and writes them as JSON).
+    """
+    import argparse
+    
+    args = argparse.ArgumentParser(description=__doc__)
+    args.add_argument('input', nargs='?', help="CSV with a 'Lens Name' column")
+    args.add_argument('output', nargs='?', default='parsed_lenses_output.csv')
+    args.add_argument('--jobs', type=int, default=1, help="worker processes (default 1)")
+    args.add_argument('--stream', action='store_true', help="bounded-memory streaming mode")
+    args.add_argument('--compile', action='store_true',
+                      help=f"write the parser snapshot ({SNAPSHOT_FILE}) and exit")
+    args.add_argument('--row-budget', type=float, default=ROW_BUDGET_SECONDS, metavar='SECONDS',
+                      help=f"time allowed per name before it is flagged for review (default {ROW_BUDGET_SECONDS}, "
+                           "0 for no limit); enforced with SIGALRM, so only on POSIX systems and in each "
+                           "process's main thread - on Windows, or parsing from another thread, "
+                           "names are never cut off")
+    args.add_argument('--profile', nargs='?', const='', metavar='JSON',
+                      help="print per-stage timings and counters (in this process) and optionally save them as JSON")
+    args = args.parse_args()
+    
+    if args.compile:
+        print(f"Wrote {SimpleLensParser().compile_snapshot()}")
+        return
+    
+    parser = SimpleLensParser.load(row_budget=args.row_budget or None)
+    if args.profile is not None:
+        parser.enable_profiling()
+    if args.input:
+        parser.parse_csv(args.input, args.output, jobs=args.jobs, stream=args.stream)
+        report_profile(parser, args.profile)
+        return
     
     # Test with some sample lens names
     test_lenses = [
@@ -979,6 +1630,17 @@ def main():
         print(f"Mount: {parsed.mount}")
         print(f"Confidence: {parsed.confidence_score:.3f}")
         print(f"Needs Review: {parsed.needs_review}")
+    report_profile(parser, args.profile)
+
+def report_profile(parser: SimpleLensParser, json_file: Optional[str]) -> None:
+    """Print the profiling table and save the JSON report (CLI ``--profile``)"""
+    profile = parser.disable_profiling()
+    if profile is None:
+        return
+    print(profile.table())
+    if json_file:
+        Path(json_file).write_text(profile.to_json(), encoding='utf-8')
+        print(f"Profile saved to {json_file}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
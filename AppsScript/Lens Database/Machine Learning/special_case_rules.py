@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Special Case Rules
+==================
+
+Table-driven replacement for the hand-written special cases in
+``SimpleLensParser``.  Rules live in ``special_rules.json`` and look like::
+
+    {"id": "k35-canon", "precedence": 40,
+     "when": {"series": "K-35", "manufacturer": ""},
+     "set": {"manufacturer": "Canon"}}
+
+``when`` predicates:
+  • ``text_any``  – at least one substring occurs in the preprocessed name
+  • ``text_none`` – none of the substrings occur in the preprocessed name
+  • any other key – the current value of that field equals the given string
+                    (or one of a list of strings; "" means the field is empty)
+
+``set`` assigns literal strings, or ``{"capture": regex}`` to take group 1 of
+a case-insensitive search over the original name.
+
+Rules run in ascending ``precedence``.  A rule set is either *first match*
+(evaluation stops at the first rule that fires – used for series overrides)
+or *cumulative* (every matching rule fires and later rules see, and may
+overwrite, what earlier rules set).
+
+Each rule is indexed by a trigger: its ``text_any`` substrings (fed by the
+parser's alias automaton) or, failing that, one of its field conditions.
+Only rules whose trigger is present are evaluated for a given name.
+"""
+
+import heapq
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Set, Tuple, Union
+
+RULES_FILE = Path(__file__).with_name('special_rules.json')
+
+
+@dataclass(frozen=True)
+class Capture:
+    """Action value taken from a regex group over the original lens name."""
+    pattern: Pattern
+
+
+@dataclass(frozen=True)
+class SpecialRule:
+    id: str
+    precedence: int
+    text_any: Tuple[str, ...]
+    text_none: Tuple[str, ...]
+    fields: Tuple[Tuple[str, FrozenSet[str]], ...]
+    actions: Tuple[Tuple[str, Union[str, Capture]], ...]
+
+    def matches(self, present: Set[str], state: Dict[str, str]) -> bool:
+        if self.text_any and not any(t in present for t in self.text_any):
+            return False
+        if any(t in present for t in self.text_none):
+            return False
+        return all(state.get(field, '') in values for field, values in self.fields)
+
+
+def compile_rule(spec: Dict) -> SpecialRule:
+    """Turn one JSON rule into a SpecialRule, validating its shape."""
+    when = dict(spec.get('when', {}))
+    text_any = tuple(t.lower() for t in when.pop('text_any', []))
+    text_none = tuple(t.lower() for t in when.pop('text_none', []))
+    fields = tuple(
+        (field, frozenset([value] if isinstance(value, str) else value))
+        for field, value in when.items()
+    )
+    actions = []
+    for field, value in spec.get('set', {}).items():
+        if isinstance(value, dict):
+            value = Capture(re.compile(value['capture'], re.IGNORECASE))
+        actions.append((field, value))
+    if not actions:
+        raise ValueError(f"rule {spec.get('id')!r} has no 'set' actions")
+    return SpecialRule(
+        id=spec['id'],
+        precedence=int(spec.get('precedence', 0)),
+        text_any=text_any,
+        text_none=text_none,
+        fields=fields,
+        actions=tuple(actions),
+    )
+
+
+class RuleSet:
+    """Precedence-ordered rules with a trigger index."""
+
+    def __init__(self, specs: Iterable[Dict], first_match: bool = False):
+        compiled = [compile_rule(spec) for spec in specs]
+        # Stable sort keeps file order for equal precedence
+        self.rules: List[SpecialRule] = sorted(compiled, key=lambda r: r.precedence)
+        self.first_match = first_match
+        # Rules whose actions read the original (un-preprocessed) name
+        self.capture_ids: FrozenSet[str] = frozenset(
+            rule.id for rule in self.rules
+            if any(isinstance(value, Capture) for _, value in rule.actions)
+        )
+
+        self.by_text: Dict[str, List[int]] = {}
+        self.by_field: Dict[Tuple[str, str], List[int]] = {}
+        self.unindexed: List[int] = []
+        for idx, rule in enumerate(self.rules):
+            if rule.text_any:
+                for token in rule.text_any:
+                    self.by_text.setdefault(token, []).append(idx)
+            elif rule.fields:
+                field, values = rule.fields[0]
+                for value in values:
+                    self.by_field.setdefault((field, value), []).append(idx)
+            else:
+                self.unindexed.append(idx)
+
+    @property
+    def trigger_strings(self) -> Set[str]:
+        tokens = set(self.by_text)
+        for rule in self.rules:
+            tokens.update(rule.text_none)
+        return tokens
+
+    def evaluate(self, present: Set[str], state: Dict[str, str], original: str = '') -> List[str]:
+        """Apply matching rules to ``state`` in place; return the fired rule ids."""
+        queue = list(self.unindexed)
+        for token in present:
+            queue.extend(self.by_text.get(token, ()))
+        for field, value in list(state.items()):
+            queue.extend(self.by_field.get((field, value), ()))
+        heapq.heapify(queue)
+
+        fired: List[str] = []
+        seen: Set[int] = set()
+        while queue:
+            idx = heapq.heappop(queue)
+            if idx in seen:
+                continue
+            seen.add(idx)
+            rule = self.rules[idx]
+            if not rule.matches(present, state):
+                continue
+            fired.append(rule.id)
+            for field, value in rule.actions:
+                if isinstance(value, Capture):
+                    match = value.pattern.search(original)
+                    if not match:
+                        continue
+                    value = match.group(1).strip()
+                state[field] = value
+                # A field change can wake later field-triggered rules
+                for later in self.by_field.get((field, value), ()):
+                    if later > idx:
+                        heapq.heappush(queue, later)
+            if self.first_match:
+                break
+        return fired
+
+
+class SpecialCaseRules:
+    """Series override and field rule tables loaded from ``special_rules.json``."""
+
+    def __init__(self, path: Optional[Path] = None):
+        import json
+        
+        self.path = path = path or RULES_FILE
+        with path.open(encoding='utf-8') as fp:
+            data = json.load(fp)
+        self.series = RuleSet(data.get('series_rules', []), first_match=True)
+        self.fields = RuleSet(data.get('field_rules', []))
+
+    @property
+    def trigger_table(self) -> Dict[str, List[str]]:
+        """Alias-automaton table with every substring the rules look for."""
+        tokens = self.series.trigger_strings | self.fields.trigger_strings
+        return {token: [token] for token in sorted(tokens)}
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Synthetic Lenses
+================
+
+Generates lens-name CSVs of any size, with ground-truth columns, for scale
+and stress testing.  The distributions are learned from the hand-corrected
+``Manual Edits.csv``:
+
+  • families – manufacturer, series and lens type, weighted by how often
+    they occur, each with the name layouts ("templates") it is written in
+  • per family – the focal lengths, T-stops and squeeze factors it comes in
+  • overall – mounts, housings and parenthetical notes
+
+Each template is a real name with its focal length, T-stop, squeeze factor,
+mount, housing and first "(...)" note cut out as slots, e.g.
+``{focal}mm Cooke Anamorphic {squeeze} Lens {t_stop}``.  A synthetic row
+picks a family, one of its templates and a value for each slot; its ground
+truth is the source row's hand-corrected fields with each slot's field
+replaced by the value put in.  Slots hold (corrected value, text as written)
+pairs, so a name can read "TLS" while its Housing is "Tls" as in the source
+file.  A field whose text overlaps another field's (a series named after its
+housing, "(LPL)" as both mount and note) stays as written, with its source
+truth.
+
+Output is deterministic for a given seed and source file.  ``typo_rate``
+misspells one word in that share of the names (swap, drop or double a
+letter, never the first); the ground truth is unchanged.
+
+Usage:
+    python3 synthetic_lenses.py synthetic_lenses.csv --rows 1000000 --seed 1 [--typo-rate 0.02]
+"""
+
+import bisect
+import csv
+import re
+from collections import Counter
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+MANUAL_EDITS_FILE = Path(__file__).with_name('Manual Edits.csv')
+
+NAME_COLUMN = 'Lens Name'
+# Ground-truth columns (Manual Edits.csv headers)
+TRUTH_COLUMNS = (
+    'Manufacturer', 'Series', 'Focal Length', 'T-Stop', 'Prime / Zoom / Special', 'Format',
+    'Mount', 'Anamorphic / Spherical', 'Anamorphic Squeeze Factor', 'Housing', 'Notes',
+)
+# Fields cut out of the names as slots, and the pool each one draws from
+FAMILY_SLOTS = ('Focal Length', 'T-Stop', 'Anamorphic Squeeze Factor')
+GLOBAL_SLOTS = ('Mount', 'Housing', 'Notes')
+# Fields whose text stays in the template; slots may not overlap it
+FIXED_FIELDS = ('Manufacturer', 'Series', 'Format')
+
+# Where a corrected value is written differently in the name
+FALLBACK_RES = {
+    'Focal Length': re.compile(r'(?<![\d.])\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?(?=\s*mm)', re.I),
+    'T-Stop': re.compile(r'(?<![a-z])t\s*\d+(?:\.\d+)?(?![\d.])', re.I),
+    'Anamorphic Squeeze Factor': re.compile(r'(?<![\d.])\d(?:\.\d+)?x(?![a-z])', re.I),
+}
+NOTE_RE = re.compile(r'\(([^()]*)\)')
+
+Family = Tuple[str, str, str]
+Pair = Tuple[str, str]
+
+
+class Template(NamedTuple):
+    # Literal text, or ``(field,)`` for a slot
+    parts: Tuple[object, ...]
+    truth: Tuple[Tuple[str, str], ...]
+
+
+class Pool:
+    """Weighted sample of the values counted into it"""
+
+    __slots__ = ('values', 'cum_weights', 'total')
+
+    def __init__(self, counts: Counter):
+        self.values = list(counts)
+        self.cum_weights = list(accumulate(counts.values()))
+        self.total = self.cum_weights[-1] if self.cum_weights else 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def sample(self, rng):
+        return self.values[bisect.bisect(self.cum_weights, rng.random() * self.total)]
+
+
+def _bounded(value: str) -> 're.Pattern':
+    """``value`` (case-insensitive) not run into neighbouring letters or digits"""
+    return re.compile(r'(?<![a-z0-9.])' + re.escape(value) + r'(?![a-z0-9])', re.I)
+
+
+def locate(field: str, value: str, name: str) -> Optional[Tuple[int, int]]:
+    """Span of ``field``'s text in ``name`` (its corrected ``value`` non-empty)"""
+    if field == 'Notes':
+        for match in NOTE_RE.finditer(name):
+            if match.group(1).strip().lower() == value.lower():
+                return match.span(1)
+        return None
+    match = _bounded(value).search(name)
+    if match is None and field in FALLBACK_RES:
+        match = FALLBACK_RES[field].search(name)
+    return match.span() if match else None
+
+
+def misspell(name: str, rng) -> str:
+    """``name`` with one word of 5+ letters mistyped (not its first letter)"""
+    words = [m for m in re.finditer(r'[A-Za-z]{5,}', name)]
+    if not words:
+        return name
+    word = words[int(rng.random() * len(words))]
+    i = word.start() + 1 + int(rng.random() * (len(word.group()) - 2))
+    edit = int(rng.random() * 3)
+    if edit == 0:
+        typo = name[i + 1] + name[i]
+        return name[:i] + typo + name[i + 2:]
+    if edit == 1:
+        return name[:i] + name[i + 1:]
+    return name[:i] + name[i] + name[i:]
+
+
+class LensNameModel:
+    """Field distributions learned from hand-corrected lens names"""
+
+    def __init__(self, rows: Iterable[Dict[str, str]], name_column: str = 'Original Name'):
+        family_counts: Counter = Counter()
+        templates: Dict[Family, Counter] = {}
+        family_pools: Dict[Tuple[Family, str], Counter] = {}
+        global_pools: Dict[str, Counter] = {field: Counter() for field in GLOBAL_SLOTS}
+        self.source_rows = 0
+
+        for row in rows:
+            name = (row.get(name_column) or '').strip()
+            if not name:
+                continue
+            self.source_rows += 1
+            truth = {field: (row.get(field) or '').strip() for field in TRUTH_COLUMNS}
+            family = (truth['Manufacturer'], truth['Series'], truth['Prime / Zoom / Special'])
+            family_counts[family] += 1
+
+            spans = {}
+            for field in FIXED_FIELDS + FAMILY_SLOTS + GLOBAL_SLOTS:
+                if truth[field]:
+                    span = locate(field, truth[field], name)
+                    if span and span[0] < span[1]:
+                        spans[field] = span
+            slots = sorted(
+                (span, field) for field, span in spans.items()
+                if field not in FIXED_FIELDS
+                and not any(other != field and span[0] < end and start < span[1]
+                            for other, (start, end) in spans.items())
+            )
+
+            parts: List[object] = []
+            pos = 0
+            for (start, end), field in slots:
+                parts += [name[pos:start], (field,)]
+                pair = (truth[field], name[start:end])
+                if field in GLOBAL_SLOTS:
+                    global_pools[field][pair] += 1
+                else:
+                    family_pools.setdefault((family, field), Counter())[pair] += 1
+                pos = end
+            parts.append(name[pos:])
+            template = Template(tuple(part for part in parts if part != ''), tuple(truth.items()))
+            templates.setdefault(family, Counter())[template] += 1
+
+        self.families = Pool(family_counts)
+        self.templates = {family: Pool(counts) for family, counts in templates.items()}
+        self.family_pools = {key: Pool(counts) for key, counts in family_pools.items()}
+        self.global_pools = {field: Pool(counts) for field, counts in global_pools.items()}
+
+    @classmethod
+    def from_manual_edits(cls, path: Optional[str] = None) -> 'LensNameModel':
+        with open(path or MANUAL_EDITS_FILE, newline='', encoding='utf-8') as f:
+            return cls(csv.DictReader(f))
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'source rows': self.source_rows,
+            'families': len(self.families),
+            'templates': sum(len(pool) for pool in self.templates.values()),
+            **{f"{field.lower()} values": len(pool) for field, pool in self.global_pools.items()},
+        }
+
+    def generate(self, rows: int, seed: int = 0, typo_rate: float = 0.0) -> Iterator[Dict[str, str]]:
+        """``rows`` synthetic rows: NAME_COLUMN plus the TRUTH_COLUMNS"""
+        import random
+
+        rng = random.Random(seed)
+        for _ in range(rows):
+            family = self.families.sample(rng)
+            template = self.templates[family].sample(rng)
+            row = {NAME_COLUMN: ''}
+            row.update(template.truth)
+            parts = []
+            for part in template.parts:
+                if isinstance(part, tuple):
+                    field = part[0]
+                    pool = self.global_pools.get(field) or self.family_pools[(family, field)]
+                    row[field], text = pool.sample(rng)
+                    parts.append(text)
+                else:
+                    parts.append(part)
+            name = ''.join(parts)
+            if typo_rate and rng.random() < typo_rate:
+                name = misspell(name, rng)
+            row[NAME_COLUMN] = name
+            yield row
+
+    def write_csv(self, output_file: str, rows: int, seed: int = 0, typo_rate: float = 0.0) -> int:
+        """Stream ``generate(rows, seed, typo_rate)`` to a CSV; returns the row count"""
+        count = 0
+        with open(output_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=(NAME_COLUMN,) + TRUTH_COLUMNS)
+            writer.writeheader()
+            for row in self.generate(rows, seed, typo_rate):
+                writer.writerow(row)
+                count += 1
+        return count
+
+
+def main():
+    import argparse
+
+    args = argparse.ArgumentParser(description="Write a synthetic lens-name CSV with ground-truth columns")
+    args.add_argument('output', help="CSV to write ('Lens Name' plus the Manual Edits columns)")
+    args.add_argument('--rows', type=int, default=100_000, help="rows to generate (default 100,000)")
+    args.add_argument('--seed', type=int, default=0, help="random seed (default 0)")
+    args.add_argument('--typo-rate', type=float, default=0.0, help="share of names with one misspelt word")
+    args.add_argument('--source', default=str(MANUAL_EDITS_FILE), help="hand-corrected CSV to learn from")
+    args = args.parse_args()
+
+    model = LensNameModel.from_manual_edits(args.source)
+    print("Learned " + ", ".join(f"{count:,} {what}" for what, count in model.summary().items()))
+    written = model.write_csv(args.output, args.rows, seed=args.seed, typo_rate=args.typo_rate)
+    print(f"Wrote {written:,} synthetic lens names to {args.output} (seed {args.seed})")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 
 def test_individual_lenses():
     """Test the parser with individual lens names"""
-    parser = SimpleLensParser(confidence_threshold=0.7)
+    parser = SimpleLensParser()
     
     # Sample lens names to test
     test_lenses = [
@@ -46,7 +46,7 @@ def test_individual_lenses():
         print(f"  Series: {parsed.series}")
         print(f"  Focal Length: {parsed.focal_length}")
         print(f"  T-Stop: {parsed.t_stop}")
-        print(f"  Type: {parsed.prime_zoom_special}")
+        print(f"  Type: {parsed.lens_type}")
         print(f"  Mount: {parsed.mount}")
         print(f"  Format: {parsed.format}")
         print(f"  Anamorphic: {parsed.anamorphic_spherical}")
@@ -75,7 +75,7 @@ def test_csv_processing():
     print(f"Created test input file: {input_file}")
     
     # Process the CSV
-    parser = SimpleLensParser(confidence_threshold=0.7)
+    parser = SimpleLensParser()
     parser.parse_csv(input_file, output_file)
     
     # Display results
@@ -84,13 +84,13 @@ def test_csv_processing():
     # Show summary
     results_df = pd.read_csv(output_file)
     print(f"\nProcessed {len(results_df)} lenses")
-    print(f"Average confidence: {results_df['Confidence Score'].mean():.3f}")
-    print(f"Lenses needing review: {len(results_df[results_df['Needs Review'] == True])}")
+    print(f"Average confidence: {results_df['confidence_score'].mean():.3f}")
+    print(f"Lenses needing review: {len(results_df[results_df['needs_review'] == True])}")
     
     # Show sample results
     print("\nSample results:")
     for _, row in results_df.head(3).iterrows():
-        print(f"  {row['Original Name']} -> {row['Manufacturer']} {row['Series']} {row['Focal Length']} {row['T-Stop']}")
+        print(f"  {row['original_name']} -> {row['manufacturer']} {row['series']} {row['focal_length']} {row['t_stop']}")
 
 def test_with_existing_data():
     """Test with existing lens data"""
@@ -104,7 +104,7 @@ def test_with_existing_data():
         print(f"Found existing data file: {existing_file}")
         
         # Read a sample of the data
-        df = pd.read_csv(existing_file)
+        df = pd.read_csv(existing_file, header=None, names=['Lens Name'])
         print(f"Total rows in file: {len(df)}")
         
         # Take first 10 rows for testing
@@ -115,22 +115,98 @@ def test_with_existing_data():
         print(f"Created sample file: {sample_file}")
         
         # Process the sample
-        parser = SimpleLensParser(confidence_threshold=0.7)
+        parser = SimpleLensParser()
         output_file = "sample_parsed_results.csv"
         parser.parse_csv(sample_file, output_file)
         
         # Show results
         results_df = pd.read_csv(output_file)
         print(f"\nParsed {len(results_df)} lenses from existing data")
-        print(f"Average confidence: {results_df['Confidence Score'].mean():.3f}")
+        print(f"Average confidence: {results_df['confidence_score'].mean():.3f}")
         
         print("\nSample parsed results:")
         for _, row in results_df.head(5).iterrows():
-            print(f"  {row['Original Name']} -> {row['Manufacturer']} {row['Series']} {row['Focal Length']} {row['T-Stop']}")
+            print(f"  {row['original_name']} -> {row['manufacturer']} {row['series']} {row['focal_length']} {row['t_stop']}")
     else:
         print(f"Existing data file not found: {existing_file}")
         print("Skipping existing data test")
 
+def test_parse_cache_persists():
+    """Every parsed name reaches the SQLite parse cache file, not only full commit batches"""
+    import sqlite3
+    import tempfile
+    from contextlib import closing
+    from pathlib import Path
+
+    def stored(db):
+        with closing(sqlite3.connect(str(db))) as conn:
+            return conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+
+    # 295 names: more than one commit batch (256), not a multiple of it
+    names = [f"{focal}mm Zeiss Master Prime T1.3" for focal in range(10, 305)]
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "parse_cache.sqlite"
+        with SimpleLensParser.load(cache_path=db) as parser:
+            parser.parse_many(names)
+            # A batch is committed as soon as it is parsed
+            assert stored(db) == len(names)
+            parser.parse_lens_name("Cooke S4/i 18mm T2.0")
+        # Single names are committed when the parser is closed
+        assert stored(db) == len(names) + 1
+
+        # The next run parses nothing again
+        with SimpleLensParser.load(cache_path=db) as parser:
+            parser.parse_many(names + ["Cooke S4/i 18mm T2.0"])
+            assert parser.cache_info()['misses'] == 0
+    print("Parse cache: all entries persisted")
+
+def test_misspelt_names():
+    """The fuzzy fallback resolves common slips and stays out of the way of known names"""
+    parser = SimpleLensParser.load(cache_size=0)
+    expected = {
+        "Zies 50mm": ("Zeiss", ""),
+        "Cook Panchro 32mm": ("Cooke", "Panchro"),
+        "42-420mm Angeneiux Anamorphic T4.5": ("Angenieux", ""),
+        "Cooke S4/i 18mm T2.0": ("Cooke", "S4/I"),
+    }
+    for name, (manufacturer, series) in expected.items():
+        result = parser.parse_lens_name(name)
+        assert (result.manufacturer, result.series) == (manufacturer, series), name
+    # Names made of known words and measurements are never searched
+    parser.fuzzy_index.reset_stats()
+    parser.parse_lens_name("50mm Zeiss T1.3")
+    assert parser.fuzzy_info()['ngrams'] == 0
+    print("Misspelt names: resolved")
+
+def test_confidence_matches_csv_rescore():
+    """A parsed row re-scored from its CSV gets the parser's confidence"""
+    import io
+    import os
+    from update_confidence_manual_edits import FIELD_COLUMNS, calculate_confidences
+
+    existing_file = "../ESC Raw Lenses.csv"
+    if not os.path.exists(existing_file):
+        print(f"Existing data file not found: {existing_file}")
+        return
+    with open(existing_file, encoding='utf-8') as fp:
+        names = [line.strip() for line in fp if line.strip()]
+    parser = SimpleLensParser.load(cache_size=0)
+    parsed = parser.parse_many(names)
+    singles = [parser.parse_lens_name(name).confidence_score for name in names]
+
+    # The parsed fields as an edited sheet, written out and read back
+    sheet = pd.DataFrame({"Original Name": parsed['original_name']})
+    for field, column in FIELD_COLUMNS.items():
+        sheet[column] = parsed[field].astype(str)
+    buffer = io.StringIO()
+    sheet.to_csv(buffer, index=False)
+    buffer.seek(0)
+    rescored = calculate_confidences(pd.read_csv(buffer))
+
+    assert (parsed['confidence_score'].to_numpy() == rescored).all()
+    assert (parsed['confidence_score'].to_numpy() == singles).all()
+    print(f"Confidence: {len(names)} parser scores match the CSV re-score")
+
 def main():
     """Run all tests"""
     print("Starting Simple Lens Parser Tests...\n")
@@ -145,6 +221,15 @@ def main():
         # Test with existing data
         test_with_existing_data()
         
+        # Test the persistent parse cache
+        test_parse_cache_persists()
+        
+        # Test the misspelling fallback
+        test_misspelt_names()
+        
+        # Test that the parser and the CSV re-score agree on confidence
+        test_confidence_matches_csv_rescore()
+        
         print("\n=== ALL TESTS COMPLETED ===")
         print("Check the generated files for detailed results.")
         
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Alias Automaton
+---------------
+Aho-Corasick matcher over the alias dictionaries used by the lens parsers.
+
+Every alias table (``{canonical: [alias, ...]}``) is registered under a
+category name.  One left-to-right scan of a lens name reports every alias
+occurrence with its character offsets, so the cost of a lookup depends on the
+length of the name instead of the number of aliases.
+
+Each hit carries a ``rank`` – the position of the ``(canonical, alias)`` pair
+inside its table – so callers can reproduce "first entry wins" semantics of
+the old dictionary walks.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class AliasHit(NamedTuple):
+    start: int
+    end: int
+    category: str
+    key: str
+    alias: str
+    rank: int
+
+
+class AliasAutomaton:
+    """Multi-pattern matcher built once over several alias tables."""
+
+    def __init__(self, tables: Dict[str, Dict[str, Iterable[str]]]):
+        self.tables = tables
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._entries: List[Tuple[str, str, str, int]] = []
+
+        for category, table in tables.items():
+            rank = 0
+            for key, aliases in table.items():
+                for alias in aliases:
+                    if alias:
+                        self._add(alias, (category, key, alias, rank))
+                    rank += 1
+        self._link()
+
+    def _add(self, alias: str, entry: Tuple[str, str, str, int]) -> None:
+        state = 0
+        for ch in alias:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(len(self._entries))
+        self._entries.append(entry)
+
+    def _link(self) -> None:
+        """Breadth-first pass computing failure links and merged outputs."""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self._entries)
+
+    def scan(self, text: str) -> List[AliasHit]:
+        """Return every alias occurrence in ``text`` (ordered by end offset)."""
+        goto, fail, out, entries = self._goto, self._fail, self._out, self._entries
+        hits: List[AliasHit] = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for eid in out[state]:
+                    category, key, alias, rank = entries[eid]
+                    hits.append(AliasHit(end - len(alias), end, category, key, alias, rank))
+        return hits
+
+
+def longest_hit(hits: Iterable[AliasHit], category: str) -> Optional[AliasHit]:
+    """Longest alias of ``category``; ties go to the earliest table entry."""
+    best = None
+    for hit in hits:
+        if hit.category != category:
+            continue
+        if best is None or (len(hit.alias), -hit.rank) > (len(best.alias), -best.rank):
+            best = hit
+    return best
+
+
+def first_hit(hits: Iterable[AliasHit], category: str) -> Optional[AliasHit]:
+    """Hit belonging to the earliest table entry of ``category``."""
+    best = None
+    for hit in hits:
+        if hit.category == category and (best is None or hit.rank < best.rank):
+            best = hit
+    return best
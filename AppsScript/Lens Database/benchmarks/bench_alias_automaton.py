@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: alias automaton vs nested dictionary walks
+-----------------------------------------------------
+Replicates "ESC Raw Lenses.csv" out to N rows (default 100k) and times the
+dictionary lookups of SimpleLensParser two ways:
+
+  • nested  – the original ``for key, aliases ...: if alias in text`` walks
+  • automaton – one AliasAutomaton scan per name, longest-match scoring
+
+Both paths must agree on every row; the script exits non-zero otherwise.
+
+Usage:
+    python3 benchmarks/bench_alias_automaton.py [rows]
+"""
+import sys
+import time
+from itertools import cycle, islice
+from pathlib import Path
+
+LENS_DB_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LENS_DB_DIR / "Machine Learning"))
+
+from simple_lens_parser import SimpleLensParser  # noqa: E402
+from alias_automaton import first_hit, longest_hit  # noqa: E402
+
+INPUT = LENS_DB_DIR / "ESC Raw Lenses.csv"
+ROWS_DEFAULT = 100_000
+
+
+def nested_best(table, text):
+    best_match, best_score = None, 0
+    for key, aliases in table.items():
+        for alias in aliases:
+            if alias in text:
+                score = len(alias) / len(text) * 100
+                if score > best_score:
+                    best_score, best_match = score, key
+    return best_match
+
+
+def nested_first(table, text):
+    for key, aliases in table.items():
+        for alias in aliases:
+            if alias in text:
+                return key
+    return None
+
+
+def run_nested(parser, texts):
+    return [(
+        nested_best(parser.manufacturers, t),
+        nested_best(parser.series_patterns, t),
+        nested_first(parser.anamorphic_patterns, t),
+        nested_first(parser.format_detect_patterns, t),
+        nested_first(parser.mount_detect_patterns, t),
+        nested_first(parser.housing_patterns, t),
+    ) for t in texts]
+
+
+def run_automaton(parser, texts):
+    results = []
+    scan = parser.alias_automaton.scan
+    for t in texts:
+        hits = scan(t)
+        results.append(tuple(
+            hit.key if hit else None for hit in (
+                longest_hit(hits, 'manufacturer'),
+                longest_hit(hits, 'series'),
+                first_hit(hits, 'anamorphic'),
+                first_hit(hits, 'format'),
+                first_hit(hits, 'mount'),
+                first_hit(hits, 'housing'),
+            )
+        ))
+    return results
+
+
+def main(rows: int) -> int:
+    parser = SimpleLensParser()
+    with INPUT.open(encoding='utf-8') as f:
+        names = [line.strip() for line in f if line.strip()]
+    texts = [parser.preprocess_text(n) for n in islice(cycle(names), rows)]
+    print(f"{len(texts)} rows, {parser.alias_automaton.pattern_count} aliases indexed")
+
+    timings = {}
+    results = {}
+    for label, fn in (('nested', run_nested), ('automaton', run_automaton)):
+        start = time.perf_counter()
+        results[label] = fn(parser, texts)
+        timings[label] = time.perf_counter() - start
+        print(f"  {label:<10} {timings[label]:7.3f}s  {len(texts) / timings[label]:>10,.0f} rows/sec")
+
+    print(f"  speedup    {timings['nested'] / timings['automaton']:.2f}x")
+    if results['nested'] != results['automaton']:
+        print("ERROR: automaton results differ from nested lookups")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS_DEFAULT))
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fuzzy manufacturer / series fallback
+-----------------------------------------------
+Parses every distinct name in "ESC Raw Lenses.csv", "Manual Edits.csv" and
+parsed_lenses_output.csv with SimpleLensParser and reports how often the
+fuzzy fallback ran (names without an exact manufacturer / series alias), its
+hit rate and mean latency, plus the hits themselves.  The same names are
+parsed with the fallback switched off; the fallback may add at most
+``max_overhead`` (default 25%) to the parse time - it once cost 130%.
+
+Then times the bigram index against a linear scan of every alias for each
+n-gram the fallback could look up, prefiltered or not.  Both must find the
+same candidates (so the prefilter never drops a hit).
+
+The script exits non-zero when either check fails.
+
+Usage:
+    python3 benchmarks/bench_fuzzy_index.py [--hits] [max_overhead]
+"""
+import csv
+import statistics
+import sys
+import time
+from pathlib import Path
+
+LENS_DB_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LENS_DB_DIR))
+sys.path.insert(0, str(LENS_DB_DIR / "Machine Learning"))
+
+from fuzzy_index import WORD_PUNCTUATION, max_distance, osa_distance  # noqa: E402
+from simple_lens_parser import SimpleLensParser  # noqa: E402
+
+ML_DIR = LENS_DB_DIR / "Machine Learning"
+MAX_OVERHEAD_DEFAULT = 0.25
+ROUNDS = 10
+
+
+def corpus():
+    names = [line.strip() for line in (LENS_DB_DIR / "ESC Raw Lenses.csv").open(encoding='utf-8')]
+    for path in (ML_DIR / "Manual Edits.csv", ML_DIR / "parsed_lenses_output.csv"):
+        with path.open(encoding='utf-8') as f:
+            names += [row['Original Name'] for row in csv.DictReader(f)]
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def parse_time(names, fallback: bool) -> float:
+    """Wall time parsing ``names`` on a fresh parser (empty memo)"""
+    parser = SimpleLensParser.load(cache_size=0)
+    if not fallback:
+        parser.fuzzy_index.lookup = lambda category, text: None
+    start = time.perf_counter()
+    for name in names:
+        parser.parse_lens_name(name)
+    return time.perf_counter() - start
+
+
+def fallback_overhead(names):
+    """Median over ROUNDS of (time with the fallback / time without - 1), plus the best times.
+
+    Each round times the two back to back, so a slow spell on the machine
+    affects both sides of a ratio; which goes first alternates.
+    """
+    ratios, with_times, without_times = [], [], []
+    for round_ in range(ROUNDS):
+        if round_ % 2:
+            without_times.append(parse_time(names, False))
+            with_times.append(parse_time(names, True))
+        else:
+            with_times.append(parse_time(names, True))
+            without_times.append(parse_time(names, False))
+        ratios.append(with_times[-1] / without_times[-1] - 1)
+    return statistics.median(ratios), min(with_times), min(without_times)
+
+
+def candidate_grams(fuzzy, names, category):
+    """Every n-gram the fallback would consider for ``names``, before the index prefilter"""
+    grams = set()
+    for name in names:
+        words = [w for w in (w.strip(WORD_PUNCTUATION) for w in name.lower().split()) if w]
+        for size in range(1, fuzzy.max_words[category] + 1):
+            for i in range(len(words) - size + 1):
+                gram = ' '.join(words[i:i + size])
+                if max_distance(gram) and gram not in fuzzy.vocabulary and any(ch.isalpha() for ch in gram):
+                    grams.add(gram)
+    return sorted(grams)
+
+
+def main(show_hits: bool, max_overhead: float) -> int:
+    names = corpus()
+    parser = SimpleLensParser.load(cache_size=0)
+    fuzzy = parser.fuzzy_index
+
+    hits = []
+    start = time.perf_counter()
+    for name in names:
+        before = fuzzy.stats['hits']
+        parsed = parser.parse_lens_name(name)
+        if fuzzy.stats['hits'] > before:
+            hits.append((name, parsed))
+    elapsed = time.perf_counter() - start
+    info = fuzzy.info()
+    print(f"{len(names)} names parsed in {elapsed:.3f}s")
+    print(f"  fallback lookups {info['lookups']:>6}  n-grams searched {info['ngrams']:>5}  hits {info['hits']:>4}  "
+          f"hit rate {info['hit_rate']:6.1%}  mean {info['mean_ms']:.3f} ms/lookup")
+    if show_hits:
+        for name, parsed in hits:
+            print(f"    {name!r} -> {parsed.manufacturer!r} / {parsed.series!r}")
+
+    failures = 0
+    overhead, with_fallback, without = fallback_overhead(names)
+    print(f"  parse time {with_fallback:.3f}s with the fallback, {without:.3f}s without "
+          f"(median overhead {overhead:+.1%}, limit {max_overhead:.0%})")
+    if overhead > max_overhead:
+        print(f"ERROR: the fuzzy fallback adds {overhead:.1%} to parsing, over the {max_overhead:.0%} limit")
+        failures += 1
+
+    # Prefilter + index vs linear scan over every candidate n-gram (hits must share the initial)
+    for category, partitions in fuzzy.indexes.items():
+        words = [word for index in partitions.values() for word in index.words]
+        grams = candidate_grams(fuzzy, names, category)
+        start = time.perf_counter()
+        indexed = []
+        for gram in grams:
+            index, limit = partitions.get(gram[0]), max_distance(gram)
+            found = index.search(gram, limit) if index is not None and index.may_match(gram, limit) else []
+            indexed.append(sorted(hit[:2] for hit in found))
+        index_time = time.perf_counter() - start
+        start = time.perf_counter()
+        scanned = [sorted((d, word) for word in words if word[0] == gram[0]
+                          for d in [osa_distance(gram, word, max_distance(gram))] if d <= max_distance(gram))
+                   for gram in grams]
+        scan_time = time.perf_counter() - start
+        print(f"  {category:<13} {len(words):>4} aliases  {len(grams):>5} n-grams  "
+              f"index {index_time * 1000:7.1f} ms  scan {scan_time * 1000:7.1f} ms  "
+              f"{scan_time / index_time if index_time else 0:5.1f}x")
+        if indexed != scanned:
+            print(f"ERROR: {category} index and linear scan disagree")
+            failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if arg != '--hits']
+    sys.exit(main('--hits' in sys.argv[1:], float(args[0]) if args else MAX_OVERHEAD_DEFAULT))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: start-up cost of single-name parsing
+-----------------------------------------------
+Runs ``python -X importtime -m parse_lens "<name>"`` from the Machine Learning
+directory N times (default 5) and reports the median wall time and the
+cumulative import time of its top-level modules, plus the slowest imports.
+
+Single-name parsing must not import the batch-only dependencies (pandas,
+numpy, sqlite3, concurrent.futures), and the median import time must stay
+under the budget (default 250 ms); the script exits non-zero otherwise.
+
+Usage:
+    python3 benchmarks/bench_import_time.py [runs] [budget_ms]
+"""
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ML_DIR = Path(__file__).resolve().parent.parent / "Machine Learning"
+NAME = "Cooke S4/i 18mm T2.0"
+RUNS_DEFAULT = 5
+BUDGET_MS_DEFAULT = 250.0
+FORBIDDEN = ('pandas', 'numpy', 'sqlite3', 'concurrent.futures')
+
+
+def import_times(stderr: str):
+    """(module, self µs, cumulative µs, depth) for each ``-X importtime`` line"""
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        yield name.strip(), int(self_us), int(cumulative_us), depth
+
+
+def run_once():
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'parse_lens', NAME],
+        cwd=ML_DIR, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    return wall, list(import_times(proc.stderr))
+
+
+def main(runs: int, budget_ms: float) -> int:
+    # Warm-up: byte-compiles sources and (re)writes the parser snapshot
+    run_once()
+    walls, totals = [], []
+    for _ in range(runs):
+        wall, imports = run_once()
+        walls.append(wall)
+        totals.append(sum(cum for _, _, cum, depth in imports if depth == 0) / 1000)
+
+    median_import = statistics.median(totals)
+    print(f"parse_lens start-up over {runs} runs")
+    print(f"  wall time    {statistics.median(walls) * 1000:7.1f} ms (median)")
+    print(f"  import time  {median_import:7.1f} ms (median, budget {budget_ms:.0f} ms)")
+    print("  slowest imports (self time):")
+    for name, self_us, _, _ in sorted(imports, key=lambda i: -i[1])[:8]:
+        print(f"    {self_us / 1000:6.1f} ms  {name}")
+
+    imported = {name for name, _, _, _ in imports}
+    leaked = [name for name in FORBIDDEN if name in imported]
+    if leaked:
+        print(f"ERROR: single-name parsing imported {', '.join(leaked)}")
+        return 1
+    if median_import > budget_ms:
+        print(f"ERROR: import time {median_import:.1f} ms is over the {budget_ms:.0f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS_DEFAULT
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else BUDGET_MS_DEFAULT
+    sys.exit(main(runs, budget))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parse_many throughput from 1 to N worker processes
+-------------------------------------------------------------
+Builds N rows (default 100k) of distinct lens names from "ESC Raw Lenses.csv"
+(copies are told apart by trailing spaces, which the parser strips, so every
+row is parsed rather than deduplicated) and times
+``SimpleLensParser.parse_many(names, jobs=j)`` for j = 1, 2, 4 … up to the
+CPU count (or the job counts given), after a plain ``parse_lens_name`` loop
+over the same rows.
+
+Every run must give the same DataFrame as jobs=1, and parse_many with one
+job must beat the loop by MIN_BATCH_SPEEDUP; the script exits non-zero
+otherwise.
+
+Usage:
+    python3 benchmarks/bench_parse_jobs.py [rows] [jobs ...]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+LENS_DB_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LENS_DB_DIR / "Machine Learning"))
+
+from simple_lens_parser import SimpleLensParser  # noqa: E402
+
+INPUT = LENS_DB_DIR / "ESC Raw Lenses.csv"
+ROWS_DEFAULT = 100_000
+# parse_many(jobs=1) rows/sec over the parse_lens_name loop's
+MIN_BATCH_SPEEDUP = 1.1
+
+
+def job_counts(limit: int):
+    jobs = 1
+    while jobs < limit:
+        yield jobs
+        jobs *= 2
+    yield limit
+
+
+def main(rows: int, jobs_list) -> int:
+    with INPUT.open(encoding='utf-8') as f:
+        names = list(dict.fromkeys(line.strip() for line in f if line.strip()))
+    work = [names[i % len(names)] + ' ' * (i // len(names)) for i in range(rows)]
+    print(f"{len(work)} rows, {os.cpu_count()} CPUs")
+
+    parser = SimpleLensParser(cache_size=0)
+    start = time.perf_counter()
+    for name in work:
+        parser.parse_lens_name(name)
+    loop_rate = len(work) / (time.perf_counter() - start)
+    print(f"  loop     {len(work) / loop_rate:7.3f}s  {loop_rate:>10,.0f} rows/sec  (parse_lens_name per row)")
+
+    baseline = None
+    base_rate = None
+    for jobs in jobs_list:
+        start = time.perf_counter()
+        result = parser.parse_many(work, jobs=jobs)
+        elapsed = time.perf_counter() - start
+        rate = len(work) / elapsed
+        if baseline is None:
+            baseline, base_rate = result, rate
+        print(f"  jobs={jobs:<3} {elapsed:7.3f}s  {rate:>10,.0f} rows/sec  {rate / base_rate:5.2f}x")
+        if not result.equals(baseline):
+            print(f"ERROR: jobs={jobs} output differs from jobs={jobs_list[0]}")
+            return 1
+        if jobs == 1 and rate < loop_rate * MIN_BATCH_SPEEDUP:
+            print(f"ERROR: parse_many runs {rate / loop_rate:.2f}x the parse_lens_name loop "
+                  f"(at least {MIN_BATCH_SPEEDUP:.2f}x expected)")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS_DEFAULT
+    jobs_list = [int(j) for j in sys.argv[2:]] or list(job_counts(os.cpu_count() or 1))
+    sys.exit(main(rows, jobs_list))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parser construction
+------------------------------
+Times, in fresh processes, how long it takes to get a ready SimpleLensParser
+three ways (median of N runs, default 5):
+
+- ``SimpleLensParser()``: merge the dictionaries and build the automaton
+- ``SimpleLensParser.load()`` with no snapshot yet: the same, plus writing it
+- ``SimpleLensParser.load()`` from the snapshot: what the scripts pay
+
+The snapshot goes to a scratch LENS_PARSER_CACHE_DIR.  The script exits
+non-zero if loading from the snapshot is over the budget (default 10 ms) or
+if anything was written into the Machine Learning directory.
+
+Usage:
+    python3 benchmarks/bench_parser_load.py [runs] [budget_ms]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ML_DIR = Path(__file__).resolve().parent.parent / "Machine Learning"
+RUNS_DEFAULT = 5
+BUDGET_MS_DEFAULT = 10.0
+
+# Prints the milliseconds spent in ``{call}`` (imports excluded)
+SCRIPT = """
+import time
+from simple_lens_parser import SimpleLensParser
+start = time.perf_counter()
+{call}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def time_call(call: str, cache_dir: str) -> float:
+    proc = subprocess.run(
+        [sys.executable, '-c', SCRIPT.format(call=call)],
+        cwd=ML_DIR, capture_output=True, text=True, check=True,
+        env={**os.environ, 'LENS_PARSER_CACHE_DIR': cache_dir},
+    )
+    return float(proc.stdout.split()[-1])
+
+
+def main(runs: int, budget_ms: float) -> int:
+    before = sorted(path.name for path in ML_DIR.iterdir() if path.name != '__pycache__')
+    results = {'SimpleLensParser()': [], 'load(), no snapshot': [], 'load(), snapshot': []}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for _ in range(runs):
+            for snapshot in Path(cache_dir).glob('*.snapshot'):
+                snapshot.unlink()
+            results['SimpleLensParser()'].append(time_call('SimpleLensParser(cache_size=0)', cache_dir))
+            results['load(), no snapshot'].append(time_call('SimpleLensParser.load(cache_size=0)', cache_dir))
+            results['load(), snapshot'].append(time_call('SimpleLensParser.load(cache_size=0)', cache_dir))
+        written = list(Path(cache_dir).glob('*.snapshot'))
+    after = sorted(path.name for path in ML_DIR.iterdir() if path.name != '__pycache__')
+
+    print(f"parser construction over {runs} runs (median)")
+    for label, times in results.items():
+        print(f"  {label:22} {statistics.median(times):7.1f} ms")
+
+    status = 0
+    if not written:
+        print("ERROR: load() wrote no snapshot to LENS_PARSER_CACHE_DIR")
+        status = 1
+    new_files = sorted(set(after) - set(before))
+    if new_files:
+        print(f"ERROR: parsing wrote into {ML_DIR}: {', '.join(new_files)}")
+        status = 1
+    median_load = statistics.median(results['load(), snapshot'])
+    if median_load > budget_ms:
+        print(f"ERROR: load() from the snapshot took {median_load:.1f} ms, over the {budget_ms:.0f} ms budget")
+        status = 1
+    return status
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else RUNS_DEFAULT
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else BUDGET_MS_DEFAULT
+    sys.exit(main(runs, budget))
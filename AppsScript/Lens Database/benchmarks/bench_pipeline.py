@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Lens Database pipeline throughput and memory
+-------------------------------------------------------
+Runs each pipeline stage on the checked-in CSVs replicated 10x / 100x
+(``--full`` adds 1000x, which takes tens of minutes) and records rows/sec and
+peak RSS:
+
+  • parse_lens_name     – SimpleLensParser, one name at a time, cache off
+                          ("ESC Raw Lenses.csv")
+  • parse_line          – esc_raw_lense_parse.parse_line ("ESC Raw Lenses.csv")
+  • format_lens_sheet   – format_lens_sheet.main over a folder holding N copies
+                          of every CSV in "To Be Parsed"
+  • normalize_csv_file  – "Final Flatten/Tech Inf.csv" with its rows repeated
+  • analyze_manual_edits – learn_from_manual_edits on "Manual Edits.csv"
+                          repeated
+
+Every stage/scale runs in a fresh child process, so its peak RSS
+(``ru_maxrss``) is its own.
+
+The baseline is recomputed on this machine in the same run: the code of a
+git commit is exported to a scratch directory and every stage/scale is
+timed with it too, on the same inputs, alternating with the working tree
+(best of ``--repeat`` rounds each).  The commit is ``--baseline`` if given
+(``--baseline HEAD`` measures just the uncommitted changes), otherwise the
+merge-base with main / master on a branch, and HEAD~1 on main itself - so
+a plain run on a clean checkout or in CI compares the latest change with
+what came before it.  Without git (or if the commit can't be exported) the
+last run in the history file is the baseline instead, with a warning that
+its numbers may come from another machine.  A stage whose rows/sec falls
+more than the threshold (default 20%) below the baseline's is a regression
+and the script exits non-zero.  ``--no-baseline`` skips the comparison.
+
+Results are also appended to a local JSON history file (default
+benchmarks/bench_history.json, one entry per run with the git commit) unless
+the run regressed or ``--no-record`` is given; ``--accept`` records it
+anyway.
+
+Usage:
+    python3 benchmarks/bench_pipeline.py [--full] [--scales N ...] [--stages NAME ...]
+        [--baseline REF | --no-baseline] [--repeat N] [--threshold 0.2]
+        [--history FILE] [--no-record] [--accept]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+LENS_DB_DIR = Path(__file__).resolve().parent.parent
+ML_DIR = LENS_DB_DIR / "Machine Learning"
+FLATTEN_DIR = LENS_DB_DIR / "Final Flatten"
+sys.path.insert(0, str(LENS_DB_DIR))
+sys.path.insert(0, str(ML_DIR))
+sys.path.insert(0, str(FLATTEN_DIR))
+
+ESC_INPUT = LENS_DB_DIR / "ESC Raw Lenses.csv"
+TO_BE_PARSED = LENS_DB_DIR / "To Be Parsed"
+TECH_INPUT = FLATTEN_DIR / "Tech Inf.csv"
+MANUAL_EDITS = ML_DIR / "Manual Edits.csv"
+HISTORY_DEFAULT = Path(__file__).resolve().parent / "bench_history.json"
+
+SCALES_DEFAULT = (10, 100)
+SCALES_FULL = (10, 100, 1000)
+THRESHOLD_DEFAULT = 0.2
+# Branches a plain run's baseline forks from (see default_baseline)
+BASELINE_BRANCHES = ('main', 'master', 'origin/main', 'origin/master')
+
+
+# ---------------------------------------------------------------------------
+# Stages: each builds its scaled input in ``workdir``, then returns
+# (rows, seconds) for the timed call alone
+# ---------------------------------------------------------------------------
+
+def bench_parse_lens_name(scale: int, workdir: Path):
+    from simple_lens_parser import SimpleLensParser
+
+    names = [line.strip() for line in ESC_INPUT.open(encoding='utf-8')] * scale
+    parser = SimpleLensParser.load(cache_size=0)
+    parse = parser.parse_lens_name
+    start = time.perf_counter()
+    for name in names:
+        parse(name)
+    return len(names), time.perf_counter() - start
+
+
+def bench_parse_line(scale: int, workdir: Path):
+    from esc_raw_lense_parse import parse_line
+
+    lines = ESC_INPUT.open(encoding='utf-8').readlines() * scale
+    start = time.perf_counter()
+    for line in lines:
+        parse_line(line)
+    return len(lines), time.perf_counter() - start
+
+
+def bench_format_lens_sheet(scale: int, workdir: Path):
+    import csv
+    import format_lens_sheet
+
+    folder = workdir / "input"
+    folder.mkdir()
+    for path in sorted(TO_BE_PARSED.glob('*.csv')):
+        data = path.read_bytes()
+        for copy in range(scale):
+            (folder / f"{copy:04d} {path.name}").write_bytes(data)
+    format_lens_sheet.OUTPUT_FILE = workdir / "Flattened_Lens_Inventory.csv"
+    start = time.perf_counter()
+    format_lens_sheet.main(folder)
+    elapsed = time.perf_counter() - start
+    with format_lens_sheet.OUTPUT_FILE.open(newline='', encoding='utf-8') as f:
+        rows = sum(1 for _ in csv.reader(f)) - 1
+    return rows, elapsed
+
+
+def bench_normalize_csv_file(scale: int, workdir: Path):
+    from nromalize_lens_data import normalize_csv_file
+
+    header, *body = TECH_INPUT.read_text(encoding='utf-8').splitlines(keepends=True)
+    if body and not body[-1].endswith('\n'):
+        body[-1] += '\n'
+    scaled = workdir / "Tech Inf.csv"
+    scaled.write_text(header + ''.join(body) * scale, encoding='utf-8')
+    start = time.perf_counter()
+    df = normalize_csv_file(scaled, workdir / "Tech_Inf_normalized.csv")
+    return len(df), time.perf_counter() - start
+
+
+def bench_analyze_manual_edits(scale: int, workdir: Path):
+    import pandas as pd
+    from learn_from_manual_edits import analyze_manual_edits
+
+    df = pd.read_csv(MANUAL_EDITS)
+    df = pd.concat([df] * scale, ignore_index=True)
+    start = time.perf_counter()
+    analyze_manual_edits(df)
+    return len(df), time.perf_counter() - start
+
+
+STAGES = {
+    'parse_lens_name': bench_parse_lens_name,
+    'parse_line': bench_parse_line,
+    'format_lens_sheet': bench_format_lens_sheet,
+    'normalize_csv_file': bench_normalize_csv_file,
+    'analyze_manual_edits': bench_analyze_manual_edits,
+}
+
+
+def run_child(stage: str, scale: int, code_dir: Path) -> None:
+    """Child process: run one stage at one scale with the code in ``code_dir`` and print its result as JSON."""
+    for folder in (code_dir / "Final Flatten", code_dir / "Machine Learning", code_dir):
+        sys.path.insert(0, str(folder))
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        rows, seconds = STAGES[stage](scale, Path(tmp))
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'rows': rows, 'seconds': seconds, 'rows_per_sec': rows / seconds if seconds else 0.0,
+                      'peak_rss_mb': peak_kb / 1024}))
+
+
+def measure(stage: str, scale: int, code_dir: Path = LENS_DB_DIR) -> dict:
+    env = None
+    if code_dir != LENS_DB_DIR:
+        # The exported tree's parser snapshot stays in the scratch directory
+        env = {**os.environ, 'LENS_PARSER_CACHE_DIR': str(code_dir / ".parser-cache")}
+    proc = subprocess.run([sys.executable, __file__, '--child', stage, str(scale), str(code_dir)],
+                          capture_output=True, text=True, check=True, env=env)
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def best(results: list) -> dict:
+    """The fastest of several runs of one stage/scale"""
+    return max(results, key=lambda result: result['rows_per_sec'])
+
+
+# ---------------------------------------------------------------------------
+# Baseline commit and history
+# ---------------------------------------------------------------------------
+
+def export_baseline(ref: str, dest: Path) -> Path:
+    """Write the Lens Database directory of commit ``ref`` under ``dest`` and return it."""
+    archive = dest / "baseline.tar"
+    # Run from this directory, git archive exports just this directory
+    with archive.open('wb') as f:
+        subprocess.run(['git', 'archive', '--format=tar', ref], cwd=LENS_DB_DIR, stdout=f, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(dest / "baseline", filter='data')
+    archive.unlink()
+    return dest / "baseline"
+
+
+def load_history(path: Path) -> list:
+    if not path.exists():
+        return []
+    with path.open(encoding='utf-8') as f:
+        return json.load(f)
+
+
+def git(*args: str):
+    """Output of ``git args`` run in this directory, None if git fails"""
+    try:
+        return subprocess.run(['git', *args], cwd=LENS_DB_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def git_commit(ref: str = 'HEAD'):
+    return git('rev-parse', '--short', ref)
+
+
+def default_baseline():
+    """Commit a run without ``--baseline`` compares against, None without git history.
+
+    On a branch: where it left main / master (BASELINE_BRANCHES).  On main
+    itself, or a clean checkout of it in CI: HEAD~1.
+    """
+    head = git('rev-parse', 'HEAD')
+    if head is None:
+        return None
+    for branch in BASELINE_BRANCHES:
+        fork = git('merge-base', 'HEAD', branch)
+        if fork and fork != head:
+            return fork
+    return 'HEAD~1' if git('rev-parse', '--verify', '--quiet', 'HEAD~1^{commit}') else None
+
+
+def history_baseline(path: Path):
+    """(label, results) of the last recorded run, None if there is none"""
+    history = load_history(path)
+    if not history:
+        return None
+    last = history[-1]
+    return f"last recorded run ({last.get('commit') or 'commit unknown'}, {last.get('timestamp')})", last['results']
+
+
+def main(args) -> int:
+    scales = args.scales or (SCALES_FULL if args.full else SCALES_DEFAULT)
+    stages = args.stages or list(STAGES)
+    results = {}
+    regressions = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_dir = None
+        recorded = None
+        baseline_ref = None
+        if not args.no_baseline:
+            baseline_ref = args.baseline or default_baseline()
+            if baseline_ref is not None:
+                try:
+                    baseline_dir = export_baseline(baseline_ref, Path(tmp))
+                except (OSError, subprocess.CalledProcessError) as exc:
+                    print(f"WARNING: could not export {baseline_ref}: {exc}")
+                    baseline_ref = None
+            if baseline_dir is not None:
+                print(f"Baseline: {baseline_ref} ({git_commit(baseline_ref)}), "
+                      f"best of {args.repeat} round(s), threshold {args.threshold:.0%}")
+            else:
+                recorded = history_baseline(args.history)
+                if recorded is None:
+                    print("WARNING: no baseline commit and no recorded run; nothing to compare against")
+                else:
+                    print(f"WARNING: no baseline commit to re-measure; comparing with the {recorded[0]}, "
+                          f"which may come from another machine (threshold {args.threshold:.0%})")
+        print(f"{'stage':<22} {'scale':>6} {'rows':>10} {'seconds':>9} {'rows/sec':>11} "
+              f"{'peak RSS':>10} {'baseline':>11} {'vs base':>8}")
+        print("-" * 94)
+        for stage in stages:
+            for scale in scales:
+                runs, base_runs = [], []
+                for _ in range(args.repeat):
+                    runs.append(measure(stage, scale))
+                    if baseline_dir is not None:
+                        try:
+                            base_runs.append(measure(stage, scale, baseline_dir))
+                        except subprocess.CalledProcessError:
+                            pass
+                result = best(runs)
+                results.setdefault(stage, {})[str(scale)] = result
+                base = best(base_runs)['rows_per_sec'] if base_runs else None
+                if recorded is not None:
+                    base = recorded[1].get(stage, {}).get(str(scale), {}).get('rows_per_sec')
+                ratio = result['rows_per_sec'] / base if base else None
+                print(f"{stage:<22} {scale:>5}x {result['rows']:>10,} {result['seconds']:>9.2f} "
+                      f"{result['rows_per_sec']:>11,.0f} {result['peak_rss_mb']:>8.1f}MB "
+                      f"{f'{base:,.0f}' if base else '-':>11} {f'{ratio:.2f}x' if ratio else '-':>8}")
+                if baseline_dir is not None and not base_runs:
+                    print(f"  (the baseline could not run {stage}; not compared)")
+                if ratio is not None and ratio < 1 - args.threshold:
+                    regressions.append(f"{stage} {scale}x: {result['rows_per_sec']:,.0f} rows/sec "
+                                       f"vs baseline {base:,.0f} ({ratio - 1:+.0%}, "
+                                       f"threshold -{args.threshold:.0%})")
+
+    for regression in regressions:
+        print(f"ERROR: throughput regression in {regression}")
+    if not args.no_record and (not regressions or args.accept):
+        history = load_history(args.history)
+        history.append({
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'baseline': git_commit(baseline_ref) if baseline_dir is not None else None,
+            'python': sys.version.split()[0],
+            'results': results,
+        })
+        with args.history.open('w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2)
+        print(f"Recorded run {len(history)} in {args.history}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        run_child(sys.argv[2], int(sys.argv[3]), Path(sys.argv[4]))
+        sys.exit(0)
+    cli = argparse.ArgumentParser(description="Lens Database pipeline benchmark")
+    cli.add_argument('--full', action='store_true', help="also run the 1000x scale")
+    cli.add_argument('--scales', type=int, nargs='+', help="replication factors (default 10 100)")
+    cli.add_argument('--stages', nargs='+', choices=list(STAGES), help="stages to run (default all)")
+    cli.add_argument('--baseline', metavar='REF',
+                     help="git commit to compare against, re-measured in this run (default: the "
+                          "merge-base with main / master, or HEAD~1 on main; HEAD for uncommitted changes)")
+    cli.add_argument('--no-baseline', action='store_true', help="only measure the working tree")
+    cli.add_argument('--repeat', type=int, default=1,
+                     help="rounds per stage/scale; the best of each side is compared (default 1)")
+    cli.add_argument('--threshold', type=float, default=THRESHOLD_DEFAULT,
+                     help="allowed drop in rows/sec vs the baseline (default 0.2)")
+    cli.add_argument('--history', type=Path, default=HISTORY_DEFAULT, help="JSON history file")
+    cli.add_argument('--no-record', action='store_true', help="do not append this run to the history")
+    cli.add_argument('--accept', action='store_true', help="record the run even if it regressed")
+    sys.exit(main(cli.parse_args()))
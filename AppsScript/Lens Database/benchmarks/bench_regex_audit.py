@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark: regex backtracking audit
+-----------------------------------
+Fuzzes every pattern the parsers use - the lens_regex registry (including
+the patterns esc_raw_lense_parse and SimpleLensParser compile at run time),
+lens_tokenizer, coverage_confidence and the special_rules.json captures -
+with adversarial strings: long runs of digits, decimal points, slash chains
+pasted from F2 exports, whitespace, unclosed parentheses, letters that open
+stops and squeeze factors …
+
+Each pattern is searched and scanned (``finditer``, as ``sub`` does) over
+every family at two lengths; a pattern whose worst time grows more than
+twice as fast as the input (4x the length, over 8x the time) is reported as
+superlinear.  Then the entry points (parse_line, parse_lens_name,
+parse_many and the Final Flatten normalisers) are timed on the same strings
+against a per-call budget (default 50 ms).
+
+The script exits non-zero if any pattern is superlinear (unless listed in
+GUARDED with the reason its callers are safe) or an entry point is over
+budget.
+
+Usage:
+    python3 benchmarks/bench_regex_audit.py [--budget-ms 50] [--top 15]
+"""
+import argparse
+import contextlib
+import io
+import re
+import sys
+import time
+from pathlib import Path
+
+LENS_DB_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LENS_DB_DIR))
+sys.path.insert(0, str(LENS_DB_DIR / "Machine Learning"))
+sys.path.insert(0, str(LENS_DB_DIR / "Final Flatten"))
+
+import coverage_confidence  # noqa: E402
+import esc_raw_lense_parse  # noqa: E402
+import lens_regex  # noqa: E402
+import lens_tokenizer  # noqa: E402
+import nromalize_lens_data  # noqa: E402
+from simple_lens_parser import MAX_NAME_LENGTH, SimpleLensParser  # noqa: E402
+from special_case_rules import Capture  # noqa: E402
+
+INPUT = LENS_DB_DIR / "ESC Raw Lenses.csv"
+SMALL, LARGE = 1000, 4000
+REPEATS = 3
+NOISE_FLOOR_MS = 0.5
+BUDGET_MS_DEFAULT = 50.0
+
+# Repeated out to the test length
+FAMILIES = {
+    'digits': '1',
+    'decimals': '1.',
+    'slash chain': '1/',
+    'dash chain': '1-',
+    'F2 export': '12-3.4/',
+    'double dots': '1..',
+    'numbers': '1.1 ',
+    'spaces': ' ',
+    'tabs/newlines': '\t\n',
+    'open parens': '(',
+    'open paren words': '(a',
+    'paren spaces': '( ',
+    'letters': 'a',
+    't-stop leads': 't',
+    'stop digits': 't1',
+    'f-stop slashes': 'f/',
+    'squeeze leads': 'x',
+    'squeeze digits': '1x',
+    'mm units': 'mm',
+    'spaced units': '1 m',
+    'words': 'lens ',
+    'mount words': 'pl ',
+}
+
+# Superlinear patterns whose callers bound the input they see
+GUARDED = {
+    lens_regex.PAREN_DESCRIPTION_RE.pattern:
+        'normalize_iris_blade_count only substitutes up to the last ")"',
+}
+
+
+def collect_patterns(parser):
+    """{pattern text + flags: (label, compiled)} for every pattern in use"""
+    found = {}
+
+    def add(label, pattern):
+        found.setdefault((pattern.pattern, pattern.flags), (label, pattern))
+
+    for module in (lens_regex, lens_tokenizer, coverage_confidence):
+        for name, value in vars(module).items():
+            if isinstance(value, re.Pattern):
+                add(f"{module.__name__}.{name}", value)
+            elif isinstance(value, lens_regex.KeywordAlternation):
+                add(f"{module.__name__}.{name}", value.pattern)
+            elif isinstance(value, (list, tuple)):
+                for i, item in enumerate(value):
+                    item = item[1] if isinstance(item, tuple) and len(item) == 2 else item
+                    if isinstance(item, re.Pattern):
+                        add(f"{module.__name__}.{name}[{i}]", item)
+    for rules in (parser.special_rules.series, parser.special_rules.fields):
+        for rule in rules.rules:
+            for field, value in rule.actions:
+                if isinstance(value, Capture):
+                    add(f"special_rules:{rule.id}.{field}", value.pattern)
+    # Patterns built at run time (escaped names, unit suffixes …)
+    for pattern in list(lens_regex._CACHE.values()):
+        add(f"compiled: {pattern.pattern[:40]}", pattern)
+    return found
+
+
+def best_time(func, text):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def scan(pattern):
+    def run(text):
+        pattern.search(text)
+        for _ in pattern.finditer(text):
+            pass
+    return run
+
+
+def audit_pattern(pattern):
+    """(worst family, ms at LARGE, growth LARGE/SMALL) over FAMILIES"""
+    run = scan(pattern)
+    worst = None
+    for family, unit in FAMILIES.items():
+        large = best_time(run, (unit * LARGE)[:LARGE])
+        if worst is None or large > worst[1]:
+            small = best_time(run, (unit * SMALL)[:SMALL])
+            worst = (family, large, large / small if small else 0.0)
+    return worst
+
+
+def entry_points(parser):
+    """(name, callable, input length) for the parsing entry points"""
+    return [
+        ('esc parse_line', esc_raw_lense_parse.parse_line, LARGE),
+        ('parse_lens_name', parser.parse_lens_name, LARGE),
+        ('parse_many', lambda text: parser.parse_many([text]), MAX_NAME_LENGTH),
+        ('normalize_focal_length', nromalize_lens_data.normalize_focal_length, LARGE),
+        ('normalize_weight', nromalize_lens_data.normalize_weight, LARGE),
+        ('normalize_iris_blade_count', nromalize_lens_data.normalize_iris_blade_count, LARGE),
+        ('normalize_image_circle', nromalize_lens_data.normalize_image_circle, LARGE),
+        ('normalize_close_focus', nromalize_lens_data.normalize_close_focus, LARGE),
+    ]
+
+
+def main(budget_ms: float, top: int) -> int:
+    parser = SimpleLensParser.load(cache_size=0)
+    # Parse the inventory once so patterns compiled on first use are registered
+    with contextlib.redirect_stdout(io.StringIO()):
+        for line in INPUT.open(encoding='utf-8'):
+            esc_raw_lense_parse.parse_line(line)
+            parser.parse_lens_name(line.strip())
+    patterns = collect_patterns(parser)
+
+    results = []
+    for label, pattern in patterns.values():
+        family, ms, growth = audit_pattern(pattern)
+        superlinear = growth > 8 and ms > NOISE_FLOOR_MS
+        results.append((ms, label, pattern.pattern, family, growth, superlinear))
+    results.sort(reverse=True)
+
+    print(f"{len(results)} patterns x {len(FAMILIES)} adversarial families, {SMALL} and {LARGE} characters")
+    print(f"{'worst ms':>9} {'growth':>7}  {'family':<17} pattern")
+    for ms, label, text, family, growth, superlinear in results[:top]:
+        flag = ' SUPERLINEAR' if superlinear else ''
+        print(f"{ms:>9.2f} {growth:>6.1f}x  {family:<17} {label}: {text[:60]!r}{flag}")
+
+    failures = 0
+    for ms, label, text, family, growth, superlinear in results:
+        if not superlinear:
+            continue
+        if text in GUARDED:
+            print(f"  guarded: {label} ({GUARDED[text]})")
+        else:
+            print(f"ERROR: {label} is superlinear on {family} ({growth:.0f}x time for 4x input)")
+            failures += 1
+
+    print(f"\n{'entry point':<28} {'chars':>6} {'worst ms':>9}  family")
+    for name, func, length in entry_points(parser):
+        worst = (0.0, '')
+        with contextlib.redirect_stdout(io.StringIO()):
+            for family, unit in FAMILIES.items():
+                worst = max(worst, (best_time(func, (unit * length)[:length]), family))
+        over = worst[0] > budget_ms
+        print(f"{name:<28} {length:>6} {worst[0]:>9.2f}  {worst[1]}{'  OVER BUDGET' if over else ''}")
+        if over:
+            print(f"ERROR: {name} took {worst[0]:.1f} ms on {worst[1]} (budget {budget_ms:.0f} ms)")
+            failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    cli = argparse.ArgumentParser(description="Regex backtracking audit")
+    cli.add_argument('--budget-ms', type=float, default=BUDGET_MS_DEFAULT,
+                     help="time allowed per entry-point call (default 50)")
+    cli.add_argument('--top', type=int, default=15, help="slowest patterns to list (default 15)")
+    args = cli.parse_args()
+    sys.exit(main(args.budget_ms, args.top))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: span-masked residual notes vs sequential re.sub
+----------------------------------------------------------
+Replicates "ESC Raw Lenses.csv" out to N rows (default 100k) and times the
+"leftover descriptive text" step of esc_raw_lense_parse.parse_line two ways:
+
+  • sequential – the original chain of ~80 ``re.sub`` calls per line
+  • masked     – residual_notes(): spans recorded on the original name,
+                 one join at the end
+
+Both paths must agree on every row; the script exits non-zero otherwise.
+
+Usage:
+    python3 benchmarks/bench_residual_notes.py [rows]
+"""
+import re
+import sys
+import time
+from itertools import cycle, islice
+from pathlib import Path
+
+LENS_DB_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LENS_DB_DIR))
+
+import esc_raw_lense_parse as esc  # noqa: E402
+
+INPUT = LENS_DB_DIR / "ESC Raw Lenses.csv"
+ROWS_DEFAULT = 100_000
+
+
+def sequential_notes(original, row):
+    """Residual notes exactly as parse_line computed them before span masking."""
+    residual = original
+    components_to_remove = []
+    if row['Manufacturer']:
+        components_to_remove.append(row['Manufacturer'])
+    if row['Series']:
+        components_to_remove.append(row['Series'])
+    if row['Focal Length']:
+        components_to_remove.append(row['Focal Length'])
+    if row['T-Stop']:
+        components_to_remove.append(f"T{row['T-Stop']}")
+    if row['Anamorphic Squeeze Factor']:
+        components_to_remove.append(row['Anamorphic Squeeze Factor'])
+    for format_key in esc.FORMAT_KEYWORDS:
+        if not re.match(r'^\d+mm$', format_key, re.I):
+            components_to_remove.append(format_key)
+    components_to_remove.extend(esc.MOUNT_KEYWORDS)
+    components_to_remove.extend(esc.ANAMORPHIC_KEYWORDS)
+    components_to_remove.extend(esc.HOUSING_MANUFACTURERS)
+    components_to_remove.extend(esc.EXTRA_FLAGS.keys())
+    for component in components_to_remove:
+        residual = re.sub(r'\b' + re.escape(component) + r'\b', '', residual, flags=re.I)
+    for mount_key in esc.MOUNT_KEYWORDS:
+        residual = re.sub(r'\(?\s*' + re.escape(mount_key) + r'\s*\)?', '', residual, flags=re.I)
+    residual = re.sub(r'\d+(?:\.\d+)?\s*x', '', residual, flags=re.I)
+    residual = re.sub(r'i/Data|iData', '', residual, flags=re.I)
+    residual = re.sub(r'Summilux-C|Summilux C', '', residual, flags=re.I)
+    residual = re.sub(r'Summicron-C|Summicron C', '', residual, flags=re.I)
+    residual = re.sub(r'Cine', '', residual, flags=re.I)
+    if row['Manufacturer'] and ('Leitz' in row['Manufacturer'] or 'Leica' in row['Manufacturer']):
+        residual = re.sub(r'Leica-R|R', '', residual, flags=re.I)
+    if row['Focal Length']:
+        residual = re.sub(re.escape(row['Focal Length']), '', residual, flags=re.I)
+        if '-' in row['Focal Length']:
+            parts = row['Focal Length'].split('-')
+            if len(parts) == 2:
+                first_fl = parts[0].replace('mm', '')
+                second_fl = parts[1].replace('mm', '')
+                residual = re.sub(r'\b' + re.escape(first_fl) + r'\b', '', residual, flags=re.I)
+                residual = re.sub(r'\b' + re.escape(second_fl) + r'\b', '', residual, flags=re.I)
+                residual = re.sub(r'\b' + re.escape(first_fl) + r'mm\b', '', residual, flags=re.I)
+                residual = re.sub(r'\b' + re.escape(second_fl) + r'mm\b', '', residual, flags=re.I)
+        focal_without_mm = row['Focal Length'].replace('mm', '')
+        if focal_without_mm != row['Focal Length']:
+            residual = re.sub(re.escape(focal_without_mm), '', residual, flags=re.I)
+    residual = re.sub(r'[\s\-_,;]+', ' ', residual)
+    residual = residual.replace('(', '').replace(')', '')
+    residual = residual.replace('[', '').replace(']', '')
+    residual = residual.replace('+', ' ')
+    return esc.clean_text(residual)
+
+
+def main(rows: int) -> int:
+    with INPUT.open(encoding='utf-8') as f:
+        names = [line.strip() for line in f if line.strip()]
+    # Detected fields are the residual step's input; parse once up front
+    parsed = {name: esc.parse_line(name) for name in names}
+    work = [(name, parsed[name]) for name in islice(cycle(names), rows)]
+    print(f"{len(work)} rows")
+
+    timings = {}
+    results = {}
+    for label, fn in (('sequential', sequential_notes), ('masked', esc.residual_notes)):
+        start = time.perf_counter()
+        results[label] = [fn(name, row) for name, row in work]
+        timings[label] = time.perf_counter() - start
+        print(f"  {label:<10} {timings[label]:7.3f}s  {len(work) / timings[label]:>10,.0f} rows/sec")
+
+    print(f"  speedup    {timings['sequential'] / timings['masked']:.2f}x")
+    if results['sequential'] != results['masked']:
+        print("ERROR: masked residual notes differ from sequential re.sub")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS_DEFAULT))
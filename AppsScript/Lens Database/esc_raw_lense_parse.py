@@ -6,21 +6,48 @@ Explode the one-column "ESC Raw Lenses.csv" list into the master 36-column
 format used by Flattened_Lens_Inventory.csv.
 
 Usage:
-    python3 esc_raw_lense_parse.py  [input_csv] [output_csv]
+    python3 esc_raw_lense_parse.py  [input_csv] [output_csv] [--jobs N]
 If paths are omitted it defaults to the file next to the script:
     input : ESC Raw Lenses.csv
     output: ESC_Raw_Lenses_Flat.csv
+Either path may be "-" for stdin / stdout, e.g.
+    cut -d, -f1 export.csv | python3 esc_raw_lense_parse.py - - > flat.csv
+
+Rows are written as they are parsed, to a temporary file that replaces the
+output only when the run succeeds.  ``--jobs N`` parses chunks of lines on N
+worker processes; the output is the same, in the same order.
 """
 import csv
-import re
+import io
+import os
 import sys
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from lens_regex import (
+    ANAMORPHIC_ALT, ANAMORPHIC_KEYWORD_RES, ANAMORPHIC_KEYWORDS, CINE_RE,
+    COOKE_5I_RE, COOKE_S4_RE, COOKE_S4I_RE, FOCAL_LIKE_RE, FOCAL_MM_RE,
+    FOCAL_RANGE_RE, FORMAT_ALT, FORMAT_KEYWORD_RES, FORMAT_KEYWORDS,
+    FORMAT_NON_FOCAL_ALT, HOUSING_ALT, HOUSING_KEYWORD_RES,
+    HOUSING_MANUFACTURERS, IDATA_RE, KOOKY_COOKE_RE, LEADING_MM_RE,
+    LEADING_NUMBER_RE, LEICA_R_RE, LEICA_R_WORD_RE, MANUFACTURER_PATTERNS,
+    MOUNT_ALT, MOUNT_KEYWORDS, MOUNT_PAREN_RES, NUMBER_ONLY_RE, SEPARATORS_RE,
+    SERIES_ALT, SERIES_KEYWORDS, SERIES_SPLIT_RE, SQUEEZE_RE,
+    SUMMICRON_C_RE, SUMMILUX_C_RE, T_STOP_RE, ZOOM_RANGE_MM_RE,
+    ZOOM_WORD_RE, KeywordHits, KeywordScan, PatternGroup, SpanMask, literal,
+)
+from manufacturer_index import MANUFACTURER_INDEX, MANUFACTURER_SERIES
 
 PROJECT_DIR = Path(__file__).parent
 INPUT_DEFAULT = PROJECT_DIR / "ESC Raw Lenses.csv"
 OUTPUT_DEFAULT = PROJECT_DIR / "ESC_Raw_Lenses_Flat.csv"
 
+# Lines per work unit with --jobs
+CHUNK_LINES = 2000
+
 HEADERS: List[str] = [
     'Manufacturer', 'Series', 'Focal Length', 'T-Stop', 'Prime / Zoom / Special',
     'Format', 'Mount', 'Anamorphic / Spherical', 'Anamorphic Squeeze Factor',
@@ -32,76 +59,9 @@ HEADERS: List[str] = [
     'Focus Scale', 'Original Name'
 ]
 
-SERIES_KEYWORDS = [
-    'Compact Prime CP3', 'Compact Prime CP2', 'Compact Prime',
-    'Master Prime', 'Ultra Prime', 'Super Speed', 'Standard Speed',
-    'S4', 'S4/i', 'S5', 'S7', 'S8', 'Panchro', 'Speed Panchro', 'Varotal',
-    'Summilux C', 'Summicron C', 'Summilux-C', 'Summicron-C', 'Cine'
-]
-
-HOUSING_MANUFACTURERS = [
-    'TLS', 'Ancient Optics', 'GL Optics', 'Optex', 'Whitepoint Optics', 
-    'Zero Optik', 'Works Cameras', 'Cinescope'
-]
-
-FORMAT_KEYWORDS = [
-    'FF', '16mm Format', 'S16', 'S35', 'Super 35', 'Full Frame', '65mm Format', 'Large Format',
-    'Super 16', 'Super 35mm'
-]
-
-MOUNT_KEYWORDS = [
-    'LPL Mount', 'XPL Mount', 'PL Mount', 'Canon EF', 'Sony E', 'Nikon Z',
-    'LPL', 'XPL', 'E mount', 'EF Mount', 'Z mount', 'EF', 'E-Mount', 'Z-Mount', 'PL'
-]
-
-ANAMORPHIC_KEYWORDS = [
-    'Anamorphic', 'Spherical'
-]
-
-# Manufacturer-Series Dictionary for filling in blanks
-MANUFACTURER_SERIES_DICT = {
-    'Zeiss': ['Master Prime', 'Ultra Prime', 'CP2', 'Supreme Prime', 'CP3', 'Compact Prime CP2', 'Compact Prime CP3', 'Standard Speed', 'Super Speed'],
-    'Canon': ['CN-E Cinema Primes', 'K35', 'K-35'],
-    'Nikon': ['Nikkor Z', 'AI-S Cine-Mod', 'Nikkor'],
-    'Leica': ['Thalia', 'R'],
-    'Leitz': ['Summilux C', 'Summicron C', 'Leitz Prime', 'Hugo', 'R'],
-    'Fujinon': ['MK Series', 'Premista', 'Premier'],
-    'Angenieux': ['Optimo', 'EZ Series', 'HR', 'A-2S'],
-    'Cooke': ['S4/i', 'Anamorphic/i', 'S4', 'S5', 'S7', 'S8', 'Panchro', 'Speed Panchro', 'Varotal'],
-    'Schneider': ['Xenon FF', 'Cine-Xenar III'],
-    'Tokina': ['Vista Primes', 'ATX Cinema'],
-    'Sigma': ['Cine FF High Speed', 'Art Series'],
-    'Tamron': ['SP Series', 'Di Series'],
-    'Rokinon': ['XEEN', 'Cine DS'],
-    'Samyang': ['VDSLR', 'XEEN'],
-    'Irix': ['Cine Series', 'Dragonfly'],
-    'Venus': ['Laowa Cine', 'Zero-D'],
-    'Mitakon': ['Speedmaster', 'Creator'],
-    'Meike': ['Cinema Prime', 'Classic Cine'],
-    '7Artisans': ['Vision Series', 'Photoelectric'],
-    'Laowa': ['Zero-D Cine', 'Probe Lens', 'FF Ranger'],
-    'Voigtländer': ['Nokton', 'APO-Lanthar', 'Heliar', 'Ultra Wide Heliar', 'Super Wide Heliar'],
-    'Voigtlander': ['Nokton', 'APO-Lanthar', 'Heliar', 'Ultra Wide Heliar', 'Super Wide Heliar'],
-    'Hawk': ['V-Lite', 'V-Plus Anamorphic'],
-    'Masterbuilt': ['Masterbuilt Primes', 'Legacy Anamorphic'],
-    'Caldwell': ['Chameleon Anamorphic', 'IBÉ Optics-Caldwell 1.79x', 'Chameleon'],
-    'Xelmus': ['Apollo Anamorphic', 'Helium'],
-    'DZOFilms': ['VESPID Prime', 'Pictor Zoom'],
-    'Atlas': ['Orion Series', 'Mercury Series'],
-    'Tribe7': ['Blackwing7', 'T-Tuned Primes'],
-    'Kowa': ['Anamorphic Prominar', 'Cine Prominar', 'Cine'],
-    'Gecko-Cam': ['Genesis G35'],
-    'Sony': ['G Master', 'CineAlta'],
-    'Panavision': ['Primo', 'Ultra Panatar'],
-    'Vantage': ['Hawk V-Lite', 'Vantage One T1'],
-    'Iscorama': ['Iscorama 36', 'Iscorama 54'],
-    'Century': ['Century Optics Anamorphic', 'Pro Series'],
-    'Statera': ['Statera Primes', 'Statera Macro'],
-    'Master': ['Master Primes', 'Master Anamorphic', 'Master Prime'],
-    'Lomo': ['LOMO Roundfront', 'LOMO Squarefront'],
-    'ARRI': ['Signature Prime', 'Master Prime', 'Ultra Prime'],
-    'Arri': ['Signature Prime', 'Master Prime', 'Ultra Prime']
-}
+# Manufacturer-Series Dictionary for filling in blanks (shared with
+# SimpleLensParser, indexed in manufacturer_index)
+MANUFACTURER_SERIES_DICT = MANUFACTURER_SERIES
 
 EXTRA_FLAGS = {
     'lds': 'LDS',
@@ -111,25 +71,59 @@ EXTRA_FLAGS = {
     'special fx': 'Special FX',
 }
 
+# Every fixed removal for the residual notes text, in order: format (except
+# simple focal length patterns), mount, anamorphic, housing and flag keywords
+# as whole words, then mounts with parentheses, squeeze factors, i/Data and
+# the Leitz/Leica series names ("R" only for Leitz/Leica lenses).  The last
+# item of each entry is text every match contains.
+RESIDUAL_PATTERNS = [
+    (literal(keyword), True, keyword.lower())
+    for keyword in (
+        [k for k in FORMAT_KEYWORDS if not FOCAL_LIKE_RE.match(k)]
+        + MOUNT_KEYWORDS + ANAMORPHIC_KEYWORDS + HOUSING_MANUFACTURERS
+        + list(EXTRA_FLAGS)
+    )
+] + [
+    (pattern, False, keyword.lower()) for pattern, keyword in zip(MOUNT_PAREN_RES, MOUNT_KEYWORDS)
+] + [
+    (SQUEEZE_RE, False, 'x'),
+    (IDATA_RE, False, 'data'),
+    (SUMMILUX_C_RE, False, 'summilux'),
+    (SUMMICRON_C_RE, False, 'summicron'),
+    (CINE_RE, False, 'cine'),
+]
+RESIDUAL_GROUP = PatternGroup(RESIDUAL_PATTERNS)
+RESIDUAL_GROUP_LEITZ = PatternGroup(RESIDUAL_PATTERNS + [(LEICA_R_RE, False, 'r')])
+
+# Every keyword list parse_line looks up, plus the residual-notes cores,
+# answered from one scan of the name (lens_core merges these tables into
+# SimpleLensParser's automaton to share its scan)
+KEYWORDS = KeywordScan({
+    'format': FORMAT_ALT,
+    'format_non_focal': FORMAT_NON_FOCAL_ALT,
+    'series': SERIES_ALT,
+    'mount': MOUNT_ALT,
+    'anamorphic': ANAMORPHIC_ALT,
+    'housing': HOUSING_ALT,
+    'residual': RESIDUAL_GROUP_LEITZ.cores,
+}, prefix='esc.')
+
 def empty_row() -> Dict[str, str]:
     return {h: '' for h in HEADERS}
 
 
 def clean_text(text: str) -> str:
-    return re.sub(r'[\s\-_,;]+', ' ', text).strip()
+    return SEPARATORS_RE.sub(' ', text).strip()
 
 
-def detect_housing(original: str, manufacturer: str) -> str:
+def detect_housing(original: str, manufacturer: str, keywords: Optional[KeywordHits] = None) -> str:
     """
     Detect housing manufacturer from the lens name.
     If a housing manufacturer is found, return it regardless of lens manufacturer.
     Otherwise return "Original Housing".
     """
-    for housing_mfg in HOUSING_MANUFACTURERS:
-        if re.search(re.escape(housing_mfg), original, re.I):
-            return housing_mfg
-    
-    return "Original Housing"
+    keywords = keywords or KEYWORDS.lookup(original)
+    return keywords.first('housing') or "Original Housing"
 
 
 def fill_blanks_with_dict(row: Dict[str, str], original: str) -> Dict[str, str]:
@@ -143,62 +137,140 @@ def fill_blanks_with_dict(row: Dict[str, str], original: str) -> Dict[str, str]:
     
     # If we have a manufacturer but no series, try to find a matching series
     if row['Manufacturer'] and not row['Series']:
-        manufacturer = row['Manufacturer'].strip()
-        if manufacturer in MANUFACTURER_SERIES_DICT:
-            # Look for any of the known series in the original name
-            for series in MANUFACTURER_SERIES_DICT[manufacturer]:
-                if re.search(re.escape(series), original, re.I):
-                    row['Series'] = series
-                    break
+        # First of its known series named in the original name
+        series = MANUFACTURER_INDEX.series_in(row['Manufacturer'].strip(), original)
+        if series:
+            row['Series'] = series
     
     # If we have a series but no manufacturer, try to find a matching manufacturer
     elif row['Series'] and not row['Manufacturer']:
-        series = row['Series'].strip()
-        for manufacturer, series_list in MANUFACTURER_SERIES_DICT.items():
-            if series in series_list:
-                row['Manufacturer'] = manufacturer
-                break
+        manufacturer = MANUFACTURER_INDEX.manufacturer_for_series(row['Series'].strip())
+        if manufacturer:
+            row['Manufacturer'] = manufacturer
     
     # If both are blank, try to infer from the original name
     elif not row['Manufacturer'] and not row['Series']:
-        # Look for any manufacturer in the original name
-        for manufacturer, series_list in MANUFACTURER_SERIES_DICT.items():
-            if re.search(re.escape(manufacturer), original, re.I):
-                row['Manufacturer'] = manufacturer
-                # Try to find a matching series
-                for series in series_list:
-                    if re.search(re.escape(series), original, re.I):
-                        row['Series'] = series
-                        break
-                break
+        # First manufacturer named in the original name, then one of its series
+        manufacturer = MANUFACTURER_INDEX.manufacturer_in(original)
+        if manufacturer:
+            row['Manufacturer'] = manufacturer
+            series = MANUFACTURER_INDEX.series_in(manufacturer, original)
+            if series:
+                row['Series'] = series
     
     return row
 
 
-def parse_line(line: str) -> Dict[str, str]:
+def residual_notes(original: str, row: Dict[str, str], keywords: Optional[KeywordHits] = None) -> str:
+    """
+    Leftover descriptive text once every detected component is removed.
+    Removals are recorded as spans of the original name and the remainder
+    is joined once, so the work per line doesn't grow with the keyword lists.
+    """
+    keywords = keywords or KEYWORDS.lookup(original)
+    residual = SpanMask(original)
+    
+    # Remove all detected components systematically
+    components_to_remove = []
+    
+    # Add manufacturer
+    if row['Manufacturer']:
+        components_to_remove.append(row['Manufacturer'])
+    
+    # Add series
+    if row['Series']:
+        components_to_remove.append(row['Series'])
+    
+    # Add focal length
+    if row['Focal Length']:
+        components_to_remove.append(row['Focal Length'])
+    
+    # Add T-stop
+    if row['T-Stop']:
+        components_to_remove.append(f"T{row['T-Stop']}")
+    
+    # Add anamorphic squeeze factor
+    if row['Anamorphic Squeeze Factor']:
+        components_to_remove.append(row['Anamorphic Squeeze Factor'])
+    
+    # Use word boundaries to avoid partial matches
+    for component in components_to_remove:
+        pattern = literal(component)
+        if not pattern.search(original):
+            # Built from cleaned-up text (a fallback series with the
+            # manufacturer stripped out …): it can only match the text left
+            # after the earlier removals
+            residual = SpanMask(residual.text())
+        residual.remove(pattern, word=True)
+    
+    # Format, mount, anamorphic, housing and flag keywords plus the fixed
+    # patterns, in one scan
+    if row['Manufacturer'] and ('Leitz' in row['Manufacturer'] or 'Leica' in row['Manufacturer']):
+        residual.remove_group(RESIDUAL_GROUP_LEITZ, keywords.present('residual'))
+    else:
+        residual.remove_group(RESIDUAL_GROUP, keywords.present('residual'))
+    
+    # Remove the detected focal length from residual text
+    if row['Focal Length']:
+        # Remove the exact focal length that was detected
+        residual.remove(literal(row['Focal Length']))
+        
+        # For zoom lenses, also remove the individual focal lengths
+        if '-' in row['Focal Length']:
+            # Extract the two focal lengths from the range
+            parts = row['Focal Length'].split('-')
+            if len(parts) == 2:
+                first_fl = parts[0].replace('mm', '')
+                second_fl = parts[1].replace('mm', '')
+                # Remove both individual focal lengths
+                residual.remove(literal(first_fl), word=True)
+                residual.remove(literal(second_fl), word=True)
+                # Also remove with mm suffix
+                residual.remove(literal(first_fl + 'mm'), word=True)
+                residual.remove(literal(second_fl + 'mm'), word=True)
+        
+        # Also remove the focal length without "mm" suffix if it was added
+        focal_without_mm = row['Focal Length'].replace('mm', '')
+        if focal_without_mm != row['Focal Length']:
+            residual.remove(literal(focal_without_mm))
+    
+    # Clean up common separators and formatting
+    text = SEPARATORS_RE.sub(' ', residual.text())  # Replace separators with single space
+    text = text.replace('(', '').replace(')', '')
+    text = text.replace('[', '').replace(']', '')
+    text = text.replace('+', ' ')
+    return clean_text(text)
+
+
+def parse_line(line: str, keywords: Optional[KeywordHits] = None) -> Dict[str, str]:
+    """
+    One lens name in the 36-column layout.  ``keywords``: the KEYWORDS
+    lookups for the stripped line, when the caller has already scanned it.
+    """
     row = empty_row()
     original = line.strip()
     if not original:
         return row
+    keywords = keywords or KEYWORDS.lookup(original)
     
     # Store the original unprocessed name in column AJ (Original Name)
     row['Original Name'] = original
 
     # PRIORITY 1: focal length detection (including zoom ranges)
     # Check for zoom range first (e.g., 25-100mm, 25mm-100mm, 25-100)
-    zoom_match = re.search(r'(\d+(?:\.\d+)?)\s*[-–]\s*(\d+(?:\.\d+)?)\s*mm', original, re.I)
+    zoom_match = ZOOM_RANGE_MM_RE.search(original)
     if zoom_match:
         row['Focal Length'] = f"{zoom_match.group(1)}mm-{zoom_match.group(2)}mm"
     else:
         # Check for single focal length
-        fl_match = re.search(r'(\d+(?:\.\d+)?)\s*mm', original, re.I)
+        fl_match = FOCAL_MM_RE.search(original)
         if not fl_match:
-            fl_match = re.match(r'(\d+(?:\.\d+)?)', original)
+            fl_match = LEADING_NUMBER_RE.match(original)
         if fl_match:
             row['Focal Length'] = f"{fl_match.group(1)}mm"
 
     # PRIORITY 2: T-Stop
-    t_match = re.search(r'T\s*(\d+(?:\.\d+)?)', original, re.I)
+    t_match = T_STOP_RE.search(original)
     if t_match:
         row['T-Stop'] = t_match.group(1)
 
@@ -207,30 +279,19 @@ def parse_line(line: str) -> Dict[str, str]:
     row['Prime / Zoom / Special'] = 'Prime'
 
     # PRIORITY 3: Format detection (avoiding conflicts with focal length)
-    for format_key in FORMAT_KEYWORDS:
-        if re.search(re.escape(format_key), original, re.I):
-            # Double-check this isn't actually a focal length
-            # If it's a simple number+mm pattern and we already have a focal length, skip it
-            if re.match(r'^\d+mm$', format_key, re.I) and row['Focal Length']:
-                continue
-            row['Format'] = format_key
-            break
+    # Format keywords that are a simple number+mm pattern are skipped once
+    # a focal length is known
+    row['Format'] = keywords.first('format_non_focal' if row['Focal Length'] else 'format') or ''
 
     # PRIORITY 4: Manufacturer detection - typically comes after focal length
     if row['Focal Length']:
         # Split after focal length and look for manufacturer
         after_fl = original.split(row['Focal Length'], 1)[1] if row['Focal Length'] in original else original
-        after_fl = re.sub(r'^\s*mm\s*', '', after_fl, flags=re.I)
+        after_fl = LEADING_MM_RE.sub('', after_fl)
         
         # Look for common manufacturer names
-        manufacturer_patterns = [
-            r'\b(Zeiss|Canon|Nikon|Leica|Leitz|Fujinon|Angenieux|Cooke|Schneider|Tokina|Sigma|Tamron|Rokinon|Samyang|Irix|Venus|Mitakon|Meike|7Artisans|Laowa|Voigtländer|Voigtlander|Hawk|Masterbuilt|Caldwell|Xelmus|DZOFilms|Atlas|Tribe7|Kowa|Gecko-Cam|Sony|Panavision|Vantage|Iscorama|Century|Statera|Master|Lomo|V|ARRI|Arri)\b',
-            r'\b(ARRI|Arri|Arri)\b',
-            r'\b(Zeiss)\b'
-        ]
-        
-        for pattern in manufacturer_patterns:
-            mfg_match = re.search(pattern, after_fl, re.I)
+        for pattern in MANUFACTURER_PATTERNS:
+            mfg_match = pattern.search(after_fl)
             if mfg_match:
                 row['Manufacturer'] = mfg_match.group(1)
                 break
@@ -238,67 +299,63 @@ def parse_line(line: str) -> Dict[str, str]:
     # PRIORITY 5: Series detection
     # Special handling for Cooke series - look for S4/i pattern specifically
     if row['Manufacturer'] and 'Cooke' in row['Manufacturer']:
-        if re.search(r'S4/i', original, re.I):
+        if COOKE_S4I_RE.search(original):
             row['Series'] = 'S4/i'
-        elif re.search(r'S4', original, re.I):
+        elif COOKE_S4_RE.search(original):
             row['Series'] = 'S4'
-        elif re.search(r'5i', original, re.I):
+        elif COOKE_5I_RE.search(original):
             row['Series'] = '5i'
     
     # Special handling for Leitz/Leica series
     if row['Manufacturer'] and ('Leitz' in row['Manufacturer'] or 'Leica' in row['Manufacturer']):
-        if re.search(r'Summilux-C|Summilux C', original, re.I):
+        if SUMMILUX_C_RE.search(original):
             row['Series'] = 'Summilux C'
-        elif re.search(r'Summicron-C|Summicron C', original, re.I):
+        elif SUMMICRON_C_RE.search(original):
             row['Series'] = 'Summicron C'
-        elif re.search(r'Cine', original, re.I):
+        elif CINE_RE.search(original):
             row['Series'] = 'Cine'
-        elif re.search(r'Leica-R|\bR\b', original, re.I):
+        elif LEICA_R_WORD_RE.search(original):
             row['Series'] = 'R'
     
     # General series detection
     if not row['Series']:
-        for key in SERIES_KEYWORDS:
-            if re.search(re.escape(key), original, re.I):
-                row['Series'] = key
-                break
+        row['Series'] = keywords.first('series') or ''
     
     # Fallback: extract series from the beginning of the name after focal length
     if not row['Series']:
         if row['Focal Length']:
             # Split after focal length and take the first word/phrase
             after_fl = original.split(row['Focal Length'], 1)[1] if row['Focal Length'] in original else original
-            after_fl = re.sub(r'^\s*mm\s*', '', after_fl, flags=re.I).strip()
+            after_fl = LEADING_MM_RE.sub('', after_fl).strip()
             
             # Split by common separators and take the first meaningful word
-            parts = re.split(r'[\s\-_,;()]+', after_fl)
+            parts = SERIES_SPLIT_RE.split(after_fl)
             series_candidate = parts[0].strip() if parts else ""
             
             # Clean up the series candidate
             if series_candidate:
                 # Remove manufacturer if found
                 if row['Manufacturer']:
-                    series_candidate = re.sub(re.escape(row['Manufacturer']), '', series_candidate, flags=re.I)
+                    series_candidate = literal(row['Manufacturer']).sub('', series_candidate)
                 # Remove format keywords
-                for format_key in FORMAT_KEYWORDS:
-                    series_candidate = re.sub(re.escape(format_key), '', series_candidate, flags=re.I)
+                for format_re in FORMAT_KEYWORD_RES:
+                    series_candidate = format_re.sub('', series_candidate)
                 # Remove anamorphic/spherical keywords
-                for anamorphic_key in ANAMORPHIC_KEYWORDS:
-                    series_candidate = re.sub(re.escape(anamorphic_key), '', series_candidate, flags=re.I)
+                for anamorphic_re in ANAMORPHIC_KEYWORD_RES:
+                    series_candidate = anamorphic_re.sub('', series_candidate)
                 # Remove anamorphic squeeze factors
-                series_candidate = re.sub(r'\d+(?:\.\d+)?\s*x', '', series_candidate, flags=re.I)
+                series_candidate = SQUEEZE_RE.sub('', series_candidate)
                 # Remove mount information
-                for mount_key in MOUNT_KEYWORDS:
-                    mount_pattern = r'\(?\s*' + re.escape(mount_key) + r'\s*\)?'
-                    series_candidate = re.sub(mount_pattern, '', series_candidate, flags=re.I)
+                for mount_re in MOUNT_PAREN_RES:
+                    series_candidate = mount_re.sub('', series_candidate)
                 # Remove housing manufacturers
-                for housing_mfg in HOUSING_MANUFACTURERS:
-                    series_candidate = re.sub(re.escape(housing_mfg), '', series_candidate, flags=re.I)
+                for housing_re in HOUSING_KEYWORD_RES:
+                    series_candidate = housing_re.sub('', series_candidate)
                 
                 series_candidate = series_candidate.strip()
                 if series_candidate:
                     # Skip if the candidate is just a number (likely part of focal length)
-                    if re.match(r'^\d+(?:\.\d+)?$', series_candidate):
+                    if NUMBER_ONLY_RE.match(series_candidate):
                         pass
                     # Filter out single-letter series candidates unless they're for Leitz/Leica
                     elif len(series_candidate) == 1 and not (row['Manufacturer'] and ('Leitz' in row['Manufacturer'] or 'Leica' in row['Manufacturer'])):
@@ -310,7 +367,7 @@ def parse_line(line: str) -> Dict[str, str]:
     # Determine Prime/Zoom/Special based on focal length and keywords
     if row['Focal Length']:
         # Check if focal length contains a range (zoom lens)
-        if re.search(r'\d+mm?\s*[-–]\s*\d+mm?', row['Focal Length'], re.I):
+        if FOCAL_RANGE_RE.search(row['Focal Length']):
             row['Prime / Zoom / Special'] = 'Zoom'
         else:
             row['Prime / Zoom / Special'] = 'Prime'
@@ -318,45 +375,36 @@ def parse_line(line: str) -> Dict[str, str]:
         row['Prime / Zoom / Special'] = 'Prime'
     
     # Override with keyword detection - if "Zoom" is in the name, it's a zoom lens
-    if re.search(r'\bzoom\b', original, re.I):
+    if ZOOM_WORD_RE.search(original):
         row['Prime / Zoom / Special'] = 'Zoom'
 
     # PRIORITY 6: Mount detection (including parentheses)
-    for mount_key in MOUNT_KEYWORDS:
-        # Look for mount in parentheses or as standalone
-        mount_pattern = r'\(?\s*' + re.escape(mount_key) + r'\s*\)?'
-        if re.search(mount_pattern, original, re.I):
-            row['Mount'] = mount_key
-            break
+    # (the optional parentheses never change whether a mount keyword is present)
     # Default to PL if no mount found
-    if not row['Mount']:
-        row['Mount'] = 'PL'
+    row['Mount'] = keywords.first('mount') or 'PL'
 
     # PRIORITY 7: Anamorphic/Spherical detection and squeeze factor
-    for anamorphic_key in ANAMORPHIC_KEYWORDS:
-        if re.search(re.escape(anamorphic_key), original, re.I):
-            row['Anamorphic / Spherical'] = anamorphic_key
-            break
+    row['Anamorphic / Spherical'] = keywords.first('anamorphic') or ''
     
     # If anamorphic, look for squeeze factor (1.8x, 2x, 1.5x, etc.)
     if row['Anamorphic / Spherical'] == 'Anamorphic':
-        squeeze_match = re.search(r'(\d+(?:\.\d+)?)\s*x', original, re.I)
+        squeeze_match = SQUEEZE_RE.search(original)
         if squeeze_match:
             row['Anamorphic Squeeze Factor'] = f"{squeeze_match.group(1)}x"
 
     # PRIORITY 8: Housing detection
-    row['Housing'] = detect_housing(original, row['Manufacturer'])
+    row['Housing'] = detect_housing(original, row['Manufacturer'], keywords)
 
     # PRIORITY 9: Special exceptions and additional detection
     # Handle "Kooky Cooke" exception - if "Kooky Cooke" appears, add it to notes
-    if re.search(r'Kooky Cooke', original, re.I):
+    if KOOKY_COOKE_RE.search(original):
         if not row['Notes']:
             row['Notes'] = 'Kooky Cooke'
         else:
             row['Notes'] = row['Notes'] + '; Kooky Cooke'
     
     # Detect i/Data for Cooke lenses
-    if row['Manufacturer'] and 'Cooke' in row['Manufacturer'] and re.search(r'i/Data|iData', original, re.I):
+    if row['Manufacturer'] and 'Cooke' in row['Manufacturer'] and IDATA_RE.search(original):
         row['i/Data'] = 'Yes'
 
 
@@ -375,107 +423,7 @@ def parse_line(line: str) -> Dict[str, str]:
     # ---------------------------------------------------------------
     # Capture any leftover descriptive text into notes
     # ---------------------------------------------------------------
-    residual = original
-    
-    # Remove all detected components systematically
-    components_to_remove = []
-    
-    # Add manufacturer
-    if row['Manufacturer']:
-        components_to_remove.append(row['Manufacturer'])
-    
-    # Add series
-    if row['Series']:
-        components_to_remove.append(row['Series'])
-    
-    # Add focal length
-    if row['Focal Length']:
-        components_to_remove.append(row['Focal Length'])
-    
-    # Add T-stop
-    if row['T-Stop']:
-        components_to_remove.append(f"T{row['T-Stop']}")
-    
-    # Add anamorphic squeeze factor
-    if row['Anamorphic Squeeze Factor']:
-        components_to_remove.append(row['Anamorphic Squeeze Factor'])
-    
-    # Add format keywords (but preserve focal length patterns)
-    for format_key in FORMAT_KEYWORDS:
-        if not re.match(r'^\d+mm$', format_key, re.I):  # Skip simple focal length patterns
-            components_to_remove.append(format_key)
-    
-    # Add mount keywords
-    for mount_key in MOUNT_KEYWORDS:
-        components_to_remove.append(mount_key)
-    
-    # Add anamorphic/spherical keywords
-    for anamorphic_key in ANAMORPHIC_KEYWORDS:
-        components_to_remove.append(anamorphic_key)
-    
-    # Add housing manufacturers
-    for housing_mfg in HOUSING_MANUFACTURERS:
-        components_to_remove.append(housing_mfg)
-    
-    # Add flag tokens
-    for token in EXTRA_FLAGS.keys():
-        components_to_remove.append(token)
-    
-    # Remove all components from residual text
-    for component in components_to_remove:
-        # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(component) + r'\b'
-        residual = re.sub(pattern, '', residual, flags=re.I)
-    
-    # Remove mount patterns with parentheses
-    for mount_key in MOUNT_KEYWORDS:
-        mount_pattern = r'\(?\s*' + re.escape(mount_key) + r'\s*\)?'
-        residual = re.sub(mount_pattern, '', residual, flags=re.I)
-    
-    # Remove anamorphic squeeze factors
-    residual = re.sub(r'\d+(?:\.\d+)?\s*x', '', residual, flags=re.I)
-    
-    # Remove i/Data patterns
-    residual = re.sub(r'i/Data|iData', '', residual, flags=re.I)
-    
-    # Remove Leitz/Leica series patterns
-    residual = re.sub(r'Summilux-C|Summilux C', '', residual, flags=re.I)
-    residual = re.sub(r'Summicron-C|Summicron C', '', residual, flags=re.I)
-    residual = re.sub(r'Cine', '', residual, flags=re.I)
-    # Only remove "R" if it's a Leitz/Leica lens
-    if row['Manufacturer'] and ('Leitz' in row['Manufacturer'] or 'Leica' in row['Manufacturer']):
-        residual = re.sub(r'Leica-R|R', '', residual, flags=re.I)
-    
-    # Remove the detected focal length from residual text
-    if row['Focal Length']:
-        # Remove the exact focal length that was detected
-        residual = re.sub(re.escape(row['Focal Length']), '', residual, flags=re.I)
-        
-        # For zoom lenses, also remove the individual focal lengths
-        if '-' in row['Focal Length']:
-            # Extract the two focal lengths from the range
-            parts = row['Focal Length'].split('-')
-            if len(parts) == 2:
-                first_fl = parts[0].replace('mm', '')
-                second_fl = parts[1].replace('mm', '')
-                # Remove both individual focal lengths
-                residual = re.sub(r'\b' + re.escape(first_fl) + r'\b', '', residual, flags=re.I)
-                residual = re.sub(r'\b' + re.escape(second_fl) + r'\b', '', residual, flags=re.I)
-                # Also remove with mm suffix
-                residual = re.sub(r'\b' + re.escape(first_fl) + r'mm\b', '', residual, flags=re.I)
-                residual = re.sub(r'\b' + re.escape(second_fl) + r'mm\b', '', residual, flags=re.I)
-        
-        # Also remove the focal length without "mm" suffix if it was added
-        focal_without_mm = row['Focal Length'].replace('mm', '')
-        if focal_without_mm != row['Focal Length']:
-            residual = re.sub(re.escape(focal_without_mm), '', residual, flags=re.I)
-    
-    # Clean up common separators and formatting
-    residual = re.sub(r'[\s\-_,;]+', ' ', residual)  # Replace separators with single space
-    residual = residual.replace('(', '').replace(')', '')
-    residual = residual.replace('[', '').replace(']', '')
-    residual = residual.replace('+', ' ')
-    residual = clean_text(residual)
+    residual = residual_notes(original, row, keywords)
 
     # Add any remaining text to notes
     if residual:
@@ -487,29 +435,100 @@ def parse_line(line: str) -> Dict[str, str]:
     return row
 
 
-def main(input_path: Path, output_path: Path):
-    # Check if output file already exists and delete it
-    if output_path.exists():
-        output_path.unlink()
-        print(f"Deleted existing file: {output_path}")
-    
-    rows: List[Dict[str, str]] = []
-    with input_path.open(encoding='utf-8') as f:
-        for line in f:
-            parsed = parse_line(line)
-            # Skip completely blank rows
-            if any(parsed.values()):
-                rows.append(parsed)
-
-    with output_path.open('w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=HEADERS)
+def _parse_chunk(lines: List[str]) -> List[Dict[str, str]]:
+    """Parsed non-blank rows of a chunk of lines (process-pool worker)"""
+    return [row for row in map(parse_line, lines) if any(row.values())]
+
+
+def parse_lines(lines: Iterable[str], jobs: int = 1,
+                chunk_lines: int = CHUNK_LINES) -> Iterator[Dict[str, str]]:
+    """
+    Parsed rows of ``lines`` in input order, skipping completely blank rows.
+    With ``jobs`` > 1 chunks of ``chunk_lines`` lines are parsed on a process
+    pool; at most two chunks per worker are read ahead, so memory stays
+    bounded however long the input is.
+    """
+    if jobs <= 1:
+        for line in lines:
+            row = parse_line(line)
+            if any(row.values()):
+                yield row
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    lines = iter(lines)
+    pending: Deque = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while True:
+            while len(pending) < jobs * 2:
+                chunk = list(islice(lines, chunk_lines))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_parse_chunk, chunk))
+            if not pending:
+                break
+            yield from pending.popleft().result()
+
+
+@contextmanager
+def open_output(output_path: Path) -> Iterator[TextIO]:
+    """
+    Text stream for the output CSV: stdout for "-", otherwise a temporary
+    file beside ``output_path`` that replaces it only once everything has
+    been written (a failed run leaves the previous output untouched).
+    """
+    if str(output_path) == '-':
+        out = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', newline='')
+        try:
+            yield out
+        finally:
+            out.flush()
+            out.detach()
+        return
+
+    tmp_path = output_path.with_name(f'.{output_path.name}.{os.getpid()}.tmp')
+    try:
+        with tmp_path.open('w', newline='', encoding='utf-8') as out:
+            yield out
+        os.replace(tmp_path, output_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def main(input_path: Path, output_path: Path, jobs: int = 1) -> int:
+    """
+    Parse ``input_path`` into ``output_path`` row by row ("-" for
+    stdin / stdout).  Returns the number of rows written.
+    """
+    if str(input_path) == '-':
+        src = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+    else:
+        src = input_path.open(encoding='utf-8')
+
+    count = 0
+    with src, open_output(output_path) as out:
+        writer = csv.DictWriter(out, fieldnames=HEADERS)
         writer.writeheader()
-        writer.writerows(rows)
+        for row in parse_lines(src, jobs=jobs):
+            writer.writerow(row)
+            count += 1
 
-    print(f"Parsed {len(rows)} raw lenses → {output_path}")
+    # Keep stdout clean when it carries the CSV
+    report = sys.stderr if str(output_path) == '-' else sys.stdout
+    print(f"Parsed {count} raw lenses → {output_path}", file=report)
+    return count
 
 
 if __name__ == '__main__':
-    inp = Path(sys.argv[1]) if len(sys.argv) > 1 else INPUT_DEFAULT
-    outp = Path(sys.argv[2]) if len(sys.argv) > 2 else OUTPUT_DEFAULT
-    main(inp, outp) 
\ No newline at end of file
+    import argparse
+
+    cli = argparse.ArgumentParser(description="Explode ESC Raw Lenses.csv into the 36-column layout")
+    cli.add_argument('input', nargs='?', type=Path, default=INPUT_DEFAULT,
+                     help='one lens name per line ("-" for stdin)')
+    cli.add_argument('output', nargs='?', type=Path, default=OUTPUT_DEFAULT,
+                     help='36-column CSV to write ("-" for stdout)')
+    cli.add_argument('--jobs', type=int, default=1, help="worker processes (default 1)")
+    args = cli.parse_args()
+    main(args.input, args.output, jobs=args.jobs)
@@ -19,14 +19,23 @@ Usage:
     # Specify another folder
     python3 format_lens_sheet.py /path/to/folder
 
+    # Four worker processes, with a per-file row count and timing
+    python3 format_lens_sheet.py --jobs 4 --report
+
+Files are read in sorted filename order; with --jobs each one is processed
+on its own worker and the rows are still written in that order, so the
+output doesn't depend on the number of jobs.
+
 Outputs a single CSV called `Flattened_Lens_Inventory.csv` in the script's
 directory.
 """
 import csv
 import sys
-import re
+import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from lens_regex import HEADER_NORM_RE, MACRO_WORD_RE, NOT_IN_INVENTORY_RE
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -53,50 +62,88 @@ TOTAL_COLS = len(HEADERS)
 # ---------------------------------------------------------------------------
 
 def looks_like_section_header(row: List[str]) -> bool:
+    # One lowercase pass over the whole row rules out data rows, which
+    # rarely mention both words; only the rest are checked cell by cell
+    joined = '\x00'.join(row).lower()
+    if 'focal' not in joined or 'length' not in joined:
+        return False
     return any('focal' in cell.lower() and 'length' in cell.lower() for cell in row)
 
 
 # Normalise header strings for matching
 def norm(s: str) -> str:
-    return re.sub(r'[^a-z0-9]', '', s.lower())
+    return HEADER_NORM_RE.sub('', s.lower())
+
+
+# Normalised section-header spellings -> master header, tried before HEADERS
+HEADER_ALIASES: Dict[str, str] = {
+    # T-Stop variations
+    'tstop': 'T-Stop',
+    't': 'T-Stop',
+    'minstop': 'T-Stop',
+    'maxstop': 'T-Stop',
+    # Focal length synonyms already match
+    # Weight column
+    'weightlbs': 'Weight (lbs)',
+    'weight': 'Weight (lbs)',
+    # Length column
+    'lengthin': 'Length (in)',
+    # Front diameter
+    'frontdiameter': 'Front Diameter (mm)',
+    'frontdiametermm': 'Front Diameter (mm)',
+    # Image circle
+    'imagecirclemm': 'Image Circle (mm)',
+    # format alias such as imagecircle, format etc handled
+}
+
+
+class HeaderResolver:
+    """
+    Section-header row -> {column index: master header}.  The alias and
+    normalised master-header tables are built once, and each distinct
+    header row is resolved once: the same section headers repeat across the
+    sheets in "To Be Parsed".  At most ``cache_size`` rows are kept.
+    """
+
+    def __init__(self, headers: List[str], aliases: Dict[str, str], cache_size: int = 1024):
+        self.aliases = dict(aliases)
+        self.cache_size = cache_size
+        self.normalized_master = {norm(h): h for h in headers}
+        self._cache: Dict[Tuple[str, ...], Dict[int, str]] = {}
+
+    def resolve(self, row: List[str]) -> Dict[int, str]:
+        """Column mapping for ``row`` (shared between calls - don't modify it)"""
+        key = tuple(row)
+        mapping = self._cache.get(key)
+        if mapping is None:
+            mapping = self._build(row)
+            if len(self._cache) < self.cache_size:
+                self._cache[key] = mapping
+        return mapping
+
+    def _build(self, row: List[str]) -> Dict[int, str]:
+        mapping: Dict[int, str] = {}
+        used = set()
+        for idx, cell in enumerate(row):
+            n = norm(cell)
+            # Alias handling first; each master header goes to its first column
+            header = self.aliases.get(n)
+            if header is None or header in used:
+                # Direct match to master headers using normalized form
+                header = self.normalized_master.get(n)
+                if header is None or header in used:
+                    continue
+            mapping[idx] = header
+            used.add(header)
+        return mapping
+
+
+HEADER_RESOLVER = HeaderResolver(HEADERS, HEADER_ALIASES)
 
 
 # Build mapping from column index to master header
 def build_header_map(row: List[str]) -> Dict[int, str]:
-    mapping: Dict[int, str] = {}
-    alias_map = {
-        # T-Stop variations
-        'tstop': 'T-Stop',
-        't': 'T-Stop',
-        'minstop': 'T-Stop',
-        'maxstop': 'T-Stop',
-        # Focal length synonyms already match
-        # Weight column
-        'weightlbs': 'Weight (lbs)',
-        'weight': 'Weight (lbs)',
-        # Length column
-        'lengthin': 'Length (in)',
-        # Front diameter
-        'frontdiameter': 'Front Diameter (mm)',
-        'frontdiametermm': 'Front Diameter (mm)',
-        # Image circle
-        'imagecirclemm': 'Image Circle (mm)',
-        # format alias such as imagecircle, format etc handled
-    }
-
-    normalized_master = {norm(h): h for h in HEADERS}
-    for idx, cell in enumerate(row):
-        n = norm(cell)
-        # Alias handling first
-        if n in alias_map and alias_map[n] not in mapping.values():
-            mapping[idx] = alias_map[n]
-            continue
-
-        # Direct match to master headers using normalized form
-        if n in normalized_master and normalized_master[n] not in mapping.values():
-            mapping[idx] = normalized_master[n]
-            continue
-    return mapping
+    return HEADER_RESOLVER.resolve(row)
 
 
 def pad(row: List[str], size: int) -> List[str]:
@@ -169,7 +216,7 @@ def process_csv(path: Path, collector: List[Dict[str, str]]):
             # Macro handling in focal length
             focal_str = record['Focal Length']
             if focal_str and 'macro' in focal_str.lower():
-                cleaned = re.sub(r'(?i)\bmacro\b', '', focal_str).strip()
+                cleaned = MACRO_WORD_RE.sub('', focal_str).strip()
                 record['Focal Length'] = cleaned
                 if 'Macro' not in record['Notes']:
                     record['Notes'] = (record['Notes'] + '; ' if record['Notes'] else '') + 'Macro'
@@ -181,7 +228,7 @@ def process_csv(path: Path, collector: List[Dict[str, str]]):
 
             # Clean not in inventory
             if record['Notes']:
-                record['Notes'] = re.sub(r'(?i)\bnot\s+(?:currently\s+)?in\s+inventory\b', '', record['Notes']).strip().strip(',;')
+                record['Notes'] = NOT_IN_INVENTORY_RE.sub('', record['Notes']).strip().strip(',;')
 
             # Apply file-level defaults if fields are empty
             if not record['Anamorphic / Spherical']:
@@ -192,29 +239,80 @@ def process_csv(path: Path, collector: List[Dict[str, str]]):
 
             collector.append(record)
 
+def _process_file(path: Path) -> Tuple[List[List[str]], float]:
+    """One file's rows (cells in HEADERS order) and the seconds taken (pool worker)"""
+    start = time.perf_counter()
+    records: List[Dict[str, str]] = []
+    process_csv(path, records)
+    rows = [[record[h] for h in HEADERS] for record in records]
+    return rows, time.perf_counter() - start
+
+
+def process_files(paths: List[Path], jobs: int = 1) -> Iterator[Tuple[Path, List[List[str]], float]]:
+    """
+    (path, rows, seconds) for each file, in the order given.  With ``jobs``
+    > 1 the files are processed on a process pool, one file per task.
+    """
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield (path,) + _process_file(path)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+        for path, (rows, seconds) in zip(paths, pool.map(_process_file, paths)):
+            yield path, rows, seconds
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main(folder: Path):
+def main(folder: Path, jobs: int = 1, report: bool = False):
+    """
+    Flatten every CSV in ``folder`` (sorted by name) into OUTPUT_FILE.
+    ``jobs`` worker processes handle one file each; the output is the same
+    as with one.  ``report`` prints each file's row count and time.
+    """
     if not folder.exists() or not folder.is_dir():
         sys.exit(f"Folder not found: {folder}")
 
-    all_rows: List[Dict[str, str]] = []
     csv_files = sorted(folder.glob('*.csv'))
     if not csv_files:
         sys.exit(f"No CSV files found in {folder}")
 
-    for csv_path in csv_files:
-        process_csv(csv_path, all_rows)
+    start = time.perf_counter()
+    all_rows: List[List[str]] = []
+    timings: List[Tuple[str, int, float]] = []
+    for csv_path, rows, seconds in process_files(csv_files, jobs=jobs):
+        all_rows.extend(rows)
+        timings.append((csv_path.name, len(rows), seconds))
 
     with OUTPUT_FILE.open('w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=HEADERS)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
         writer.writerows(all_rows)
+    elapsed = time.perf_counter() - start
+
+    if report:
+        width = max(len(name) for name, _, _ in timings)
+        print(f"{'file':<{width}} {'rows':>7} {'ms':>9}")
+        for name, count, seconds in timings:
+            print(f"{name:<{width}} {count:>7} {seconds * 1000:>9.1f}")
+        busy = sum(seconds for _, _, seconds in timings)
+        print(f"{'total':<{width}} {len(all_rows):>7} {busy * 1000:>9.1f}"
+              f"  ({elapsed * 1000:.1f} ms wall, {jobs} job(s))")
 
     print(f"Flattened {len(all_rows)} rows from {len(csv_files)} CSV(s) → {OUTPUT_FILE}")
 
 if __name__ == '__main__':
-    target_folder = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FOLDER
-    main(target_folder) 
\ No newline at end of file
+    import argparse
+
+    cli = argparse.ArgumentParser(description="Flatten the lens sheets in a folder into one CSV")
+    cli.add_argument('folder', nargs='?', type=Path, default=DEFAULT_FOLDER,
+                     help='folder of *.csv sheets (default "To Be Parsed")')
+    cli.add_argument('--jobs', type=int, default=1, help="worker processes, one file each (default 1)")
+    cli.add_argument('--report', action='store_true', help="print each file's row count and time")
+    args = cli.parse_args()
+    main(args.folder, jobs=args.jobs, report=args.report)
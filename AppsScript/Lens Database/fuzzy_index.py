@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Index
+-----------
+Bounded-edit-distance lookup of misspelt manufacturer and series names
+("Angeneiux", "Cook") for the cases where no alias occurs verbatim in a lens
+name.
+
+Every alias is filed in an inverted index under its character bigrams
+(padded with ``^``/``$`` so word edges count).  A query only scores the
+aliases it shares bigrams with, and an edit can destroy at most a few of
+them (q-gram lemma), so aliases sharing too few bigrams - or differing too
+much in length - are discarded without computing a distance.  The survivors
+are checked with an optimal string alignment distance (Levenshtein plus
+adjacent transpositions: "angeneiux" is one edit from "angenieux") that stops
+as soon as the bound is exceeded.
+
+``FuzzyIndex`` keeps such indexes per alias table and queries the word
+n-grams of a name.  Most names have no misspelling, so the n-grams are
+prefiltered before any search.  Only n-grams holding a suspect word - one
+no table knows that isn't a measurement ("50mm", "t2.8") - are considered,
+so names made of known words skip the fallback outright.  A typo keeps its
+first letter, so each table is split by initial, and an n-gram is only
+searched when its initial's aliases hold enough of its bigrams to reach the
+bound.  Aliases are also filed with doubled letters collapsed ("zeis" for
+"zeiss"), the commonest slip ("zies", "angeniieux").  Results are memoised
+per n-gram, with hit-rate / latency counters (``info``).
+"""
+import re
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Characters stripped from the ends of each whitespace-separated word
+WORD_PUNCTUATION = '.,;:()[]"\'-'
+
+# Memoised n-grams kept per category before the memo is cleared
+MEMO_LIMIT = 100_000
+
+DOUBLED_LETTER_RE = re.compile(r'([a-z])\1+')
+
+# Focal lengths, stops and ratios ("50mm", "24-290", "t2.8", "f1.4", "1.8x"):
+# read by the regex extractors, never a misspelt name
+MEASUREMENT_RE = re.compile(r'[tf]?\d[\d.,/x-]*(?:mm)?')
+
+
+class FuzzyHit(NamedTuple):
+    query: str
+    key: str
+    alias: str
+    distance: int
+    rank: int
+
+
+def osa_distance(a: str, b: str, bound: int) -> int:
+    """Optimal string alignment distance of ``a`` and ``b``, or ``bound + 1`` once it exceeds ``bound``."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        row = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            best = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb and prev2[j - 2] + 1 < best:
+                best = prev2[j - 2] + 1
+            row[j] = best
+        if min(row) > bound:
+            return bound + 1
+        prev2, prev = prev, row
+    return min(prev[-1], bound + 1)
+
+
+def max_distance(gram: str) -> int:
+    """Edits allowed for an n-gram (0: too short to guess).
+
+    Single words of 7+ characters may be two edits off; shorter words and
+    multi-word n-grams only one.
+    """
+    if len(gram) < 4:
+        return 0
+    return 2 if len(gram) >= 7 and ' ' not in gram else 1
+
+
+def is_subsequence(short: str, long: str) -> bool:
+    letters = iter(long)
+    return all(ch in letters for ch in short)
+
+
+def plausible_typo(gram: str, alias: str) -> bool:
+    """Extra checks on a candidate within the distance bound.
+
+    Typos rarely hit the first letter, so it must match.  Four-letter words
+    are too easy to hit by accident: they only count as the alias with one
+    letter dropped ("cook") or two letters swapped, not substituted ("lomb").
+    """
+    if alias[0] != gram[0]:
+        return False
+    if len(gram) < 5:
+        return sorted(gram) == sorted(alias) or (len(alias) > len(gram) and is_subsequence(gram, alias))
+    return True
+
+
+def name_words(text: str) -> List[str]:
+    """Whitespace-separated words of ``text`` with WORD_PUNCTUATION stripped from their ends"""
+    return [word for word in (w.strip(WORD_PUNCTUATION) for w in text.split()) if word]
+
+
+def squeeze(text: str) -> str:
+    """``text`` with runs of a repeated letter collapsed (digits are kept: "s2000")"""
+    return DOUBLED_LETTER_RE.sub(r'\1', text)
+
+
+def bigrams(text: str) -> Set[str]:
+    padded = '^' + text + '$'
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class NGramIndex:
+    """Inverted bigram index over strings, each carrying a payload."""
+
+    def __init__(self, items: Iterable[Tuple[str, object]] = ()):
+        self.words: List[str] = []
+        self.gram_counts: List[int] = []
+        self.payloads: List[object] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        for word, payload in items:
+            self.add(word, payload)
+        self.postings = dict(self.postings)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def add(self, word: str, payload: object) -> None:
+        index = len(self.words)
+        grams = bigrams(word)
+        self.words.append(word)
+        self.gram_counts.append(len(grams))
+        self.payloads.append(payload)
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(index)
+
+    def may_match(self, query: str, limit: int) -> bool:
+        """False when no word can be within ``limit`` edits of ``query``.
+
+        A cheap bound, not a search: the words a long enough query matches
+        share at least ``len(bigrams) - 3 * limit`` of its bigrams, so the
+        index's bigrams together must hold that many.
+        """
+        query_grams = bigrams(query)
+        needed = len(query_grams) - 3 * limit
+        if needed <= 0:
+            return bool(self.words)
+        postings = self.postings
+        return sum(gram in postings for gram in query_grams) >= needed
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, str, object]]:
+        """``(distance, word, payload)`` for every word within ``limit`` edits of ``query``."""
+        query_grams = bigrams(query)
+        shared: Dict[int, int] = defaultdict(int)
+        if len(query_grams) <= 3 * limit:
+            # Short enough to match without sharing a bigram: every word is a candidate
+            shared.update(dict.fromkeys(range(len(self.words)), 0))
+        for gram in query_grams:
+            for index in self.postings.get(gram, ()):
+                shared[index] += 1
+        found = []
+        for index, count in shared.items():
+            # Each edit (a transposition counts as one) breaks at most 3 bigrams
+            if count < max(len(query_grams), self.gram_counts[index]) - 3 * limit:
+                continue
+            word = self.words[index]
+            distance = osa_distance(query, word, limit)
+            if distance <= limit:
+                found.append((distance, word, self.payloads[index]))
+        return found
+
+
+class FuzzyIndex:
+    """Bounded-distance alias lookup over several alias tables.
+
+    ``tables`` are ``{category: {canonical: [alias, ...]}}`` like the
+    AliasAutomaton's; canonical names are indexed alongside their aliases,
+    and both with doubled letters collapsed.  ``indexes[category]`` maps an
+    initial to the NGramIndex of that category's aliases starting with it.
+    ``vocabulary`` lists words that are never treated as misspellings (every
+    alias the exact matcher knows, of any category).  In the
+    ``no_truncation`` categories an n-gram that merely starts an alias is not
+    a hit: "panchro" names the series family, it is not a typo of "panchroi".
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, Iterable[str]]], vocabulary: Iterable[str] = (),
+                 no_truncation: Iterable[str] = ()):
+        self.indexes: Dict[str, Dict[str, NGramIndex]] = {}
+        self.max_words: Dict[str, int] = {}
+        self.alias_words: Dict[str, Set[str]] = {}
+        for category, table in tables.items():
+            entries: Dict[str, Tuple[str, int]] = {}
+            rank = 0
+            for key, aliases in table.items():
+                for alias in [key] + list(aliases):
+                    if alias and alias not in entries:
+                        entries[alias] = (key, rank)
+                    rank += 1
+            for alias, entry in list(entries.items()):
+                entries.setdefault(squeeze(alias), entry)
+            by_initial: Dict[str, List[Tuple[str, Tuple[str, int]]]] = defaultdict(list)
+            for alias, entry in entries.items():
+                by_initial[alias[0]].append((alias, entry))
+            self.indexes[category] = {initial: NGramIndex(items) for initial, items in by_initial.items()}
+            self.max_words[category] = max((len(alias.split()) for alias in entries), default=1)
+            self.alias_words[category] = {word for alias in entries for word in alias.split()}
+        self.no_truncation = frozenset(no_truncation)
+        self.vocabulary: Set[str] = set()
+        for phrase in vocabulary:
+            self.vocabulary.add(phrase)
+            self.vocabulary.update(phrase.split())
+        self.reset_stats()
+
+    def __getstate__(self):
+        # Snapshots keep the indexes, not one run's memo and counters
+        state = dict(self.__dict__)
+        state['_memo'] = {category: {} for category in self.indexes}
+        state['_suspects'] = {}
+        state['stats'] = {name: 0 for name in self.stats}
+        return state
+
+    def reset_stats(self) -> None:
+        self._memo: Dict[str, Dict[str, Optional[FuzzyHit]]] = {category: {} for category in self.indexes}
+        self._suspects: Dict[str, bool] = {}
+        self.stats = {'lookups': 0, 'hits': 0, 'ngrams': 0, 'seconds': 0.0}
+
+    def info(self) -> Dict[str, float]:
+        """Lookup/hit counters plus the hit rate and mean lookup latency."""
+        lookups = self.stats['lookups']
+        return dict(self.stats,
+                    hit_rate=self.stats['hits'] / lookups if lookups else 0.0,
+                    mean_ms=self.stats['seconds'] * 1000 / lookups if lookups else 0.0)
+
+    def is_suspect(self, word: str) -> bool:
+        """True for a word (see name_words) no table knows, with a letter, not a measurement"""
+        suspects = self._suspects
+        suspect = suspects.get(word)
+        if suspect is None:
+            suspect = (word not in self.vocabulary and not MEASUREMENT_RE.fullmatch(word)
+                       and any(ch.isalpha() for ch in word))
+            if len(suspects) >= MEMO_LIMIT:
+                suspects.clear()
+            suspects[word] = suspect
+        return suspect
+
+    def ngrams(self, text: str, category: str) -> List[str]:
+        """Word n-grams of ``text`` worth a fuzzy lookup in ``category``.
+
+        Unknown n-grams of 4+ characters holding a suspect word (unknown,
+        with a letter, not a measurement), and only those some ``category``
+        alias with the same initial could be close to.  One edit changes at
+        most two adjacent words, so every other word of a multi-word n-gram
+        must be a word of some alias; the rest is NGramIndex.may_match.
+        Memoised n-grams pass when they were a hit; the prefilter's
+        rejections are memoised as misses.
+        """
+        words = name_words(text)
+        count = len(words)
+        # next_suspect[i]: first suspect word at or after i; strangers[i]:
+        # words before i that are in no alias; pairs[i]: of those, adjacent pairs
+        next_suspect = [count] * (count + 1)
+        for i in range(count - 1, -1, -1):
+            next_suspect[i] = i if self.is_suspect(words[i]) else next_suspect[i + 1]
+        if next_suspect[0] == count:
+            return []
+        alias_words = self.alias_words[category]
+        strangers = [0] * (count + 1)
+        pairs = [0] * (count + 1)
+        for i, word in enumerate(words):
+            stranger = word not in alias_words
+            strangers[i + 1] = strangers[i] + stranger
+            pairs[i + 1] = pairs[i] + (stranger and i > 0 and words[i - 1] not in alias_words)
+        partitions = self.indexes[category]
+        memo = self._memo[category]
+        grams = []
+        for size in range(1, self.max_words[category] + 1):
+            for i in range(count - size + 1):
+                end = i + size
+                if next_suspect[i] >= end:
+                    continue
+                if size > 1:
+                    outside = strangers[end] - strangers[i]
+                    if outside > 2 or (outside == 2 and pairs[end] == pairs[i + 1]):
+                        continue
+                gram = ' '.join(words[i:i + size])
+                if gram in memo:
+                    if memo[gram] is not None:
+                        grams.append(gram)
+                    continue
+                limit = max_distance(gram)
+                if not limit or gram in self.vocabulary:
+                    continue
+                index = partitions.get(gram[0])
+                if index is not None and index.may_match(gram, limit):
+                    grams.append(gram)
+                else:
+                    self._remember(category, gram, None)
+        return grams
+
+    def _remember(self, category: str, gram: str, hit: Optional[FuzzyHit]) -> None:
+        memo = self._memo[category]
+        if len(memo) >= MEMO_LIMIT:
+            memo.clear()
+        memo[gram] = hit
+
+    def _lookup_gram(self, category: str, gram: str) -> Optional[FuzzyHit]:
+        memo = self._memo[category]
+        if gram in memo:
+            return memo[gram]
+        self.stats['ngrams'] += 1
+        best = None
+        truncation_ok = category not in self.no_truncation
+        for distance, alias, (key, rank) in self.indexes[category][gram[0]].search(gram, max_distance(gram)):
+            if not plausible_typo(gram, alias) or (not truncation_ok and alias.startswith(gram)):
+                continue
+            hit = FuzzyHit(gram, key, alias, distance, rank)
+            if best is None or (distance, -len(alias), rank) < (best.distance, -len(best.alias), best.rank):
+                best = hit
+        self._remember(category, gram, best)
+        return best
+
+    def lookup(self, category: str, text: str) -> Optional[FuzzyHit]:
+        """Closest ``category`` alias to any n-gram of ``text`` (preprocessed, lowercase).
+
+        Ties go to the longer alias, then the earlier table entry.
+        """
+        start = time.perf_counter()
+        best = None
+        for gram in self.ngrams(text, category):
+            hit = self._lookup_gram(category, gram)
+            if hit and (best is None or (hit.distance, -len(hit.alias), hit.rank)
+                        < (best.distance, -len(best.alias), best.rank)):
+                best = hit
+        self.stats['lookups'] += 1
+        self.stats['hits'] += best is not None
+        self.stats['seconds'] += time.perf_counter() - start
+        return best
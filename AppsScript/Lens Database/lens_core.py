@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Lens Core
+---------
+One extraction per lens name, with the 36-column ESC layout and the
+ParsedLens layout as projections of it.
+
+``LensCore.parse(name)`` reads the name once into a LensResult: the
+SimpleLensParser readings (alias dictionaries, special-case rules, token
+stream, confidence) plus the few things only the ESC sheet records - the
+LDS / i/Data flags and the ESC notes (flag words, "Kooky Cooke" and the
+text left once every reading is removed, as esc_raw_lense_parse computes
+them).  esc's keyword lists ride in the parser's alias automaton
+(``SimpleLensParser.share_scan``), so the one scan of the name serves both.
+
+``LensResult.parsed_lens()`` and ``LensResult.esc_row()`` only re-spell
+the shared readings, so the two layouts always agree: a focal length of
+"50" is "50mm" in the ESC row ("24-70" is "24mm-70mm"), a T-stop of "T1.3"
+is "1.3", and the ESC defaults stand in for a blank mount ("PL") or housing
+("Original Housing").  The ESC rows therefore follow SimpleLensParser's
+reading of each name, which can differ from what esc_raw_lense_parse's own
+rules give.
+
+Usage:
+    python3 lens_core.py [input_csv] [--esc OUT] [--parsed OUT]
+Input is one lens name per line, as for esc_raw_lense_parse (default
+"ESC Raw Lenses.csv"); blank lines are skipped in both outputs, so row i
+of one file is row i of the other.
+"""
+import csv
+import sys
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import esc_raw_lense_parse as esc
+from lens_regex import IDATA_RE, KOOKY_COOKE_RE
+
+PROJECT_DIR = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_DIR / "Machine Learning"))
+
+from simple_lens_parser import PARSED_LENS_COLUMNS, ParsedLens, SimpleLensParser  # noqa: E402
+
+# ESC column -> ParsedLens field (the two layouts list the same fields in the same order)
+FIELD_FOR_COLUMN: Dict[str, str] = dict(zip(esc.HEADERS, PARSED_LENS_COLUMNS))
+
+# ESC values standing in for a blank reading
+ESC_DEFAULTS = {'Mount': 'PL', 'Housing': 'Original Housing'}
+
+
+def esc_focal_length(value: str) -> str:
+    """A ParsedLens focal length in ESC spelling ("50" -> "50mm", "24-70" -> "24mm-70mm")"""
+    if not value:
+        return ''
+    if '/' in value:
+        # A chain of ranges ("24-290/26-320") keeps its one unit at the end
+        return value + 'mm'
+    return '-'.join(part + 'mm' for part in value.split('-'))
+
+
+def esc_t_stop(value: str) -> str:
+    """A ParsedLens T-stop in ESC spelling ("T1.3" -> "1.3"; F-stops and N/A unchanged)"""
+    return value[1:] if value.startswith('T') else value
+
+
+@dataclass
+class LensResult:
+    """Everything read from one lens name; the two layouts are projections of it"""
+    lens: ParsedLens
+    esc_notes: str
+
+    @property
+    def original_name(self) -> str:
+        return self.lens.original_name
+
+    def parsed_lens(self) -> ParsedLens:
+        """The name's ParsedLens (fields plus confidence)"""
+        return self.lens
+
+    def esc_row(self) -> Dict[str, str]:
+        """The name's row in the 36-column ESC layout"""
+        row = {column: getattr(self.lens, field) for column, field in FIELD_FOR_COLUMN.items()}
+        row['Focal Length'] = esc_focal_length(row['Focal Length'])
+        row['T-Stop'] = esc_t_stop(row['T-Stop'])
+        for column, default in ESC_DEFAULTS.items():
+            row[column] = row[column] or default
+        row['Notes'] = self.esc_notes
+        return row
+
+
+class LensCore:
+    """One extraction per name (SimpleLensParser plus the ESC-only readings), sharing the keyword scan"""
+
+    def __init__(self, parser: Optional[SimpleLensParser] = None):
+        self.parser = parser or SimpleLensParser.load()
+        self.parser.share_scan(esc.KEYWORDS.tables)
+
+    def parse(self, line: str) -> LensResult:
+        name = line.strip()
+        lens = self.parser.parse_lens_name(name)
+        if not name:
+            return LensResult(lens, '')
+        lowered = name.lower()
+        flags = [label for token, label in esc.EXTRA_FLAGS.items() if token in lowered]
+        # parse_lens_name returns a new ParsedLens on every call
+        if 'LDS' in flags:
+            lens.lds = 'Yes'
+        if 'cooke' in lens.manufacturer.lower() and IDATA_RE.search(name):
+            lens.idata = 'Yes'
+        return LensResult(lens, self.esc_notes(name, lens, [flag for flag in flags if flag != 'LDS']))
+
+    def esc_notes(self, name: str, lens: ParsedLens, flags: List[str]) -> str:
+        """The ESC Notes column for ``name`` read as ``lens``, as esc_raw_lense_parse builds it"""
+        # parse_lens_name's scan of the preprocessed name is the one just
+        # made; esc reads the name as written, so the hits only carry over
+        # when the two are the same text
+        text = self.parser.preprocess_text(name)
+        if text == name.lower():
+            keywords = esc.KEYWORDS.from_hits(name, self.parser.alias_hits(text))
+        else:
+            keywords = esc.KEYWORDS.lookup(name)
+        notes = ['Kooky Cooke'] if KOOKY_COOKE_RE.search(name) else []
+        if flags:
+            notes.append(', '.join(flags))
+        row = {
+            'Manufacturer': lens.manufacturer,
+            'Series': lens.series,
+            'Focal Length': esc_focal_length(lens.focal_length),
+            'T-Stop': esc_t_stop(lens.t_stop),
+            'Anamorphic Squeeze Factor': lens.anamorphic_squeeze,
+        }
+        residual = esc.residual_notes(name, row, keywords)
+        if residual:
+            notes.append(residual)
+        return '; '.join(notes)
+
+    def parse_lines(self, lines: Iterable[str]) -> Iterator[LensResult]:
+        """Results for the non-blank ``lines``, in order; each distinct name is parsed once"""
+        seen: Dict[str, LensResult] = {}
+        for line in lines:
+            name = line.strip()
+            if not name:
+                continue
+            result = seen.get(name)
+            if result is None:
+                result = seen[name] = self.parse(name)
+            yield result
+
+
+def main(input_path: Path, esc_path: Optional[Path], parsed_path: Optional[Path]) -> int:
+    """
+    Read every name of ``input_path`` once and write either or both layouts.
+    Returns the number of names parsed.
+    """
+    core = LensCore()
+    count = 0
+    with ExitStack() as files:
+        src = files.enter_context(input_path.open(encoding='utf-8'))
+        esc_writer = parsed_writer = None
+        if esc_path:
+            esc_writer = csv.DictWriter(files.enter_context(esc_path.open('w', newline='', encoding='utf-8')),
+                                        fieldnames=esc.HEADERS)
+            esc_writer.writeheader()
+        if parsed_path:
+            parsed_writer = csv.writer(files.enter_context(parsed_path.open('w', newline='', encoding='utf-8')),
+                                       lineterminator='\n')
+            parsed_writer.writerow(PARSED_LENS_COLUMNS)
+        for result in core.parse_lines(src):
+            if esc_writer:
+                esc_writer.writerow(result.esc_row())
+            if parsed_writer:
+                parsed_writer.writerow(result.parsed_lens().as_dict().values())
+            count += 1
+
+    print(f"Parsed {count} lens names"
+          + (f" → {esc_path}" if esc_path else "")
+          + (f" → {parsed_path}" if parsed_path else ""))
+    return count
+
+
+if __name__ == '__main__':
+    import argparse
+
+    cli = argparse.ArgumentParser(description="Parse lens names once and write the ESC and ParsedLens layouts")
+    cli.add_argument('input', nargs='?', type=Path, default=esc.INPUT_DEFAULT,
+                     help="one lens name per line")
+    cli.add_argument('--esc', type=Path, help="36-column ESC CSV to write")
+    cli.add_argument('--parsed', type=Path, help="ParsedLens CSV to write")
+    args = cli.parse_args()
+    main(args.input, args.esc, args.parsed)
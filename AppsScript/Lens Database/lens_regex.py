@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+r"""
+Lens Regex Registry
+-------------------
+Compiled regular expressions and keyword lists shared by the Lens Database
+scripts (esc_raw_lense_parse.py, format_lens_sheet.py,
+Final Flatten/nromalize_lens_data.py and Machine Learning/simple_lens_parser.py).
+
+Static patterns are compiled once at import.  Patterns that depend on data
+(an escaped manufacturer name, a unit suffix …) go through
+``compile_pattern`` which caches them; ``cache_info()`` reports the number of
+cache misses so a pattern that is accidentally rebuilt per row shows up as a
+miss count growing with the input.
+
+Patterns run on arbitrary spreadsheet text, so each one is written to match
+in time linear in the input (benchmarks/bench_regex_audit.py fuzzes them).
+An unanchored pattern that opens with a repeated class (``\d+``, ``\s*``)
+is retried from every position of a long run of that class, rescanning the
+rest of the run each time; a ``(?<!\d)`` / ``(?<!\s)`` guard only lets a
+match start where the run starts.  The leftmost match never starts inside
+such a run (the same match extends back over it), so the guard changes
+nothing but the work done.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple, Union
+
+from alias_automaton import AliasAutomaton, AliasHit, first_hit
+
+_CACHE: Dict[Tuple[str, int], Pattern] = {}
+_STATS = {'hits': 0, 'misses': 0}
+
+
+def compile_pattern(pattern: str, flags: int = 0) -> Pattern:
+    """Compiled ``pattern`` from the shared cache (compiling it on first use)."""
+    key = (pattern, flags)
+    compiled = _CACHE.get(key)
+    if compiled is None:
+        _STATS['misses'] += 1
+        compiled = _CACHE[key] = re.compile(pattern, flags)
+    else:
+        _STATS['hits'] += 1
+    return compiled
+
+
+# literal() results by argument, so repeat calls skip re.escape
+_LITERALS: Dict[Tuple[str, int, bool], Pattern] = {}
+
+
+def literal(text: str, flags: int = re.I, word: bool = False) -> Pattern:
+    """Cached pattern for a literal string, optionally wrapped in word boundaries."""
+    key = (text, flags, word)
+    compiled = _LITERALS.get(key)
+    if compiled is None:
+        escaped = re.escape(text)
+        compiled = _LITERALS[key] = compile_pattern(r'\b' + escaped + r'\b' if word else escaped, flags)
+    return compiled
+
+
+def cache_info() -> Dict[str, int]:
+    return {'size': len(_CACHE), 'hits': _STATS['hits'], 'misses': _STATS['misses']}
+
+
+class KeywordAlternation:
+    """Every keyword of a list in one compiled pattern.
+
+    ``first(text)`` returns the earliest *listed* keyword occurring anywhere
+    in ``text`` – the same answer as looping over the list with
+    ``re.search`` and stopping at the first hit, but in one scan.  A
+    lookahead at every position reports the first-listed keyword starting
+    there, so the earliest-listed keyword present is never shadowed.
+    """
+
+    def __init__(self, keywords: Iterable[str], flags: int = re.I):
+        self.keywords: List[str] = list(keywords)
+        body = '|'.join('(' + re.escape(k) + ')' for k in self.keywords)
+        self.pattern = compile_pattern('(?=' + body + ')', flags)
+
+    def first(self, text: str) -> Optional[str]:
+        best = None
+        for match in self.pattern.finditer(text):
+            idx = match.lastindex - 1
+            if best is None or idx < best:
+                best = idx
+                if best == 0:
+                    break
+        return None if best is None else self.keywords[best]
+
+
+def _is_word(ch: str) -> bool:
+    """``\\w`` for one character ('' stands for the edge of the string)."""
+    return ch.isalnum() or ch == '_'
+
+
+class PatternGroup:
+    """Ordered removals run as one unit with a single-scan prefilter.
+
+    Entries are ``(pattern, word, core)``: ``word`` wraps the pattern in
+    ``\\b`` boundaries and ``core`` is a lowercase string every match
+    contains.  One AliasAutomaton scan of the lowercased name finds the cores
+    present, so only patterns that can match are run and the work per name
+    doesn't grow with the number of entries.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Pattern, bool, str]]):
+        self.entries: List[Tuple[Pattern, bool, str]] = list(entries)
+        self._by_core: Dict[str, List[int]] = {}
+        for idx, (_, _, core) in enumerate(self.entries):
+            self._by_core.setdefault(core, []).append(idx)
+        self.automaton = AliasAutomaton({'core': {core: [core] for core in self._by_core}})
+
+    @property
+    def cores(self) -> List[str]:
+        return list(self._by_core)
+
+    def applicable(self, text: str, cores: Optional[Set[str]] = None) -> List[Tuple[Pattern, bool]]:
+        """Entries, in order, whose core occurs in ``text``.
+
+        ``cores`` - the cores already found in ``text`` (see KeywordScan) -
+        saves the scan.
+        """
+        if not text.isascii():
+            # Case-insensitive matching of non-ASCII text doesn't follow
+            # str.lower(); keep every entry
+            return [(pattern, word) for pattern, word, _ in self.entries]
+        if cores is None:
+            cores = {hit.key for hit in self.automaton.scan(text.lower())}
+        by_core = self._by_core
+        present = set()
+        for core in cores:
+            present.update(by_core.get(core, ()))
+        entries = self.entries
+        return [entries[idx][:2] for idx in sorted(present)]
+
+
+class KeywordHits:
+    """Keyword-list lookups for one text, answered from one scan (see KeywordScan)."""
+
+    __slots__ = ('scan', 'text', 'hits')
+
+    def __init__(self, scan: 'KeywordScan', text: str, hits: Optional[List[AliasHit]]):
+        self.scan = scan
+        self.text = text
+        self.hits = hits
+
+    def first(self, name: str) -> Optional[str]:
+        """Earliest listed keyword of list ``name`` occurring in the text"""
+        if self.hits is None:
+            return self.scan.alternation(name).first(self.text)
+        hit = first_hit(self.hits, self.scan.prefix + name)
+        return hit.key if hit else None
+
+    def present(self, name: str) -> Optional[Set[str]]:
+        """Keywords of list ``name`` occurring in the text (None: not known)"""
+        if self.hits is None:
+            return None
+        category = self.scan.prefix + name
+        return {hit.key for hit in self.hits if hit.category == category}
+
+
+class KeywordScan:
+    """Several keyword lists looked up with one AliasAutomaton scan per text.
+
+    ``lookup(text)`` scans the lowercased text once; ``first(name)`` on the
+    result is the same as ``KeywordAlternation(lists[name]).first(text)``.
+    The lists are registered as ``prefix + name`` categories in ``tables``,
+    so a bigger automaton can include them and pass its hits of
+    ``text.lower()`` to ``from_hits`` instead.  Case-insensitive matching of
+    non-ASCII text doesn't follow str.lower(), so such text is answered by
+    the regex alternations.
+    """
+
+    def __init__(self, lists: Dict[str, Union[KeywordAlternation, Iterable[str]]], prefix: str = ''):
+        self.prefix = prefix
+        self._alternations: Dict[str, KeywordAlternation] = {}
+        self.lists: Dict[str, List[str]] = {}
+        for name, keywords in lists.items():
+            if isinstance(keywords, KeywordAlternation):
+                self._alternations[name] = keywords
+                keywords = keywords.keywords
+            self.lists[name] = list(keywords)
+        self.tables = {prefix + name: {keyword: [keyword.lower()] for keyword in keywords}
+                       for name, keywords in self.lists.items()}
+        self.automaton = AliasAutomaton(self.tables)
+
+    def alternation(self, name: str) -> KeywordAlternation:
+        alternation = self._alternations.get(name)
+        if alternation is None:
+            alternation = self._alternations[name] = KeywordAlternation(self.lists[name])
+        return alternation
+
+    def lookup(self, text: str) -> KeywordHits:
+        return KeywordHits(self, text, self.automaton.scan(text.lower()) if text.isascii() else None)
+
+    def from_hits(self, text: str, hits: List[AliasHit]) -> KeywordHits:
+        """Lookups from ``hits``: a scan of ``text.lower()`` by an automaton holding ``tables``"""
+        return KeywordHits(self, text, hits if text.isascii() else None)
+
+
+class SpanMask:
+    """Characters of a string removed by a sequence of ``re.sub(pattern, '')``.
+
+    Matches are found in the original text and recorded as removed spans
+    instead of rebuilding the string after every substitution; ``text()``
+    joins what is left in one pass.  A match overlapping an earlier removal
+    is skipped, and word boundaries are judged against the text that is
+    left, as the sequential substitutions would.  Text that only comes
+    together once something between it is removed is not matched.
+    """
+
+    __slots__ = ('source', 'removed')
+
+    def __init__(self, source: str):
+        self.source = source
+        self.removed = bytearray(len(source))
+
+    def _word_bounded(self, start: int, end: int) -> bool:
+        source, removed = self.source, self.removed
+        before = removed.rfind(0, 0, start)
+        after = removed.find(0, end)
+        return (_is_word(source[before] if before != -1 else '') != _is_word(source[start])
+                and _is_word(source[end - 1]) != _is_word(source[after] if after != -1 else ''))
+
+    def remove(self, pattern: Pattern, word: bool = False) -> None:
+        """Remove every match of ``pattern`` (``\\bpattern\\b`` when ``word``)."""
+        source, removed = self.source, self.removed
+        search = pattern.search
+        pos, limit = 0, len(source)
+        while pos <= limit:
+            match = search(source, pos)
+            if match is None:
+                break
+            start, end = match.span()
+            if start == end or removed.find(1, start, end) != -1 \
+                    or (word and not self._word_bounded(start, end)):
+                pos = start + 1
+                continue
+            removed[start:end] = b'\x01' * (end - start)
+            pos = end
+
+    def remove_group(self, group: PatternGroup, cores: Optional[Set[str]] = None) -> None:
+        for pattern, word in group.applicable(self.source, cores):
+            self.remove(pattern, word)
+
+    def text(self) -> str:
+        removed = self.removed
+        if removed.find(1) == -1:
+            return self.source
+        return ''.join([ch for ch, gone in zip(self.source, removed) if not gone])
+
+
+# ---------------------------------------------------------------------------
+# Keyword lists (ESC flat layout)
+# ---------------------------------------------------------------------------
+SERIES_KEYWORDS = [
+    'Compact Prime CP3', 'Compact Prime CP2', 'Compact Prime',
+    'Master Prime', 'Ultra Prime', 'Super Speed', 'Standard Speed',
+    'S4', 'S4/i', 'S5', 'S7', 'S8', 'Panchro', 'Speed Panchro', 'Varotal',
+    'Summilux C', 'Summicron C', 'Summilux-C', 'Summicron-C', 'Cine'
+]
+
+HOUSING_MANUFACTURERS = [
+    'TLS', 'Ancient Optics', 'GL Optics', 'Optex', 'Whitepoint Optics',
+    'Zero Optik', 'Works Cameras', 'Cinescope'
+]
+
+FORMAT_KEYWORDS = [
+    'FF', '16mm Format', 'S16', 'S35', 'Super 35', 'Full Frame', '65mm Format', 'Large Format',
+    'Super 16', 'Super 35mm'
+]
+
+MOUNT_KEYWORDS = [
+    'LPL Mount', 'XPL Mount', 'PL Mount', 'Canon EF', 'Sony E', 'Nikon Z',
+    'LPL', 'XPL', 'E mount', 'EF Mount', 'Z mount', 'EF', 'E-Mount', 'Z-Mount', 'PL'
+]
+
+ANAMORPHIC_KEYWORDS = [
+    'Anamorphic', 'Spherical'
+]
+
+# ---------------------------------------------------------------------------
+# Combined keyword alternations
+# ---------------------------------------------------------------------------
+FOCAL_LIKE_RE = compile_pattern(r'^\d+mm$', re.I)
+
+SERIES_ALT = KeywordAlternation(SERIES_KEYWORDS)
+HOUSING_ALT = KeywordAlternation(HOUSING_MANUFACTURERS)
+FORMAT_ALT = KeywordAlternation(FORMAT_KEYWORDS)
+# Format keywords that look like a focal length are ignored once one is known
+FORMAT_NON_FOCAL_ALT = KeywordAlternation(k for k in FORMAT_KEYWORDS if not FOCAL_LIKE_RE.match(k))
+MOUNT_ALT = KeywordAlternation(MOUNT_KEYWORDS)
+ANAMORPHIC_ALT = KeywordAlternation(ANAMORPHIC_KEYWORDS)
+
+# Per-keyword patterns for the sequential removals in esc_raw_lense_parse
+FORMAT_KEYWORD_RES = [literal(k) for k in FORMAT_KEYWORDS]
+ANAMORPHIC_KEYWORD_RES = [literal(k) for k in ANAMORPHIC_KEYWORDS]
+HOUSING_KEYWORD_RES = [literal(k) for k in HOUSING_MANUFACTURERS]
+# Mount keyword optionally wrapped in parentheses: "(PL Mount)".  Same
+# matches as r'\(?\s*KEYWORD\s*\)?'; leading whitespace is only taken from
+# the start of its run
+MOUNT_PAREN_RES = [compile_pattern(r'(?:\(\s*|(?<!\s)\s+)?' + re.escape(k) + r'\s*\)?', re.I)
+                   for k in MOUNT_KEYWORDS]
+
+# ---------------------------------------------------------------------------
+# Shared patterns
+# ---------------------------------------------------------------------------
+WHITESPACE_RE = compile_pattern(r'\s+')
+SEPARATORS_RE = compile_pattern(r'[\s\-_,;]+')
+SERIES_SPLIT_RE = compile_pattern(r'[\s\-_,;()]+')
+# Group 1: text of the first "(...)" on a line - r'\((.*?)\)' scanned once per
+# line rather than once per "(" (use the group, the match starts at the line)
+PAREN_NOTE_RE = compile_pattern(r'(?m)^[^(\n]*\(([^)\n]*)\)')
+LEADING_NUMBER_RE = compile_pattern(r'(\d+(?:\.\d+)?)')
+NUMBER_ONLY_RE = compile_pattern(r'^\d+(?:\.\d+)?$')
+
+# Focal length / stops / squeeze
+ZOOM_RANGE_MM_RE = compile_pattern(r'(?<!\d)(\d+(?:\.\d+)?)\s*[-–]\s*(\d+(?:\.\d+)?)\s*mm', re.I)
+FOCAL_MM_RE = compile_pattern(r'(?<!\d)(\d+(?:\.\d+)?)\s*mm', re.I)
+FOCAL_RANGE_RE = compile_pattern(r'(?<!\d)\d+mm?\s*[-–]\s*\d+mm?', re.I)
+LEADING_MM_RE = compile_pattern(r'^\s*mm\s*', re.I)
+T_STOP_RE = compile_pattern(r'T\s*(\d+(?:\.\d+)?)', re.I)
+SQUEEZE_RE = compile_pattern(r'(?<!\d)(\d+(?:\.\d+)?)\s*x', re.I)
+ZOOM_WORD_RE = compile_pattern(r'\bzoom\b', re.I)
+RANGE_TO_16_RE = compile_pattern(r'\d-16$')
+
+# Manufacturer detection after the focal length (ESC flat layout)
+MANUFACTURER_PATTERNS = [
+    compile_pattern(r'\b(Zeiss|Canon|Nikon|Leica|Leitz|Fujinon|Angenieux|Cooke|Schneider|Tokina|Sigma|Tamron|Rokinon|Samyang|Irix|Venus|Mitakon|Meike|7Artisans|Laowa|Voigtländer|Voigtlander|Hawk|Masterbuilt|Caldwell|Xelmus|DZOFilms|Atlas|Tribe7|Kowa|Gecko-Cam|Sony|Panavision|Vantage|Iscorama|Century|Statera|Master|Lomo|V|ARRI|Arri)\b', re.I),
+    compile_pattern(r'\b(ARRI|Arri|Arri)\b', re.I),
+    compile_pattern(r'\b(Zeiss)\b', re.I),
+]
+
+# Series specials
+COOKE_S4I_RE = compile_pattern(r'S4/i', re.I)
+COOKE_S4_RE = compile_pattern(r'S4', re.I)
+COOKE_5I_RE = compile_pattern(r'5i', re.I)
+SUMMILUX_C_RE = compile_pattern(r'Summilux-C|Summilux C', re.I)
+SUMMICRON_C_RE = compile_pattern(r'Summicron-C|Summicron C', re.I)
+CINE_RE = compile_pattern(r'Cine', re.I)
+LEICA_R_WORD_RE = compile_pattern(r'Leica-R|\bR\b', re.I)
+LEICA_R_RE = compile_pattern(r'Leica-R|R', re.I)
+KOOKY_COOKE_RE = compile_pattern(r'Kooky Cooke', re.I)
+IDATA_RE = compile_pattern(r'i/Data|iData', re.I)
+
+# format_lens_sheet.py
+HEADER_NORM_RE = compile_pattern(r'[^a-z0-9]')
+MACRO_WORD_RE = compile_pattern(r'(?i)\bmacro\b')
+NOT_IN_INVENTORY_RE = compile_pattern(r'(?i)\bnot\s+(?:currently\s+)?in\s+inventory\b')
+
+# Final Flatten/nromalize_lens_data.py
+MM_SUFFIX_RE = compile_pattern(r'mm$')
+T_PREFIX_RE = compile_pattern(r'^t')
+WEIGHT_SUFFIX_RE = compile_pattern(r'(?<!\s)\s*lbs?$')
+QUOTES_RE = compile_pattern(r'["\']')
+MM_BEFORE_SPACE_RE = compile_pattern(r'mm(?=\s|$)')
+# Rescans to the end from each "(" that is never closed: substitute only up
+# to the last ")" (nromalize_lens_data.normalize_iris_blade_count)
+PAREN_DESCRIPTION_RE = compile_pattern(r'(?<![\s(])\s*\([^)]*\)')
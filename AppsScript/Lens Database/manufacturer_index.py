@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Manufacturer Index
+------------------
+The manufacturer -> series table shared by the lens parsers, with the
+lookups they need precomputed:
+
+  • series -> manufacturer – the first manufacturer whose list holds the
+    series, as one dict lookup
+  • alias -> manufacturer – every manufacturer alias in one AliasAutomaton,
+    so finding the first-listed manufacturer named anywhere in a lens name
+    is one scan of the name
+  • one KeywordAlternation per manufacturer over its series list (compiled
+    on first use), for the first-listed series named in a lens name
+
+The manufacturer names and aliases live here too (MANUFACTURER_ALIASES,
+with the makers that have no series in the table), so both parsers read one
+table: esc_raw_lense_parse fills blank manufacturer / series cells from
+MANUFACTURER_INDEX (each manufacturer named by itself), and SimpleLensParser
+takes its manufacturer alias dictionary from MANUFACTURER_ALIAS_INDEX
+(``alias_table()``).  REHOUSERS are the manufacturers that rehouse other
+makers' lenses; the parser prefers the lens maker when a name gives both.
+
+Each lookup gives the same answer as walking the table in order with a
+case-insensitive ``re.search`` per entry and stopping at the first hit, but
+its cost depends on the length of the name, not the size of the table.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from alias_automaton import AliasAutomaton, first_hit
+from lens_regex import HOUSING_MANUFACTURERS, KeywordAlternation
+
+# Manufacturer -> series, in lookup order (earlier entries win)
+MANUFACTURER_SERIES: Dict[str, List[str]] = {
+    'Zeiss': ['Master Prime', 'Ultra Prime', 'CP2', 'Supreme Prime', 'CP3', 'Compact Prime CP2', 'Compact Prime CP3', 'Standard Speed', 'Super Speed'],
+    'Canon': ['CN-E Cinema Primes', 'K35', 'K-35'],
+    'Nikon': ['Nikkor Z', 'AI-S Cine-Mod', 'Nikkor'],
+    'Leica': ['Thalia', 'R'],
+    'Leitz': ['Summilux C', 'Summicron C', 'Leitz Prime', 'Hugo', 'R'],
+    'Fujinon': ['MK Series', 'Premista', 'Premier'],
+    'Angenieux': ['Optimo', 'EZ Series', 'HR', 'A-2S'],
+    'Cooke': ['S4/i', 'Anamorphic/i', 'S4', 'S5', 'S7', 'S8', 'Panchro', 'Speed Panchro', 'Varotal'],
+    'Schneider': ['Xenon FF', 'Cine-Xenar III'],
+    'Tokina': ['Vista Primes', 'ATX Cinema'],
+    'Sigma': ['Cine FF High Speed', 'Art Series'],
+    'Tamron': ['SP Series', 'Di Series'],
+    'Rokinon': ['XEEN', 'Cine DS'],
+    'Samyang': ['VDSLR', 'XEEN'],
+    'Irix': ['Cine Series', 'Dragonfly'],
+    'Venus': ['Laowa Cine', 'Zero-D'],
+    'Mitakon': ['Speedmaster', 'Creator'],
+    'Meike': ['Cinema Prime', 'Classic Cine'],
+    '7Artisans': ['Vision Series', 'Photoelectric'],
+    'Laowa': ['Zero-D Cine', 'Probe Lens', 'FF Ranger'],
+    'Voigtländer': ['Nokton', 'APO-Lanthar', 'Heliar', 'Ultra Wide Heliar', 'Super Wide Heliar'],
+    'Voigtlander': ['Nokton', 'APO-Lanthar', 'Heliar', 'Ultra Wide Heliar', 'Super Wide Heliar'],
+    'Hawk': ['V-Lite', 'V-Plus Anamorphic'],
+    'Masterbuilt': ['Masterbuilt Primes', 'Legacy Anamorphic'],
+    'Caldwell': ['Chameleon Anamorphic', 'IBÉ Optics-Caldwell 1.79x', 'Chameleon'],
+    'Xelmus': ['Apollo Anamorphic', 'Helium'],
+    'DZOFilm': ['VESPID Prime', 'Pictor Zoom'],
+    'Atlas': ['Orion Series', 'Mercury Series'],
+    'Tribe7': ['Blackwing7', 'T-Tuned Primes'],
+    'Kowa': ['Anamorphic Prominar', 'Cine Prominar', 'Cine'],
+    'Gecko-Cam': ['Genesis G35'],
+    'Sony': ['G Master', 'CineAlta'],
+    'Panavision': ['Primo', 'Ultra Panatar'],
+    'Vantage': ['Hawk V-Lite', 'Vantage One T1'],
+    'Iscorama': ['Iscorama 36', 'Iscorama 54'],
+    'Century': ['Century Optics Anamorphic', 'Pro Series'],
+    'Statera': ['Statera Primes', 'Statera Macro'],
+    'Master': ['Master Primes', 'Master Anamorphic', 'Master Prime'],
+    'Lomo': ['LOMO Roundfront', 'LOMO Squarefront'],
+    'ARRI': ['Signature Prime', 'Master Prime', 'Ultra Prime'],
+    'Arri': ['Signature Prime', 'Master Prime', 'Ultra Prime']
+}
+
+# Manufacturer -> the spellings that name it in a lens name, where that is
+# more than its own name, then the manufacturers lens names name that have
+# no series in MANUFACTURER_SERIES (lookup order continues after it)
+MANUFACTURER_ALIASES: Dict[str, List[str]] = {
+    'Zeiss': ['Zeiss', 'ARRI/Zeiss', 'ARRI / Zeiss'],
+    'DZOFilm': ['DZOFilm', 'DZOFilms'],
+    'Keslow': ['Keslow', 'Kes-Low'],
+    'Ancient Optics': ['Ancient Optics'],
+    'Zero Optik': ['Zero Optik'],
+    'TLS': ['TLS'],
+    'Optex': ['Optex'],
+    'Infinity': ['Infinity'],
+    'Lindsey': ['Lindsey'],
+    'Petzval': ['Petzval'],
+    'Lensbaby': ['Lensbaby'],
+    'CCI': ['CCI'],
+    'Optika': ['Optika'],
+    'Konica': ['Konica'],
+    'Fuji': ['Fuji'],
+    'Duclos': ['Duclos'],
+    'Swift 960': ['Swift 960'],
+    'Schneider Kreuznach': ['Schneider Kreuznach'],
+    'P+S Technik': ['P+S Technik'],
+    'Astroscope': ['Astroscope'],
+    'Nanmorph': ['Nanmorph'],
+    'Infiniprobe': ['Infiniprobe'],
+    'Rodenstock': ['Rodenstock'],
+    'Kish': ['Kish'],
+    'Scorpio': ['Scorpio'],
+    'Second Reef': ['Second Reef'],
+    'Ironglass': ['Ironglass'],
+    'Lensworks': ['Lensworks'],
+    'Praxis': ['Praxis'],
+}
+
+# Manufacturers that rehouse other makers' glass: a name giving both is
+# the maker's lens in their housing
+REHOUSERS = frozenset(name.lower() for name in HOUSING_MANUFACTURERS)
+
+
+def manufacturer_aliases() -> Dict[str, List[str]]:
+    """Every manufacturer with its aliases, in lookup order"""
+    aliases = {manufacturer: MANUFACTURER_ALIASES.get(manufacturer, [manufacturer])
+               for manufacturer in MANUFACTURER_SERIES}
+    for manufacturer, names in MANUFACTURER_ALIASES.items():
+        aliases.setdefault(manufacturer, names)
+    return aliases
+
+
+class ManufacturerIndex:
+    """Series and alias lookups over a ``{manufacturer: [series, ...]}`` table.
+
+    ``aliases`` (``{manufacturer: [alias, ...]}``) lists the spellings that
+    name each manufacturer in a lens name; by default a manufacturer is
+    named by itself.
+    """
+
+    def __init__(self, series_by_manufacturer: Dict[str, List[str]],
+                 aliases: Optional[Dict[str, Iterable[str]]] = None):
+        self.series_by_manufacturer = series_by_manufacturer
+        if aliases is None:
+            aliases = {manufacturer: [manufacturer] for manufacturer in series_by_manufacturer}
+        self.aliases = {manufacturer: list(names) for manufacturer, names in aliases.items()}
+
+        self.series_manufacturer: Dict[str, str] = {}
+        self.folded_series_manufacturer: Dict[str, str] = {}
+        for manufacturer, series_list in series_by_manufacturer.items():
+            for series in series_list:
+                self.series_manufacturer.setdefault(series, manufacturer)
+                self.folded_series_manufacturer.setdefault(series.casefold(), manufacturer)
+
+        self.alias_manufacturer: Dict[str, str] = {}
+        for manufacturer, names in self.aliases.items():
+            for alias in names:
+                self.alias_manufacturer.setdefault(alias.lower(), manufacturer)
+        self.automaton = AliasAutomaton({'manufacturer': {
+            manufacturer: [alias.lower() for alias in names] for manufacturer, names in self.aliases.items()
+        }})
+        self._alias_alternation: Optional[KeywordAlternation] = None
+        self._series_alternations: Dict[str, KeywordAlternation] = {}
+
+    def manufacturer_for_series(self, series: str, ignore_case: bool = False) -> Optional[str]:
+        """First manufacturer listing exactly ``series`` (in any case with ``ignore_case``)"""
+        if ignore_case:
+            return self.folded_series_manufacturer.get(series.casefold())
+        return self.series_manufacturer.get(series)
+
+    def manufacturer_in(self, text: str) -> Optional[str]:
+        """First-listed manufacturer with an alias anywhere in ``text`` (any case)"""
+        if not text.isascii():
+            # Case-insensitive matching of non-ASCII text doesn't follow
+            # str.lower(); match the aliases as a regex alternation instead
+            if self._alias_alternation is None:
+                self._alias_alternation = KeywordAlternation(
+                    alias for names in self.aliases.values() for alias in names)
+            alias = self._alias_alternation.first(text)
+            return None if alias is None else self.alias_manufacturer[alias.lower()]
+        hit = first_hit(self.automaton.scan(text.lower()), 'manufacturer')
+        return hit.key if hit else None
+
+    def series_in(self, manufacturer: str, text: str) -> Optional[str]:
+        """First of ``manufacturer``'s series named anywhere in ``text`` (any case)"""
+        alternation = self._series_alternations.get(manufacturer)
+        if alternation is None:
+            series_list = self.series_by_manufacturer.get(manufacturer)
+            if not series_list:
+                return None
+            alternation = self._series_alternations[manufacturer] = KeywordAlternation(series_list)
+        return alternation.first(text)
+
+    def alias_table(self) -> Dict[str, List[str]]:
+        """``{manufacturer: [alias, ...]}`` lowercased, as SimpleLensParser keys it
+
+        Manufacturers listed under two spellings ("ARRI" / "Arri") share one
+        entry.
+        """
+        table: Dict[str, List[str]] = {}
+        for manufacturer, names in self.aliases.items():
+            entry = table.setdefault(manufacturer.lower(), [])
+            entry.extend(alias.lower() for alias in names if alias.lower() not in entry)
+        return table
+
+
+# esc_raw_lense_parse: the manufacturers named by themselves only
+MANUFACTURER_INDEX = ManufacturerIndex(MANUFACTURER_SERIES)
+# SimpleLensParser: every manufacturer and alias in MANUFACTURER_ALIASES
+MANUFACTURER_ALIAS_INDEX = ManufacturerIndex(MANUFACTURER_SERIES, aliases=manufacturer_aliases())